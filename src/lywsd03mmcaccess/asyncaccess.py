@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+# pylint: disable=W0212
+# ruff: noqa: SLF001
+
+import asyncio
+import logging
+import collections
+import contextlib
+import functools
+from concurrent import futures
+
+from lywsd02.client import UUID_DATA
+
+from lywsd03mmcaccess.thermometeraccess import ThermometerAccess, to_measurement_record
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## asyncio wrapper of 'ThermometerAccess'
+## blocking bluepy calls are executed in device's own worker thread, so
+## single event loop can drive multiple devices concurrently
+class AsyncThermometerAccess:
+    ## 'device' - prepared 'ThermometerAccess' object, if None then object is created
+    def __init__(self, mac, access_timeout=25.0, iface=None, device=None):
+        if device is None:
+            device = ThermometerAccess(mac, access_timeout, iface)
+        self.device: ThermometerAccess = device
+        ## bluepy peripheral is not thread safe - all calls go through single thread
+        self._executor = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"device-{mac}")
+
+    async def __aenter__(self):  # noqa: D105
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    ## execute blocking 'function' in device thread
+    async def run(self, function, *args: object, **kwargs: object):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    @contextlib.asynccontextmanager
+    async def connect(self):
+        connection = contextlib.ExitStack()
+        await self.run(connection.enter_context, self.device.connect())
+        try:
+            yield self
+        finally:
+            await self.run(connection.close)
+
+    ## interrupt pending device operation, can be called from any thread
+    def abort(self):
+        self.device.abort()
+
+    async def get_current_measurements(self):
+        return await self.run(self.device.get_current_measurements)
+
+    async def get_history_measurements(self, recent_entries=None):
+        return await self.run(self.device.get_history_measurements, recent_entries=recent_entries)
+
+    async def get_history_since(self, first_index):
+        return await self.run(self.device.get_history_since, first_index)
+
+    async def snapshot(self, recent_history_entries=3):
+        return await self.run(self.device.snapshot, recent_history_entries)
+
+    ## subscribe to measurement notifications and yield measurement records
+    ## (dicts with "timestamp", "T", "H", "B" keys), have to be called with connected device
+    async def measurements(self):
+        client = self.device.client
+        received = collections.deque()
+
+        def notified_data(data):
+            ## called in device thread
+            client._process_sensor_data(data)
+            received.append(to_measurement_record(client._data))
+
+        await self.run(client._subscribe, UUID_DATA, notified_data)
+        timeout = client._notification_timeout
+        while True:
+            notified = await self.run(client._peripheral.waitForNotifications, timeout)
+            if not notified:
+                _LOGGER.warning("No data from device for %s seconds", timeout)
+            while received:
+                yield received.popleft()
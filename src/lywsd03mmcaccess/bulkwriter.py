@@ -0,0 +1,235 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import csv
+import datetime
+import itertools
+import json
+
+import numpy as np
+
+from lywsd03mmcaccess.io import (
+    entry_timestamp_us,
+    is_history_data,
+    HISTORY_TEMPERATURE_SCALE,
+    MEASUREMENT_TEMPERATURE_SCALE,
+)
+from lywsd03mmcaccess.utils import current_timezone
+
+##
+## Writes data entries (history, measurements or rollups) to text stream in batches.
+## Values of batch are extracted column by column (vectorized for arrays of records),
+## formatted rows are joined and written with single 'write' call.
+##
+
+FORMATS = ["text", "csv", "tsv", "jsonl"]
+
+HISTORY_COLUMNS = ["index", "dev_timestamp", "timestamp", "wall_datetime", "Tmin", "Tmax", "Hmin", "Hmax"]
+MEASUREMENT_COLUMNS = ["timestamp", "wall_datetime", "T", "H", "B"]
+
+BATCH_SIZE = 10000
+
+
+## 'data_list' - list or iterator of entries or array of records
+## 'columns' - list of columns names, all columns of data if None
+## returns number of written entries
+def write_entries(data_list, out_stream, out_format="text", columns=None, batch_size=BATCH_SIZE):
+    if out_format not in FORMATS:
+        message = f"unknown output format: '{out_format}', allowed: {', '.join(FORMATS)}"
+        raise ValueError(message)
+    data_iter, first_item = _peek(data_list)
+    if first_item is None:
+        return 0
+    all_columns = get_columns(first_item)
+    if columns:
+        unknown = [name for name in columns if name not in all_columns]
+        if unknown:
+            message = f"unknown columns: {', '.join(unknown)}, allowed: {', '.join(all_columns)}"
+            raise ValueError(message)
+    row_formatter = _RowFormatter(out_format, columns or all_columns, first_item, out_stream)
+    row_formatter.write_header()
+
+    items_num = 0
+    for batch in _iter_batches(data_iter, batch_size):
+        row_formatter.write_batch(items_num, batch)
+        items_num += len(batch)
+    return items_num
+
+
+## returns list of columns of data type of given entry
+def get_columns(item):
+    if isinstance(item, np.ndarray):
+        return HISTORY_COLUMNS if is_history_data(item) else MEASUREMENT_COLUMNS
+    if "count" in item:
+        ## rollup data
+        return list(item.keys())
+    if "Tmin" in item:
+        return HISTORY_COLUMNS
+    return MEASUREMENT_COLUMNS
+
+
+## returns dict of lists of column values of batch (list of entries or array of records)
+def get_batch_columns(batch, columns):
+    curr_timezone = current_timezone()
+    ret_dict = {}
+    if isinstance(batch, np.ndarray):
+        scale = HISTORY_TEMPERATURE_SCALE if is_history_data(batch) else MEASUREMENT_TEMPERATURE_SCALE
+        for name in columns:
+            if name == "timestamp":
+                values = (batch["epoch_us"] / 1000000.0).tolist()
+            elif name == "wall_datetime" and "utc_offset" in batch.dtype.names:
+                ## history entry holds UTC offset of time of reading
+                values = format_offset_datetimes(batch["epoch_us"], batch["utc_offset"])
+            elif name == "wall_datetime":
+                values = format_datetimes(batch["epoch_us"], curr_timezone)
+            elif name.startswith("T"):
+                values = (batch[name] / scale).tolist()
+            else:
+                values = batch[name].tolist()
+            ret_dict[name] = values
+        return ret_dict
+
+    for name in columns:
+        if name == "timestamp" and "Tmin" in batch[0]:
+            ## history entry stored without numeric time
+            values = [entry_timestamp_us(item) / 1000000.0 for item in batch]
+        elif name == "wall_datetime" and "Tmin" not in batch[0] and "count" not in batch[0]:
+            ## measurement entry holds only timestamp
+            values = [str(datetime.datetime.fromtimestamp(item["timestamp"], tz=curr_timezone)) for item in batch]
+        else:
+            values = [item[name] for item in batch]
+        ret_dict[name] = values
+    return ret_dict
+
+
+## returns list of strings of wall times (same as 'str(datetime)') of array of microseconds since epoch
+def format_datetimes(epoch_us, tzinfo):
+    offset = tzinfo.utcoffset(None)
+    if offset is None:
+        ## offset depends on time
+        return [str(datetime.datetime.fromtimestamp(value / 1000000.0, tz=tzinfo)) for value in epoch_us.tolist()]
+    offset_us = offset // datetime.timedelta(microseconds=1)
+    suffix = _offset_suffix(offset)
+    return [text + suffix for text in _format_local_times(epoch_us + offset_us)]
+
+
+## returns list of strings of wall times of array of microseconds since epoch
+## 'utc_offsets' - array of UTC offsets (in seconds) of each wall time
+def format_offset_datetimes(epoch_us, utc_offsets):
+    suffixes = {
+        offset: _offset_suffix(datetime.timedelta(seconds=offset)) for offset in np.unique(utc_offsets).tolist()
+    }
+    local_times = _format_local_times(epoch_us + utc_offsets.astype("<i8") * 1000000)
+    return [text + suffixes[offset] for text, offset in zip(local_times, utc_offsets.tolist(), strict=True)]
+
+
+def _format_local_times(local_us):
+    local_times = local_us.astype("datetime64[us]")
+    ## 'str(datetime)' skips zero microseconds
+    return [
+        text.removesuffix(".000000").replace("T", " ", 1)
+        for text in np.datetime_as_string(local_times, unit="us").tolist()
+    ]
+
+
+def _offset_suffix(offset):
+    return datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone(offset)).isoformat()[19:]
+
+
+class _RowFormatter:
+    def __init__(self, out_format, columns, first_item, out_stream):
+        self.out_format = out_format
+        self.columns = list(columns)
+        self.out_stream = out_stream
+        self.csv_writer = None
+        if out_format in ("csv", "tsv"):
+            delimiter = "," if out_format == "csv" else "\t"
+            self.csv_writer = csv.writer(out_stream, delimiter=delimiter, lineterminator="\n")
+
+        ## text layout of all columns is the same as layout of 'printhistory' of previous versions
+        self.layout = None
+        self.value_columns = self.columns  ## columns needed to format row
+        if out_format == "text" and self.columns == get_columns(first_item):
+            if self.columns == HISTORY_COLUMNS:
+                self.layout = "history"
+                self.value_columns = ["dev_timestamp", "wall_datetime", "Tmin", "Tmax", "Hmin", "Hmax"]
+            elif self.columns == MEASUREMENT_COLUMNS:
+                self.layout = "measurement"
+                self.value_columns = ["wall_datetime", "T", "H", "B"]
+            else:
+                self.layout = "rollup"
+
+    def write_header(self):
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(self.columns)
+
+    def write_batch(self, start_index, batch):
+        values = get_batch_columns(batch, self.value_columns)
+        rows = zip(*(values[name] for name in self.value_columns), strict=True)
+        if self.csv_writer is not None:
+            self.csv_writer.writerows(rows)
+            return
+        if self.out_format == "jsonl":
+            lines = [json.dumps(dict(zip(self.columns, row, strict=True))) for row in rows]
+        else:
+            lines = self._format_text(start_index, rows)
+        lines.append("")
+        self.out_stream.write("\n".join(lines))
+
+    def _format_text(self, start_index, rows):
+        if self.layout == "history":
+            return [
+                f"Entry {index}: {dev_timestamp} {wall_datetime} Tmin: {temp_min} Tmax: {temp_max}"
+                f"  Hmin: {hum_min} Hmax: {hum_max}"
+                for index, (dev_timestamp, wall_datetime, temp_min, temp_max, hum_min, hum_max) in enumerate(
+                    rows,
+                    start_index,
+                )
+            ]
+        if self.layout == "measurement":
+            return [
+                f"Entry {index}: {wall_datetime} T: {temp} H: {hum} B: {batt}"
+                for index, (wall_datetime, temp, hum, batt) in enumerate(rows, start_index)
+            ]
+        if self.layout == "rollup":
+            names = self.columns[2:]
+            return [
+                f"Entry {index}: {row[0]} count: {row[1]} {_format_pairs(names, row[2:])}"
+                for index, row in enumerate(rows, start_index)
+            ]
+        return [f"Entry {index}: {_format_pairs(self.columns, row)}" for index, row in enumerate(rows, start_index)]
+
+
+def _format_pairs(names, values):
+    return " ".join(f"{key}: {value}" for key, value in zip(names, values, strict=True))
+
+
+## returns (<iterator of all entries>, <first entry>)
+def _peek(data_list):
+    if isinstance(data_list, np.ndarray):
+        if len(data_list) < 1:
+            return data_list, None
+        return data_list, data_list[:1]
+    data_iter = iter(data_list)
+    first_item = next(data_iter, None)
+    if first_item is None:
+        return data_iter, None
+    return itertools.chain([first_item], data_iter), first_item
+
+
+## yields lists of entries or slices of array of records
+def _iter_batches(data_iter, batch_size):
+    if isinstance(data_iter, np.ndarray):
+        for start in range(0, len(data_iter), batch_size):
+            yield data_iter[start : start + batch_size]
+        return
+    while True:
+        batch = list(itertools.islice(data_iter, batch_size))
+        if not batch:
+            return
+        yield batch
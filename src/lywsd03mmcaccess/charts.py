@@ -0,0 +1,247 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import glob
+import logging
+import pathlib
+import datetime
+from concurrent import futures
+
+import numpy as np
+
+from matplotlib.figure import Figure
+
+from lywsd03mmcaccess import timeindex
+from lywsd03mmcaccess.io import (
+    is_history_data,
+    entry_timestamp_us,
+    HISTORY_TEMPERATURE_SCALE,
+    MEASUREMENT_TEMPERATURE_SCALE,
+)
+from lywsd03mmcaccess.utils import current_timezone
+from lywsd03mmcaccess.downsample import downsample_columns
+
+_LOGGER = logging.getLogger(__name__)
+
+## suffixes of files stored next to data files (index, rollup, history cursor, temporary files and charts)
+SIDECAR_SUFFIXES = (".idx", ".rollup", ".cursor", ".tmp", ".png")
+
+
+## returns input files matching given glob patterns (sorted, without duplicates and sidecar files)
+def find_data_files(patterns):
+    files_set = set()
+    for pattern in patterns:
+        files_set.update(
+            path for path in glob.glob(pattern) if os.path.isfile(path) and not path.endswith(SIDECAR_SUFFIXES)
+        )
+    return sorted(files_set)
+
+
+## chart path: data file with ".png" extension, placed in 'out_dir' if given
+def get_chart_path(data_path, out_dir=None):
+    chart_path = os.path.splitext(data_path)[0] + ".png"
+    if out_dir:
+        chart_path = os.path.join(out_dir, pathlib.Path(chart_path).name)
+    return chart_path
+
+
+def is_chart_up_to_date(data_path, chart_path):
+    if not os.path.isfile(chart_path):
+        return False
+    return pathlib.Path(chart_path).stat().st_mtime >= pathlib.Path(data_path).stat().st_mtime
+
+
+## render charts of multiple data files in process pool
+## returns list of tuples (<data-path>, <chart-path>, <status>), status is "rendered", "skipped" or error message
+## data files of the same chart path (e.g. "h.bin" and "h.json") are reported as error except the first one
+def render_charts(data_files, out_dir=None, workers=None, *, force=False, downsample=True):
+    results = []
+    pending = {}
+    chart_sources = {}
+    with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for data_path in data_files:
+            chart_path = get_chart_path(data_path, out_dir)
+            source_path = chart_sources.setdefault(chart_path, data_path)
+            if source_path != data_path:
+                results.append((data_path, chart_path, f"chart path already used by {source_path}"))
+                continue
+            if not force and is_chart_up_to_date(data_path, chart_path):
+                results.append((data_path, chart_path, "skipped"))
+                continue
+            future = executor.submit(render_chart, data_path, chart_path, downsample=downsample)
+            pending[future] = (data_path, chart_path)
+        for future in futures.as_completed(pending):
+            data_path, chart_path = pending[future]
+            try:
+                status = "rendered" if future.result() else "no data"
+            except Exception as exc:  # noqa: BLE001  # pylint: disable=W0718
+                ## error of single file does not stop rendering of other files
+                status = f"{type(exc).__name__}: {exc}"
+            results.append((data_path, chart_path, status))
+    results.sort()
+    return results
+
+
+## render chart of data file to image file without using pyplot state
+## returns False if there is no data to render
+def render_chart(data_path, chart_path, *, downsample=True):
+    data_list = timeindex.read_data_range(data_path)
+    if data_list is None or len(data_list) < 1:
+        return False
+    figure = Figure()
+    plot_data(figure, data_list, downsample=downsample)
+    figure.savefig(chart_path)
+    return True
+
+
+## 'downsample' - reduce data to minimum and maximum per horizontal pixel
+def plot_data(figure, data_list, *, downsample=True):
+    max_points = None
+    if downsample:
+        max_points = int(figure.get_figwidth() * figure.dpi)
+    if is_history_data(data_list):
+        plot_history(figure, data_list, max_points)
+    else:
+        plot_measurements(figure, data_list, max_points)
+
+
+## 'max_points' - number of buckets of downsampling, no downsampling if None
+def plot_history(figure, data_list, max_points=None):
+    columns = history_columns(data_list)
+    columns["Tdiff"] = signed_range(columns["Tmin"], columns["Tmax"])
+    columns["Hdiff"] = signed_range(columns["Hmin"], columns["Hmax"])
+    if max_points is not None:
+        columns = downsample_columns(columns, ["Tmin", "Tmax", "Tdiff", "Hmin", "Hmax", "Hdiff"], max_points)
+    xpoints = columns["time"]
+    ytemperature = np.column_stack((columns["Tmin"], columns["Tmax"]))
+    ytemperature_diff = columns["Tdiff"]
+    yhumidity = np.column_stack((columns["Hmin"], columns["Hmax"]))
+    yhumidity_diff = columns["Hdiff"]
+    curr_timezone = current_timezone()
+
+    axes = figure.add_subplot(4, 1, 1)
+    axes.plot(xpoints, ytemperature)
+    axes.set_title("Minimum and maximum temperature")
+    # axes.set_ylabel('Temperature')
+    axes.xaxis_date(tz=curr_timezone)
+    axes.minorticks_on()
+    axes.grid()
+
+    axes = figure.add_subplot(4, 1, 2)
+    axes.plot(xpoints, ytemperature_diff)
+    axes.set_title("Temperature difference")
+    # axes.set_ylabel('Temperature')
+    axes.xaxis_date(tz=curr_timezone)
+    axes.minorticks_on()
+    axes.grid()
+
+    axes = figure.add_subplot(4, 1, 3)
+    axes.plot(xpoints, yhumidity)
+    axes.set_title("Minimum and maximum humidity")
+    # axes.set_ylabel('Humidity')
+    axes.xaxis_date(tz=curr_timezone)
+    axes.minorticks_on()
+    axes.grid()
+
+    axes = figure.add_subplot(4, 1, 4)
+    axes.plot(xpoints, yhumidity_diff)
+    axes.set_title("Humidity difference")
+    # axes.set_ylabel('Humidity')
+    axes.xaxis_date(tz=curr_timezone)
+    axes.minorticks_on()
+    axes.grid()
+
+    figure.tight_layout()
+
+
+## 'max_points' - number of buckets of downsampling, no downsampling if None
+def plot_measurements(figure, data_list, max_points=None):
+    columns = measurement_columns(data_list)
+    if max_points is not None:
+        columns = downsample_columns(columns, ["T", "H", "B"], max_points)
+    timestamps = columns["timestamp"]
+    xpoints = timestamps - timestamps[0]
+    ytemperature = columns["T"]
+    yhumidity = columns["H"]
+    ybattery = columns["B"]
+
+    def format_deltatime(value, _pos=None):
+        delta = datetime.timedelta(seconds=value)
+        return f"{delta}"
+
+    axes = figure.add_subplot(3, 1, 1)
+    axes.plot(xpoints, ytemperature, marker=".")
+    axes.set_title("Temperature")
+    axes.xaxis.set_major_formatter(format_deltatime)
+    axes.minorticks_on()
+    axes.grid()
+
+    axes = figure.add_subplot(3, 1, 2)
+    axes.plot(xpoints, yhumidity, marker=".")
+    axes.set_title("Humidity")
+    axes.xaxis.set_major_formatter(format_deltatime)
+    axes.minorticks_on()
+    axes.grid()
+
+    axes = figure.add_subplot(3, 1, 3)
+    axes.plot(xpoints, ybattery, marker=".")
+    axes.set_title("Battery")
+    axes.xaxis.set_major_formatter(format_deltatime)
+    axes.minorticks_on()
+    axes.grid()
+
+    figure.tight_layout()
+
+
+## returns dict of arrays: "time", "Tmin", "Tmax", "Hmin", "Hmax"
+def history_columns(data_list):
+    if isinstance(data_list, np.ndarray):
+        ## binary records
+        return {
+            "time": data_list["epoch_us"].astype("datetime64[us]"),
+            "Tmin": data_list["Tmin"] / HISTORY_TEMPERATURE_SCALE,
+            "Tmax": data_list["Tmax"] / HISTORY_TEMPERATURE_SCALE,
+            "Hmin": data_list["Hmin"].astype(float),
+            "Hmax": data_list["Hmax"].astype(float),
+        }
+    epochs = [entry_timestamp_us(item) for item in data_list]
+    return {
+        "time": np.array(epochs, dtype="datetime64[us]"),
+        "Tmin": np.array([item["Tmin"] for item in data_list], dtype=float),
+        "Tmax": np.array([item["Tmax"] for item in data_list], dtype=float),
+        "Hmin": np.array([item["Hmin"] for item in data_list], dtype=float),
+        "Hmax": np.array([item["Hmax"] for item in data_list], dtype=float),
+    }
+
+
+## returns dict of arrays: "timestamp", "T", "H", "B"
+def measurement_columns(data_list):
+    if isinstance(data_list, np.ndarray):
+        ## binary records
+        return {
+            "timestamp": data_list["epoch_us"] / 1000000.0,
+            "T": data_list["T"] / MEASUREMENT_TEMPERATURE_SCALE,
+            "H": data_list["H"].astype(float),
+            "B": data_list["B"].astype(float),
+        }
+    return {
+        "timestamp": np.array([item["timestamp"] for item in data_list], dtype=float),
+        "T": np.array([item["T"] for item in data_list], dtype=float),
+        "H": np.array([item["H"] for item in data_list], dtype=float),
+        "B": np.array([item["B"] for item in data_list], dtype=float),
+    }
+
+
+## range of values (max - min) with negative sign if average value decreased
+def signed_range(values_min, values_max):
+    values_avg = (values_max + values_min) / 2.0
+    values_diff = values_max - values_min
+    decreased = np.zeros(len(values_avg), dtype=bool)
+    decreased[1:] = values_avg[1:] < values_avg[:-1]
+    return np.where(decreased, -values_diff, values_diff)
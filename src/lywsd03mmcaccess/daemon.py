@@ -0,0 +1,297 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import pathlib
+import contextlib
+import json
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import bluepy
+
+from lywsd03mmcaccess.io import CustomJSONEncoder
+from lywsd03mmcaccess.metrics import REGISTRY
+from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+from lywsd03mmcaccess.utils import get_app_datadir
+
+_LOGGER = logging.getLogger(__name__)
+
+
+##
+## Protocol: client sends one JSON object per line, daemon responds with one JSON object per line.
+## Requests:
+##   {"command": "measurement", "mac": <MAC>, "max_age": <seconds>}
+##   {"command": "history", "mac": <MAC>, "recent": <entries-number>, "since_index": <history-index>}
+##   {"command": "info", "mac": <MAC>}
+##   {"command": "devices"}
+##   {"command": "metrics", "mac": <MAC or null for all devices>}
+## Responses:
+##   {"status": "ok", "data": <command-result>}
+##   {"status": "error", "message": <error-description>}
+##
+
+
+## commands accessing device
+DEVICE_COMMANDS = ("measurement", "history", "info")
+
+
+def get_default_socket_path():
+    return os.path.join(get_app_datadir(), "daemon.sock")
+
+
+class DaemonError(Exception):
+    """Error reported by daemon or communication failure."""
+
+
+## =====================================================
+
+
+class _DeviceSlot:
+    def __init__(self, mac, access_timeout):
+        self.mac = mac
+        self.device = ThermometerAccess(mac, access_timeout)
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.measurement = None
+        self.measurement_time = None  ## monotonic time of recent measurement read
+        self._connection = None
+
+    @property
+    def connected(self):
+        return self._connection is not None
+
+    def connect(self):
+        if self._connection is not None:
+            return
+        _LOGGER.info("connecting to device %s", self.mac)
+        connection = contextlib.ExitStack()
+        connection.enter_context(self.device.connect())
+        self._connection = connection
+
+    def disconnect(self):
+        if self._connection is None:
+            return
+        _LOGGER.info("disconnecting from device %s", self.mac)
+        connection = self._connection
+        self._connection = None
+        with contextlib.suppress(bluepy.btle.BTLEException, OSError):
+            connection.close()
+
+    ## call 'function(device)' on connected device, reconnect once on connection failure
+    def call(self, function):
+        self.last_used = time.monotonic()
+        try:
+            self.connect()
+            return function(self.device)
+        except (bluepy.btle.BTLEDisconnectError, bluepy.btle.BTLEInternalError, BrokenPipeError):
+            _LOGGER.warning("connection to device %s lost, reconnecting", self.mac)
+            self.disconnect()
+        self.connect()
+        return function(self.device)
+
+
+## serves device data, keeps devices connected between requests
+class DeviceDaemon:
+    def __init__(self, socket_path=None, access_timeout=25.0, idle_timeout=300.0):
+        self.socket_path = socket_path or get_default_socket_path()
+        self.access_timeout = access_timeout
+        self.idle_timeout = idle_timeout  ## disconnect device not used for given number of seconds
+        self._slots: dict[str, _DeviceSlot] = {}
+        self._slots_lock = threading.Lock()
+        self._server = None
+
+    def serve(self):
+        ## stale socket from previous run
+        pathlib.Path(self.socket_path).unlink(missing_ok=True)
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    response = daemon.handle_request_line(line)
+                    self.wfile.write(response.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, RequestHandler)
+        self._server.daemon_threads = True
+        cleanup_thread = threading.Thread(target=self._cleanup_loop, name="daemon-cleanup", daemon=True)
+        cleanup_thread.start()
+        _LOGGER.info("serving on socket: %s", self.socket_path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self._server = None
+            with contextlib.suppress(OSError):
+                pathlib.Path(self.socket_path).unlink()
+            self.disconnect_all()
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+    def disconnect_all(self):
+        with self._slots_lock:
+            slots = list(self._slots.values())
+        for slot in slots:
+            with slot.lock:
+                slot.disconnect()
+
+    def handle_request_line(self, line):
+        try:
+            request = json.loads(line)
+            data = self.handle_request(request)
+            response = {"status": "ok", "data": data}
+        except (
+            bluepy.btle.BTLEException,
+            TimeoutError,
+            OSError,
+            ValueError,
+            TypeError,
+            KeyError,
+            struct.error,
+        ) as exc:
+            _LOGGER.error("unable to handle request %s, reason: %s", line, exc)
+            response = {"status": "error", "message": f"{type(exc).__name__}: {exc}"}
+        return json.dumps(response, cls=CustomJSONEncoder)
+
+    def handle_request(self, request):
+        if not isinstance(request, dict):
+            message = f"invalid request: {request}"
+            raise TypeError(message)
+        command = request.get("command")
+        if command == "devices":
+            with self._slots_lock:
+                return {mac: slot.connected for mac, slot in self._slots.items()}
+        if command == "metrics":
+            mac = request.get("mac")
+            if mac:
+                return REGISTRY.snapshot(mac=mac)
+            return REGISTRY.snapshot()
+
+        if command not in DEVICE_COMMANDS:
+            ## checked before device slot is created
+            message = f"unknown command: {command}"
+            raise ValueError(message)
+        slot = self._get_slot(request["mac"])
+        with slot.lock:
+            if command == "measurement":
+                return self._get_measurement(slot, request.get("max_age"))
+            if command == "history":
+                return slot.call(lambda device: read_history(device, request.get("recent"), request.get("since_index")))
+            return slot.call(read_info)
+
+    def _get_measurement(self, slot, max_age):
+        if max_age is not None and slot.measurement is not None:
+            age = time.monotonic() - slot.measurement_time
+            if age <= max_age:
+                return slot.measurement
+        data = slot.call(lambda device: device.get_current_measurements())
+        slot.measurement = {"temperature": data.temperature, "humidity": data.humidity, "battery": data.battery}
+        slot.measurement_time = time.monotonic()
+        return slot.measurement
+
+    def _get_slot(self, mac):
+        with self._slots_lock:
+            slot = self._slots.get(mac)
+            if slot is None:
+                slot = _DeviceSlot(mac, self.access_timeout)
+                self._slots[mac] = slot
+            return slot
+
+    def _cleanup_loop(self):
+        while True:
+            time.sleep(min(10.0, self.idle_timeout))
+            now = time.monotonic()
+            with self._slots_lock:
+                slots = list(self._slots.values())
+            for slot in slots:
+                if not slot.connected or now - slot.last_used < self.idle_timeout:
+                    continue
+                if slot.lock.acquire(blocking=False):
+                    try:
+                        slot.disconnect()
+                    finally:
+                        slot.lock.release()
+
+
+def read_history(device, recent=None, since_index=None):
+    ## connection is kept between requests, so device time is read on every request
+    device.refresh_start_time()
+    if since_index is None:
+        return device.get_history_measurements(recent_entries=recent)
+    return device.get_history_since(since_index)
+
+
+def read_info(device):
+    return device.snapshot().toJSON()
+
+
+## =====================================================
+
+
+## thin client of daemon
+class DaemonClient:
+    def __init__(self, socket_path=None, timeout=120.0):
+        self.socket_path = socket_path or get_default_socket_path()
+        self.timeout = timeout
+
+    def is_available(self):
+        return pathlib.Path(self.socket_path).exists()
+
+    def get_measurement(self, mac, max_age=None):
+        return self.request({"command": "measurement", "mac": mac, "max_age": max_age})
+
+    def get_history(self, mac, recent=None, since_index=None):
+        return self.request({"command": "history", "mac": mac, "recent": recent, "since_index": since_index})
+
+    def get_info(self, mac):
+        return self.request({"command": "info", "mac": mac})
+
+    def get_metrics(self, mac=None):
+        return self.request({"command": "metrics", "mac": mac})
+
+    def request(self, request):
+        content = json.dumps(request) + "\n"
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+                client_socket.settimeout(self.timeout)
+                client_socket.connect(self.socket_path)
+                client_socket.sendall(content.encode("utf-8"))
+                response_data = b""
+                while not response_data.endswith(b"\n"):
+                    chunk = client_socket.recv(65536)
+                    if not chunk:
+                        break
+                    response_data += chunk
+        except OSError as exc:
+            message = f"unable to communicate with daemon at {self.socket_path}: {exc}"
+            raise DaemonError(message) from exc
+
+        if not response_data:
+            message = "empty response from daemon"
+            raise DaemonError(message)
+        try:
+            response = json.loads(response_data)
+        except ValueError as exc:
+            ## e.g. truncated response
+            message = f"invalid response from daemon: {exc}"
+            raise DaemonError(message) from exc
+        if not isinstance(response, dict):
+            message = f"invalid response from daemon: {response_data[:100]!r}"
+            raise DaemonError(message)
+        if response.get("status") != "ok":
+            raise DaemonError(response.get("message"))
+        return response.get("data")
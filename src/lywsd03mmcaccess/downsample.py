@@ -0,0 +1,41 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import numpy as np
+
+
+## returns sorted indices of points preserving shape of given series: first, last and
+## minimum and maximum of every series in each of 'buckets' equal-sized buckets
+## returns None if there is no need to downsample
+def minmax_indices(values_list, buckets):
+    size = len(values_list[0])
+    if buckets < 1 or size <= 2 * buckets:
+        return None
+    bucket_size = -(-size // buckets)  ## ceil
+    buckets_num = -(-size // bucket_size)
+    padded_size = buckets_num * bucket_size
+    offsets = np.arange(buckets_num) * bucket_size
+
+    indices_list = [np.array([0, size - 1])]
+    for values in values_list:
+        ## fill last bucket with last value, so padding does not change bucket extremes
+        padded = np.pad(values, (0, padded_size - size), mode="edge")
+        padded = padded.reshape(buckets_num, bucket_size)
+        indices_list.append(offsets + np.argmin(padded, axis=1))
+        indices_list.append(offsets + np.argmax(padded, axis=1))
+    indices = np.concatenate(indices_list)
+    np.minimum(indices, size - 1, out=indices)
+    return np.unique(indices)
+
+
+## downsample dict of equal-length arrays preserving shape of 'value_keys' columns
+def downsample_columns(columns, value_keys, buckets):
+    indices = minmax_indices([columns[key] for key in value_keys], buckets)
+    if indices is None:
+        return columns
+    return {key: values[indices] for key, values in columns.items()}
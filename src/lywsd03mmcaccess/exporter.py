@@ -0,0 +1,184 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lywsd03mmcaccess.metrics import REGISTRY
+from lywsd03mmcaccess.sinks import RecordSink
+
+_LOGGER = logging.getLogger(__name__)
+
+
+##
+## HTTP endpoint serving latest readings and access metrics in Prometheus text exposition format
+## content is rendered from in-memory snapshot, so scrape never accesses device
+## and never waits for device operation (e.g. notification loop of listener)
+##
+
+METRIC_PREFIX = "lywsd03mmc_"
+
+## record field -> (metric name, help)
+READING_METRICS = {
+    "T": ("temperature_celsius", "Latest temperature"),
+    "H": ("humidity_percent", "Latest relative humidity"),
+    "B": ("battery_percent", "Latest battery level"),
+}
+
+
+## latest measurement record of each device, safe to use from multiple threads
+class LatestReadings:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = {}
+
+    ## 'record' - measurement record: {"timestamp": float, "T": float, "H": int, "B": int}
+    def update(self, mac, record):
+        with self._lock:
+            self._records[mac] = record
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._records)
+
+
+## passes measurement records of device to readings store
+class ReadingsSink(RecordSink):
+    def __init__(self, readings: LatestReadings, mac):
+        self.readings = readings
+        self.mac = mac
+
+    def write(self, record):
+        self.readings.update(self.mac, record)
+
+
+## returns content in text exposition format
+## 'readings' - dict of latest records by MAC, 'metrics' - snapshot of 'MetricsRegistry'
+## 'buffer_stats' - dict of stats of recent measurements by MAC (see 'MeasurementRingBuffer.stats()')
+def render_metrics(readings, metrics, now=None, buffer_stats=None):
+    if now is None:
+        now = time.time()
+    lines = []
+    for field, (name, help_text) in READING_METRICS.items():
+        samples = [({"mac": mac}, record[field]) for mac, record in sorted(readings.items())]
+        _add_metric(lines, name, "gauge", help_text, samples)
+    samples = [({"mac": mac}, round(now - record["timestamp"], 3)) for mac, record in sorted(readings.items())]
+    _add_metric(lines, "last_update_age_seconds", "gauge", "Time since latest reading", samples)
+
+    if buffer_stats:
+        samples = [({"mac": mac}, stats["count"]) for mac, stats in sorted(buffer_stats.items())]
+        _add_metric(lines, "recent_measurements", "gauge", "Number of buffered recent measurements", samples)
+        for field, (name, _help_text) in READING_METRICS.items():
+            samples = [
+                ({"mac": mac, "stat": stat}, stats[field][stat])
+                for mac, stats in sorted(buffer_stats.items())
+                if field in stats
+                for stat in ("min", "max", "mean")
+            ]
+            help_text = f"Min, max and mean of buffered recent measurements '{field}'"
+            _add_metric(lines, "recent_" + name, "gauge", help_text, samples)
+
+    for name, items in _group_by_name(metrics["counters"]).items():
+        samples = [(item["labels"], item["value"]) for item in items]
+        _add_metric(lines, name + "_total", "counter", f"Access counter '{name}'", samples)
+    for name, items in _group_by_name(metrics["gauges"]).items():
+        samples = [(item["labels"], item["value"]) for item in items]
+        _add_metric(lines, name, "gauge", f"Access gauge '{name}'", samples)
+    for name, items in _group_by_name(metrics["timers"]).items():
+        metric_name = name + "_seconds"
+        lines.append(f"# HELP {METRIC_PREFIX}{metric_name} Duration of '{name}' operation")
+        lines.append(f"# TYPE {METRIC_PREFIX}{metric_name} summary")
+        for item in items:
+            labels = _format_labels(item["labels"])
+            lines.append(f"{METRIC_PREFIX}{metric_name}_count{labels} {item['count']}")
+            lines.append(f"{METRIC_PREFIX}{metric_name}_sum{labels} {item['total']}")
+    return "\n".join(lines) + "\n"
+
+
+## serves metrics in background thread, loopback interface by default
+## 'port' - TCP port, 0 to select free port (see 'port' property)
+class MetricsServer:
+    def __init__(self, readings: LatestReadings, metrics=None, host="127.0.0.1", port=9125):
+        self.readings = readings
+        self.metrics = metrics if metrics is not None else REGISTRY
+        self.buffers = {}  ## buffers of recent measurements by MAC ('MeasurementRingBuffer')
+        self.host = host
+        self._port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def port(self):
+        if self._server is None:
+            return self._port
+        return self._server.server_address[1]
+
+    def start(self):
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                content = server.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args: object):  # noqa: A002
+                _LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+        self._server = ThreadingHTTPServer((self.host, self._port), RequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        _LOGGER.info("serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def render(self):
+        buffer_stats = {mac: buffer.stats() for mac, buffer in self.buffers.items()}
+        return render_metrics(self.readings.snapshot(), self.metrics.snapshot(), buffer_stats=buffer_stats)
+
+
+def _add_metric(lines, name, metric_type, help_text, samples):
+    if not samples:
+        return
+    lines.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+    lines.append(f"# TYPE {METRIC_PREFIX}{name} {metric_type}")
+    for labels, value in samples:
+        lines.append(f"{METRIC_PREFIX}{name}{_format_labels(labels)} {value}")
+
+
+def _group_by_name(items):
+    ret_dict = {}
+    for item in items:
+        ret_dict.setdefault(item["name"], []).append(item)
+    return ret_dict
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    items = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        items.append(f'{key}="{escaped}"')
+    return "{" + ",".join(items) + "}"
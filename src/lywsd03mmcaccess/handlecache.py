@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import pathlib
+
+from bluepy import btle
+
+from lywsd03mmcaccess.io import read_json, write_object
+from lywsd03mmcaccess.utils import get_app_datadir
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_handles_cache_path(mac):
+    cache_dir = os.path.join(get_app_datadir(), "handles")
+    os.makedirs(cache_dir, exist_ok=True)
+    name = mac.replace(":", "_").lower()
+    return os.path.join(cache_dir, f"{name}.json")
+
+
+## cache of GATT characteristics (handles) of peripheral
+## replaces 'getCharacteristics' of peripheral, so every characteristic is discovered only once
+## persistent cache file is bound to device firmware version
+class CharacteristicCache:
+    def __init__(self, peripheral: btle.Peripheral, file_path=None):
+        self.peripheral = peripheral
+        self.file_path = file_path
+        self.firmware = None
+        self._discover = peripheral.getCharacteristics
+        self._characteristics: dict[str, btle.Characteristic] = {}
+        self._saved_content = None
+        self.load()
+
+    def install(self):
+        self.peripheral.getCharacteristics = self.get_characteristics
+
+    ## same signature as 'btle.Peripheral.getCharacteristics'
+    # pylint: disable=C0103
+    def get_characteristics(self, startHnd=1, endHnd=0xFFFF, uuid=None):  # noqa: N803
+        if uuid is None or startHnd != 1 or endHnd != 0xFFFF:  # noqa: PLR2004
+            return self._discover(startHnd, endHnd, uuid)
+        key = str(btle.UUID(uuid))
+        characteristic = self._characteristics.get(key)
+        if characteristic is None:
+            _LOGGER.debug("discovering characteristic: %s", key)
+            char_list = self._discover(uuid=uuid)
+            if not char_list:
+                return char_list
+            characteristic = char_list[0]
+            self._characteristics[key] = characteristic
+        return [characteristic]
+
+    ## remove characteristic (or all if 'uuid' is None) from cache
+    def invalidate(self, uuid=None):
+        if uuid is None:
+            self._characteristics.clear()
+            return
+        key = str(btle.UUID(uuid))
+        self._characteristics.pop(key, None)
+
+    ## invalidate cache if firmware changed
+    def validate(self, firmware):
+        if firmware == self.firmware:
+            return
+        if self.firmware is not None:
+            _LOGGER.info("device firmware changed from %s to %s, clearing handles", self.firmware, firmware)
+            self.invalidate()
+        self.firmware = firmware
+
+    def load(self):
+        if not self.file_path:
+            return
+        content = read_json(self.file_path)
+        if not content:
+            return
+        self._saved_content = content
+        self.firmware = content.get("firmware")
+        for key, data in content.get("characteristics", {}).items():
+            properties = data["properties"]
+            characteristic = btle.Characteristic(self.peripheral, key, data["handle"], properties, data["value_handle"])
+            descriptors = data.get("descriptors")
+            if descriptors:
+                characteristic.descs = [
+                    btle.Descriptor(self.peripheral, desc_uuid, desc_handle) for desc_uuid, desc_handle in descriptors
+                ]
+            self._characteristics[key] = characteristic
+        _LOGGER.debug("loaded %s handles from %s", len(self._characteristics), self.file_path)
+
+    ## store cache to file if changed
+    def save(self):
+        if not self.file_path:
+            return
+        characteristics = {}
+        for key, characteristic in self._characteristics.items():
+            data = {
+                "handle": characteristic.handle,
+                "properties": characteristic.properties,
+                "value_handle": characteristic.valHandle,
+            }
+            if characteristic.descs:
+                data["descriptors"] = [[str(desc.uuid), desc.handle] for desc in characteristic.descs]
+            characteristics[key] = data
+        content = {"firmware": self.firmware, "characteristics": characteristics}
+        if content == self._saved_content:
+            return
+        tmp_path = self.file_path + ".tmp"
+        write_object(content, tmp_path, indent=2)
+        pathlib.Path(tmp_path).replace(self.file_path)
+        self._saved_content = content
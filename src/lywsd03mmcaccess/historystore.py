@@ -0,0 +1,190 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import pathlib
+
+from lywsd03mmcaccess import timeindex
+from lywsd03mmcaccess.io import (
+    is_json_lines_file,
+    read_json_lines_last,
+    append_json_lines,
+    migrate_json_to_json_lines,
+    is_binary_file,
+    read_binary,
+    append_binary,
+    read_json,
+    write_object,
+    entry_timestamp_us,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+## maximum difference of calculated device start time not considered as device reboot (in seconds)
+REBOOT_TOLERANCE = 600
+
+
+## convert legacy JSON array output file to JSON lines format
+## returns False if file can not be used as output
+def prepare_output_file(outfile):
+    if not os.path.isfile(outfile):
+        return True
+    if is_binary_file(outfile) or is_json_lines_file(outfile):
+        return True
+    _LOGGER.info("converting output file to JSON lines format: %s", outfile)
+    if not migrate_json_to_json_lines(outfile):
+        _LOGGER.error("unable to convert file %s", outfile)
+        return False
+    return True
+
+
+## append entries to data file (JSON lines or binary)
+## 'binary' - format of new file, existing file keeps its format
+## 'sync' - force write to storage device
+def append_entries(outfile, data_list, *, binary=False, sync=True):
+    if os.path.isfile(outfile):
+        binary = is_binary_file(outfile)
+    if binary:
+        append_binary(outfile, data_list, sync=sync)
+        return
+    append_json_lines(outfile, data_list, sync=sync)
+    if os.path.isfile(timeindex.get_index_path(outfile)):
+        timeindex.update_index(outfile)
+
+
+def get_cursor_path(outfile):
+    return outfile + ".cursor"
+
+
+## cursor of history synchronization:
+## {"mac": <MAC>, "index": <recent-stored-index>, "start_time": <device-start-timestamp>}
+def read_cursor(outfile, mac=None):
+    cursor_path = get_cursor_path(outfile)
+    if os.path.isfile(cursor_path):
+        try:
+            cursor = read_json(cursor_path)
+        except ValueError:
+            cursor = None
+        if not is_cursor_valid(cursor):
+            _LOGGER.warning("invalid cursor file %s, restoring cursor from data file", cursor_path)
+        elif mac is None or cursor.get("mac") == mac:
+            return cursor
+    ## no (valid) cursor file - restore cursor from recent entry
+    recent_entry = read_recent_entry(outfile)
+    if recent_entry is None:
+        return None
+    index, dev_timestamp, timestamp = recent_entry
+    return {"mac": mac, "index": index, "start_time": timestamp - dev_timestamp}
+
+
+def is_cursor_valid(cursor):
+    if not isinstance(cursor, dict):
+        return False
+    for key in ("index", "start_time"):
+        value = cursor.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+    return True
+
+
+def write_cursor(outfile, cursor):
+    cursor_path = get_cursor_path(outfile)
+    tmp_path = cursor_path + ".tmp"
+    write_object(cursor, tmp_path)
+    pathlib.Path(tmp_path).replace(cursor_path)
+
+
+## returns (<index>, <device-timestamp>, <wall-timestamp>) of recent entry stored in data file or None
+def read_recent_entry(outfile):
+    if not os.path.isfile(outfile):
+        return None
+    if is_binary_file(outfile):
+        records = read_binary(outfile)
+        if records is None or len(records) < 1:
+            return None
+        record = records[-1]
+        return int(record["index"]), int(record["dev_timestamp"]), int(record["epoch_us"]) / 1000000.0
+    recent_entry = read_json_lines_last(outfile)
+    if recent_entry is None:
+        return None
+    return recent_entry["index"], recent_entry["dev_timestamp"], entry_timestamp_us(recent_entry) / 1000000.0
+
+
+## returns entries newer than recent entry stored in data file
+## (full history read after device reboot contains entries already stored)
+def drop_stored_entries(outfile, data_list):
+    recent_entry = read_recent_entry(outfile)
+    if recent_entry is None:
+        return data_list
+    recent_timestamp_us = round(recent_entry[2] * 1000000)
+    return [item for item in data_list if entry_timestamp_us(item) > recent_timestamp_us]
+
+
+## check if device was rebooted (or history was reset) since cursor was stored
+def is_cursor_outdated(cursor, start_time, recent_index):
+    start_time_diff = abs(start_time - cursor["start_time"])
+    if start_time_diff > REBOOT_TOLERANCE:
+        _LOGGER.info("device start time changed by %ss, device rebooted", start_time_diff)
+        return True
+    if recent_index < cursor["index"]:
+        _LOGGER.info("device history index %s lower than stored %s, history reset", recent_index, cursor["index"])
+        return True
+    return False
+
+
+## read history entries missing in output file and append them to the file
+## only entries following recently stored index are transferred,
+## full history is read only if device reboot or history reset is detected
+## have to be called with connected device
+## returns list of appended entries
+def sync_history(device, outfile):
+    if not prepare_output_file(outfile):
+        return None
+
+    cursor = read_cursor(outfile, device.mac)
+    if cursor is not None and not os.path.isfile(outfile):
+        ## data file removed - stale cursor
+        cursor = None
+    start_time = device.start_time.timestamp()
+
+    history_data = None
+    if cursor is not None:
+        history_count = device.get_history_indexes()[1]
+        if history_count < 1:
+            _LOGGER.info("device history is empty")
+            history_data = []
+        else:
+            recent_index = device.get_recent_history_entry()["index"]
+            outdated = is_cursor_outdated(cursor, start_time, recent_index)
+            if not outdated and recent_index == cursor["index"]:
+                history_data = []
+            elif not outdated:
+                next_index = cursor["index"] + 1
+                _LOGGER.info("reading history since index %s", next_index)
+                history_data = device.get_history_since(next_index)
+                if history_data and history_data[0]["index"] > next_index:
+                    _LOGGER.warning("history entries %s-%s lost", next_index, history_data[0]["index"] - 1)
+    if history_data is None:
+        _LOGGER.info("reading full history")
+        history_data = device.get_history_measurements()
+
+    new_items = drop_stored_entries(outfile, history_data)
+    for hist_item in new_items:
+        _LOGGER.info("adding history entry: %s", hist_item)
+    if not new_items:
+        _LOGGER.info("no new history entries to append")
+    else:
+        _LOGGER.info("writing history new %s items to file: %s", len(new_items), outfile)
+        append_entries(outfile, new_items)
+    if history_data:
+        cursor = {"index": history_data[-1]["index"]}
+    if cursor is not None:
+        ## start time updated to follow device clock drift
+        write_cursor(outfile, {"mac": device.mac, "index": cursor["index"], "start_time": start_time})
+    return new_items
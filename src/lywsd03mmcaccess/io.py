@@ -7,9 +7,15 @@
 
 import os
 import logging
+import datetime
+import pathlib
+import re
+import struct
 
 import json
 
+import numpy as np
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,19 +40,113 @@ def read_list(file_path):
 def read_json(file_path):
     if not os.path.isfile(file_path):
         return None
+    content = "".join(iter_json_content(file_path))
+    if not content:
+        ## empty file case
+        return None
+    return json.loads(content)
+
+
+## yields content of JSON file with comments removed in chunks of approximately given size
+def iter_json_content(file_path, chunk_size=65536):
     with open(file_path, encoding="utf-8") as content_file:
-        content = ""
+        parts = []
+        parts_size = 0
         for line in content_file:
             ## remove comments from JSON file
             index = line.find("#")
-            if index >= 0:
-                content += line[:index] + "\n"
-            else:
-                content += line
-        if not content:
-            ## empty file case
-            return None
-        return json.loads(content)
+            content = line[:index] + "\n" if index >= 0 else line
+            parts.append(content)
+            parts_size += len(content)
+            if parts_size >= chunk_size:
+                yield "".join(parts)
+                parts = []
+                parts_size = 0
+        if parts:
+            yield "".join(parts)
+
+
+## yields elements of JSON array file one by one (without loading whole file)
+def iter_json_array(file_path, chunk_size=65536):
+    if not os.path.isfile(file_path):
+        return iter(())
+    return iter(_JsonArrayReader(iter_json_content(file_path, chunk_size)))
+
+
+## yields data entries of JSON array or JSON lines file
+def iter_data(file_path):
+    if is_json_lines_file(file_path):
+        return iter_json_lines(file_path)
+    return iter_json_array(file_path)
+
+
+class _JsonArrayReader:
+    """Incremental parser of top level JSON array."""
+
+    DECODER = json.JSONDecoder()
+    WHITESPACE = re.compile(r"\s*")
+
+    def __init__(self, content_chunks):
+        self._chunks = content_chunks
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        char = self._next_char()
+        if char is None:
+            ## empty content
+            return
+        if char != "[":
+            message = f"expected JSON array, found: '{char}'"
+            raise ValueError(message)
+        self._pos += 1
+        if self._next_char() == "]":
+            return
+        while True:
+            yield self._decode_value()
+            char = self._next_char()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                message = f"expected ',' or ']' in JSON array, found: '{char}'"
+                raise ValueError(message)
+
+    ## skip whitespaces and return next character (None on end of content)
+    def _next_char(self):
+        while True:
+            match = self.WHITESPACE.match(self._buffer, self._pos)
+            self._pos = match.end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def _decode_value(self):
+        self._next_char()
+        while True:
+            try:
+                value, end = self.DECODER.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            ## value at end of buffer (e.g. number) can be incomplete
+            if end < len(self._buffer) or self._eof:
+                self._pos = end
+                return value
+            self._fill()
+
+    def _fill(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
 
 
 ## required for JSON to make classes serializable
@@ -69,8 +169,432 @@ def write_file(file_path, content):
         content_file.write(content)
 
 
+## =====================================================
+
+
+## JSON lines data file: first line is header, each next line holds one JSON object
+##   {"format": "lywsd03mmc-jsonl", "version": 1}
+##   {"index": 1, ...}
+##   {"index": 2, ...}
+JSONL_FORMAT_NAME = "lywsd03mmc-jsonl"
+JSONL_FORMAT_VERSION = 1
+## maximum length of header line read to detect format (JSON array file can be single long line)
+JSONL_HEADER_MAX_SIZE = 256
+
+
+def create_json_lines_header():
+    return {"format": JSONL_FORMAT_NAME, "version": JSONL_FORMAT_VERSION}
+
+
+def is_json_lines_file(file_path):
+    if not os.path.isfile(file_path):
+        return False
+    try:
+        with open(file_path, encoding="utf-8") as content_file:
+            first_line = content_file.readline(JSONL_HEADER_MAX_SIZE)
+        header = json.loads(first_line)
+    except ValueError:
+        ## not JSON or not text file
+        return False
+    if not isinstance(header, dict):
+        return False
+    return header.get("format") == JSONL_FORMAT_NAME
+
+
+## read data file regardless of format (JSON array, JSON lines or binary)
+## binary file is returned as array of records
+def read_data(file_path):
+    if is_binary_file(file_path):
+        return read_binary(file_path)
+    if is_json_lines_file(file_path):
+        return read_json_lines(file_path)
+    return read_json(file_path)
+
+
+def read_json_lines(file_path):
+    if not os.path.isfile(file_path):
+        return None
+    return list(iter_json_lines(file_path))
+
+
+## yields data entries (without header)
+## incomplete last line (e.g. interrupted append) is skipped
+def iter_json_lines(file_path):
+    with open(file_path, encoding="utf-8") as content_file:
+        content_file.readline()  ## skip header
+        for line in content_file:
+            if not line.endswith("\n"):
+                _LOGGER.warning("skipping incomplete entry at end of file: %s", file_path)
+                break
+            content = line.strip()
+            if not content:
+                continue
+            yield json.loads(content)
+
+
+## read last data entry without loading whole file
+def read_json_lines_last(file_path):
+    if not os.path.isfile(file_path):
+        return None
+    with open(file_path, "rb") as content_file:
+        content_file.seek(0, os.SEEK_END)
+        end_pos = _find_complete_end(content_file, content_file.tell())
+        while end_pos > 0:
+            start_pos = _find_complete_end(content_file, end_pos - 1)
+            if start_pos == 0:
+                ## header reached
+                return None
+            content_file.seek(start_pos)
+            line = content_file.read(end_pos - start_pos).strip()
+            if line:
+                return json.loads(line)
+            end_pos = start_pos
+    return None
+
+
+## append data entries to JSON lines file
+## file is created with header if does not exist
+## entries are written with single 'write' and synced to disk, incomplete entry
+## remaining from previous interrupted append is truncated
+## 'sync' - force write to storage device
+def append_json_lines(file_path, data_list, *, sync=True):
+    if not os.path.isfile(file_path):
+        header_line = json.dumps(create_json_lines_header()) + "\n"
+        with open(file_path, "x", encoding="utf-8") as content_file:
+            content_file.write(header_line)
+            content_file.flush()
+            os.fsync(content_file.fileno())
+
+    content = "".join(json.dumps(item, cls=CustomJSONEncoder) + "\n" for item in data_list)
+    if not content:
+        return
+    with open(file_path, "r+b") as content_file:
+        content_file.seek(0, os.SEEK_END)
+        end_pos = content_file.tell()
+        complete_pos = _find_complete_end(content_file, end_pos)
+        if complete_pos != end_pos:
+            _LOGGER.warning("truncating incomplete entry at end of file: %s", file_path)
+            content_file.truncate(complete_pos)
+        content_file.seek(complete_pos)
+        content_file.write(content.encode("utf-8"))
+        content_file.flush()
+        if sync:
+            os.fsync(content_file.fileno())
+
+
+## write whole data list to JSON lines file (replacing atomically existing file)
+## 'data_list' can be any iterable, returns number of written entries
+def write_json_lines(data_list, out_file):
+    tmp_file = out_file + ".tmp"
+    items_num = 0
+    with open(tmp_file, "w", encoding="utf-8") as content_file:
+        content_file.write(json.dumps(create_json_lines_header()) + "\n")
+        for item in data_list:
+            content_file.write(json.dumps(item, cls=CustomJSONEncoder) + "\n")
+            items_num += 1
+        content_file.flush()
+        os.fsync(content_file.fileno())
+    pathlib.Path(tmp_file).replace(out_file)
+    ## sidecar time index and rollups of replaced file are no longer valid
+    remove_sidecar_files(out_file)
+    return items_num
+
+
+def remove_sidecar_files(data_file):
+    for sidecar_file in (data_file + ".idx", data_file + ".rollup"):
+        if os.path.isfile(sidecar_file):
+            pathlib.Path(sidecar_file).unlink()
+
+
+## write entries to opened text stream progressively as JSON array
+## output is the same as produced by 'write_object()'
+## 'data_list' can be any iterable, returns number of written entries
+def write_json_array_stream(data_list, out_stream, indent=None):
+    items_num = 0
+    if indent is None:
+        separator = ", "
+        item_prefix = ""
+        closing = "]"
+    else:
+        separator = ","
+        item_prefix = "\n" + " " * indent
+        closing = "\n]"
+    out_stream.write("[")
+    for item in data_list:
+        content = json.dumps(item, indent=indent, cls=CustomJSONEncoder)
+        if indent is not None:
+            content = content.replace("\n", item_prefix)
+        if items_num > 0:
+            out_stream.write(separator)
+        out_stream.write(item_prefix + content)
+        items_num += 1
+    out_stream.write(closing if items_num > 0 else "]")
+    return items_num
+
+
+## write entries to opened text stream progressively as JSON lines (with header)
+## 'data_list' can be any iterable, returns number of written entries
+def write_json_lines_stream(data_list, out_stream):
+    items_num = 0
+    out_stream.write(json.dumps(create_json_lines_header()) + "\n")
+    for item in data_list:
+        out_stream.write(json.dumps(item, cls=CustomJSONEncoder) + "\n")
+        items_num += 1
+    return items_num
+
+
+## convert JSON array file to JSON lines file
+## if 'out_file' is not given then input file is replaced
+def migrate_json_to_json_lines(in_file, out_file=None):
+    if is_binary_file(in_file):
+        _LOGGER.error("unable to convert binary file: %s", in_file)
+        return False
+    if is_json_lines_file(in_file):
+        _LOGGER.info("file already in JSON lines format: %s", in_file)
+        if out_file is None or out_file == in_file:
+            return True
+    if not os.path.isfile(in_file):
+        return False
+    if out_file is None:
+        out_file = in_file
+    ## input is read lazily, so in-place conversion is safe (output is written to temporary file)
+    items_num = write_json_lines(iter_data(in_file), out_file)
+    _LOGGER.info("written %s entries in JSON lines format to file: %s", items_num, out_file)
+    return True
+
+
+## returns position after last new line character
+def _find_complete_end(content_file, end_pos, chunk_size=4096):
+    pos = end_pos
+    while pos > 0:
+        read_size = min(chunk_size, pos)
+        content_file.seek(pos - read_size)
+        chunk = content_file.read(read_size)
+        found = chunk.rfind(b"\n")
+        if found >= 0:
+            return pos - read_size + found + 1
+        pos -= read_size
+    return 0
+
+
 def prepare_filesystem_name(name):
     new_name = name
     new_name = new_name.replace("/", "_")
     new_name = new_name.replace("|", "_")
     return new_name.replace("-", "_")
+
+
+## =====================================================
+
+
+## binary data file: header followed by fixed-width little-endian records
+## header: magic (4s), version (H), kind (B), padding (x), record size (I), reserved (I)
+BINARY_MAGIC = b"LYWB"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHBxII")
+
+BINARY_KIND_HISTORY = 1
+BINARY_KIND_MEASUREMENT = 2
+
+## temperatures are stored as integers multiplied by scale
+HISTORY_TEMPERATURE_SCALE = 10.0  ## history resolution is 0.1C
+MEASUREMENT_TEMPERATURE_SCALE = 100.0  ## measurement resolution is 0.01C
+
+HISTORY_DTYPE = np.dtype(
+    [
+        ("epoch_us", "<i8"),  ## wall time in microseconds
+        ("utc_offset", "<i4"),  ## UTC offset of wall time of entry in seconds
+        ("dev_timestamp", "<u4"),
+        ("index", "<u4"),  ## device history index
+        ("Tmin", "<i2"),
+        ("Tmax", "<i2"),
+        ("Hmin", "u1"),
+        ("Hmax", "u1"),
+    ],
+)
+
+MEASUREMENT_DTYPE = np.dtype(
+    [
+        ("epoch_us", "<i8"),  ## wall time in microseconds
+        ("T", "<i2"),
+        ("H", "u1"),
+        ("B", "u1"),
+    ],
+)
+
+BINARY_DTYPES = {BINARY_KIND_HISTORY: HISTORY_DTYPE, BINARY_KIND_MEASUREMENT: MEASUREMENT_DTYPE}
+
+
+def is_binary_file(file_path):
+    return _read_binary_header(file_path) is not None
+
+
+def is_history_data(data_list):
+    if isinstance(data_list, np.ndarray):
+        return "Tmin" in data_list.dtype.names
+    return "Tmin" in data_list[0]
+
+
+## returns wall time of data entry in microseconds
+def entry_timestamp_us(item):
+    if "timestamp" in item:
+        ## measurement entry or history entry with numeric time
+        return round(item["timestamp"] * 1000000)
+    ## history entry stored without numeric time
+    item_datetime = datetime.datetime.fromisoformat(item["wall_datetime"])
+    return round(item_datetime.timestamp() * 1000000)
+
+
+## returns UTC offset (in seconds) of wall time of history entry
+def entry_utc_offset(item):
+    item_datetime = datetime.datetime.fromisoformat(item["wall_datetime"])
+    offset = item_datetime.utcoffset()
+    if offset is None:
+        ## naive wall time is local time
+        offset = item_datetime.astimezone().utcoffset()
+    return round(offset.total_seconds())
+
+
+## convert list of history entries to array of records
+def history_to_array(data_list):
+    records = [
+        (
+            entry_timestamp_us(item),
+            entry_utc_offset(item),
+            item["dev_timestamp"],
+            item["index"],
+            round(item["Tmin"] * HISTORY_TEMPERATURE_SCALE),
+            round(item["Tmax"] * HISTORY_TEMPERATURE_SCALE),
+            item["Hmin"],
+            item["Hmax"],
+        )
+        for item in data_list
+    ]
+    return np.array(records, dtype=HISTORY_DTYPE)
+
+
+## convert list of measurement entries to array of records
+def measurements_to_array(data_list):
+    records = [
+        (
+            round(item["timestamp"] * 1000000),
+            round(item["T"] * MEASUREMENT_TEMPERATURE_SCALE),
+            item["H"],
+            clamp_uint8(item["B"]),
+        )
+        for item in data_list
+    ]
+    return np.array(records, dtype=MEASUREMENT_DTYPE)
+
+
+## returns value limited to range of unsigned byte field
+## (battery level estimated by client is negative for voltage below 2.1V)
+def clamp_uint8(value):
+    return min(max(value, 0), 255)
+
+
+def to_records_array(data_list):
+    if isinstance(data_list, np.ndarray):
+        return data_list
+    if not data_list:
+        return None
+    if is_history_data(data_list):
+        return history_to_array(data_list)
+    return measurements_to_array(data_list)
+
+
+## write data (list of entries or array of records) to binary file (replacing atomically existing file)
+def write_binary(data_list, out_file):
+    records = to_records_array(data_list)
+    if records is None:
+        _LOGGER.warning("no data to write to file: %s", out_file)
+        return
+    kind = _get_binary_kind(records.dtype)
+    tmp_file = out_file + ".tmp"
+    with open(tmp_file, "wb") as content_file:
+        content_file.write(_pack_binary_header(kind))
+        content_file.write(records.tobytes())
+        content_file.flush()
+        os.fsync(content_file.fileno())
+    pathlib.Path(tmp_file).replace(out_file)
+    remove_sidecar_files(out_file)
+
+
+## append data (list of entries or array of records) to binary file
+## incomplete record remaining from previous interrupted append is truncated
+## 'sync' - force write to storage device
+def append_binary(file_path, data_list, *, sync=True):
+    records = to_records_array(data_list)
+    if records is None:
+        return
+    kind = _get_binary_kind(records.dtype)
+    if not os.path.isfile(file_path):
+        with open(file_path, "xb") as content_file:
+            content_file.write(_pack_binary_header(kind))
+            content_file.flush()
+            os.fsync(content_file.fileno())
+
+    header = _read_binary_header(file_path)
+    if header != (kind, records.dtype.itemsize):
+        message = f"invalid binary file or data kind mismatch: {file_path}"
+        raise ValueError(message)
+
+    with open(file_path, "r+b") as content_file:
+        content_file.seek(0, os.SEEK_END)
+        end_pos = content_file.tell()
+        data_size = end_pos - BINARY_HEADER.size
+        complete_pos = end_pos - data_size % records.dtype.itemsize
+        if complete_pos != end_pos:
+            _LOGGER.warning("truncating incomplete record at end of file: %s", file_path)
+            content_file.truncate(complete_pos)
+        content_file.seek(complete_pos)
+        content_file.write(records.tobytes())
+        content_file.flush()
+        if sync:
+            os.fsync(content_file.fileno())
+
+
+## returns read-only memory mapped array of records (no data copy)
+def read_binary(file_path):
+    header = _read_binary_header(file_path)
+    if header is None:
+        return None
+    kind, record_size = header
+    dtype = BINARY_DTYPES.get(kind)
+    if dtype is None or dtype.itemsize != record_size:
+        _LOGGER.error("unsupported binary file: %s", file_path)
+        return None
+    data_size = pathlib.Path(file_path).stat().st_size - BINARY_HEADER.size
+    count = data_size // record_size
+    if count < 1:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(file_path, dtype=dtype, mode="r", offset=BINARY_HEADER.size, shape=(count,))
+
+
+def _pack_binary_header(kind):
+    dtype = BINARY_DTYPES[kind]
+    return BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, kind, dtype.itemsize, 0)
+
+
+def _read_binary_header(file_path):
+    if not os.path.isfile(file_path):
+        return None
+    with open(file_path, "rb") as content_file:
+        header_data = content_file.read(BINARY_HEADER.size)
+    if len(header_data) < BINARY_HEADER.size:
+        return None
+    magic, version, kind, record_size, _reserved = BINARY_HEADER.unpack(header_data)
+    if magic != BINARY_MAGIC:
+        return None
+    if version != BINARY_VERSION:
+        _LOGGER.warning("unsupported binary file version %s: %s", version, file_path)
+        return None
+    return (kind, record_size)
+
+
+def _get_binary_kind(dtype):
+    for kind, kind_dtype in BINARY_DTYPES.items():
+        if kind_dtype == dtype:
+            return kind
+    message = f"unsupported records type: {dtype}"
+    raise ValueError(message)
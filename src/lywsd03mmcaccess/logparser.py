@@ -0,0 +1,220 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+import pathlib
+import collections
+import datetime
+import re
+from concurrent import futures
+
+from lywsd03mmcaccess.records import MeasurementRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+##
+## Known layouts of captured measurement logs. Every pattern captures:
+## (<date, hour and minute or hour and minute only>, <second>, <fraction>, <temperature>, <humidity>, <battery>)
+## Lines containing only time get date from base date, day is incremented when time goes back.
+##
+LAYOUTS = [
+    ## [23:03:52.888767] measurement: Temperature: 23.25C Humidity: 61% Battery: 77%
+    re.compile(
+        r"^\[(\d\d:\d\d):(\d\d)\.?(\d*)\] measurement: Temperature: (-?[\d.]+)C Humidity: (\d+)% Battery: (\d+)%",
+        re.MULTILINE,
+    ),
+    ## [2025-09-19 01:11:57.829490] Temp: 25.16C Humidity: 58% Battery: 97%
+    re.compile(
+        r"^\[(\d{4}-\d\d-\d\d \d\d:\d\d):(\d\d)\.?(\d*)\] Temp: (-?[\d.]+)C Humidity: (\d+)% Battery: (\d+)%",
+        re.MULTILINE,
+    ),
+    ## received data: 2025-09-19 18:49:33.882839 Temp: 22.95C Humidity: 63% Battery: 89%
+    re.compile(
+        r"^received data: (\d{4}-\d\d-\d\d \d\d:\d\d):(\d\d)\.?(\d*) Temp: (-?[\d.]+)C Humidity: (\d+)% Battery: (\d+)%",
+        re.MULTILINE,
+    ),
+]
+
+## layout containing time only
+TIME_ONLY_LAYOUT = LAYOUTS[0]
+
+CHUNK_SIZE = 16 * 1024 * 1024
+
+## divisors of fraction of second by number of digits
+FRACTION_SCALE = [10**digits for digits in range(7)]
+
+
+## parser keeps state between consecutive parts of input (layout, current day)
+## timestamps are in local timezone (as in captured logs)
+class MeasurementLogParser:
+    def __init__(self, base_date: datetime.date = None, layout=None):
+        if base_date is None:
+            base_date = datetime.date.today()
+        self.base_date = base_date
+        self.layout = layout  ## one of LAYOUTS, detected from input if None
+        self.skipped = 0  ## number of not recognized lines
+        ## timestamp of beginning of recent minute, calculating only once per minute avoids 'strptime' per line
+        ## (input is ordered by time, so only recent minute is kept)
+        self._minute_key = None
+        self._minute_timestamp = None
+        self._day_offset = 0
+        self._recent_day_time = None
+
+    ## returns list of measurement tuples (<timestamp>, <temperature>, <humidity>, <battery>)
+    ## 'text' has to consist of complete lines
+    def parse_text(self, text):
+        if self.layout is None:
+            self.layout = detect_layout(text)
+            if self.layout is None:
+                self.skipped += text.count("\n")
+                return []
+        items = self.layout.findall(text)
+        lines_num = text.count("\n") + (0 if text.endswith("\n") else 1)
+        self.skipped += max(0, lines_num - len(items))
+        if self.layout is TIME_ONLY_LAYOUT:
+            items = self._resolve_days(items)
+
+        ret_list = []
+        append = ret_list.append
+        recent_key = self._minute_key
+        recent_timestamp = self._minute_timestamp
+        fraction_scale = FRACTION_SCALE
+        for minute_key, second, fraction, temp, hum, batt in items:
+            if minute_key != recent_key:
+                recent_key = minute_key
+                recent_timestamp = self._calculate_minute_timestamp(minute_key)
+            timestamp = recent_timestamp + int(second)
+            if fraction:
+                timestamp += int(fraction) / fraction_scale[len(fraction)]
+            append((timestamp, float(temp), int(hum), int(batt)))
+        self._minute_key = recent_key
+        self._minute_timestamp = recent_timestamp
+        return ret_list
+
+    ## 'lines' - iterable of lines (e.g. file object), parsed in batches
+    ## yields measurement tuples
+    def parse_lines(self, lines, batch_size=10000):
+        batch = []
+        for line in lines:
+            batch.append(line if line.endswith("\n") else line + "\n")
+            if len(batch) >= batch_size:
+                yield from self.parse_text("".join(batch))
+                batch = []
+        if batch:
+            yield from self.parse_text("".join(batch))
+
+    ## replace time only keys with (<day offset>, <hour and minute>) keys
+    def _resolve_days(self, items):
+        ret_list = []
+        for minute_key, second, fraction, temp, hum, batt in items:
+            day_time = (minute_key, second, fraction.ljust(6, "0"))
+            if self._recent_day_time is not None and day_time < self._recent_day_time:
+                self._day_offset += 1
+            self._recent_day_time = day_time
+            ret_list.append(((self._day_offset, minute_key), second, fraction, temp, hum, batt))
+        return ret_list
+
+    def _calculate_minute_timestamp(self, minute_key):
+        if isinstance(minute_key, tuple):
+            day_offset, time_key = minute_key
+            item_date = self.base_date + datetime.timedelta(days=day_offset)
+        else:
+            ## format: YYYY-MM-DD HH:MM
+            item_date = datetime.date(int(minute_key[0:4]), int(minute_key[5:7]), int(minute_key[8:10]))
+            time_key = minute_key[11:16]
+        item_time = datetime.time(int(time_key[0:2]), int(time_key[3:5]))
+        return int(datetime.datetime.combine(item_date, item_time).timestamp())
+
+
+## returns layout pattern matching earliest line of text or None
+def detect_layout(text):
+    found_layout = None
+    found_pos = None
+    for layout in LAYOUTS:
+        match = layout.search(text)
+        if match is None:
+            continue
+        if found_pos is None or match.start() < found_pos:
+            found_layout = layout
+            found_pos = match.start()
+    return found_layout
+
+
+## yields measurement tuples (<timestamp>, <temperature>, <humidity>, <battery>)
+def parse_lines(lines, base_date: datetime.date = None):
+    parser = MeasurementLogParser(base_date)
+    yield from parser.parse_lines(lines)
+    if parser.skipped > 0:
+        _LOGGER.info("skipped %s not recognized lines", parser.skipped)
+
+
+## yields measurement records read lazily from opened text stream (e.g. stdin)
+def iter_stream_measurements(in_stream, base_date: datetime.date = None):
+    for timestamp, temp, hum, batt in parse_lines(in_stream, base_date):
+        yield MeasurementRecord(timestamp, temp, hum, batt)
+
+
+## yields measurement records: {"timestamp": float, "T": float, "H": int, "B": int}
+## 'workers' - number of processes parsing file in parallel, used only for large files
+##             with full dates (lines with time only depend on all previous lines)
+def iter_file_measurements(file_path, base_date: datetime.date = None, workers=1, chunk_size=CHUNK_SIZE):
+    for timestamp, temp, hum, batt in _iter_file_tuples(file_path, base_date, workers, chunk_size):
+        yield MeasurementRecord(timestamp, temp, hum, batt)
+
+
+def _iter_file_tuples(file_path, base_date, workers, chunk_size):
+    with open(file_path, encoding="utf-8") as content_file:
+        layout = detect_layout(content_file.read(65536))
+    if layout is None:
+        _LOGGER.warning("unknown layout of file: %s", file_path)
+        return
+    layout_index = LAYOUTS.index(layout)
+
+    file_size = pathlib.Path(file_path).stat().st_size
+    ranges = [(start, min(start + chunk_size, file_size)) for start in range(0, file_size, chunk_size)]
+    if workers <= 1 or len(ranges) < 2 or layout is TIME_ONLY_LAYOUT:  # noqa: PLR2004
+        ## time only layout has to be parsed sequentially
+        parser = MeasurementLogParser(base_date, layout)
+        for start, end in ranges:
+            yield from parser.parse_text(_read_range(file_path, start, end))
+        if parser.skipped > 0:
+            _LOGGER.info("skipped %s not recognized lines", parser.skipped)
+        return
+
+    _LOGGER.info("parsing %s chunks using %s processes", len(ranges), workers)
+    with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        ## limit number of parsed chunks waiting in memory
+        pending = collections.deque()
+        for start, end in ranges:
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_parse_range, file_path, start, end, layout_index))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _parse_range(file_path, start, end, layout_index):
+    parser = MeasurementLogParser(layout=LAYOUTS[layout_index])
+    return parser.parse_text(_read_range(file_path, start, end))
+
+
+## read lines starting in range [start, end) of file
+def _read_range(file_path, start, end):
+    with open(file_path, "rb") as content_file:
+        if start > 0:
+            ## skip line started in previous range
+            content_file.seek(start - 1)
+            content_file.readline()
+        position = content_file.tell()
+        if position >= end:
+            return ""
+        content = content_file.read(end - position)
+        if not content.endswith(b"\n"):
+            content += content_file.readline()
+    return content.decode("utf-8")
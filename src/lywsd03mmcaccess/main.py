@@ -19,18 +19,18 @@ with contextlib.suppress(ImportError):
     ## when import fails then it means that the script was executed indirectly
     ## in this case __init__ is already loaded
 
+import os
 import sys
 import argparse
 import logging
 import datetime
+import time
 import pprint
-import bluepy
-
-import matplotlib.pyplot as plt
+import types
 
+## heavy modules (bluepy, numpy, matplotlib) are imported by commands that need them
+# ruff: noqa: PLC0415
 from lywsd03mmcaccess import logger
-from lywsd03mmcaccess.io import read_json, write_object, read_list
-from lywsd03mmcaccess.thermometeraccess import ThermometerAccess, pretty_measurement, current_timezone
 
 if __name__ == "__main__":
     _LOGGER = logging.getLogger("lywsd03mmcaccess.main")
@@ -42,49 +42,64 @@ else:
 
 
 def process_info(args):
+    from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+
     mac = args.mac
+    if args.viadaemon:
+        info = request_daemon(args, lambda client: client.get_info(mac))
+        if info is not None:
+            for key, value in info.items():
+                print(f"{key + ':':<23}", value)
+            return
+
     device = ThermometerAccess(mac)
     with device.connect():
-        dev_time_data = device.client.time
-        dev_time = dev_time_data[0]
-        dev_tz_offset = dev_time_data[1]
-        print("device time:           ", dev_time.astimezone(tz=datetime.UTC))
-        dev_time_timestamp = int(dev_time.timestamp())
-        print("device timestamp:      ", dev_time_timestamp)
-        print("device up time:        ", datetime.timedelta(seconds=dev_time_timestamp))
-        print("device tz offset:      ", dev_tz_offset)
-        print("client tz offset:      ", device.client.tz_offset)
-        print("device start time:     ", device.start_time)  ## last boot-up
-        print("device current time:   ", device.get_device_current_time())  ## last boot-up
-        print("measurement:           ", device.get_current_measurements())
-        print("units:                 ", device.client.units)
-        print("comfort levels:        ", device.get_comfort_levels())
-
-        history_recent_index, history_count = device.get_history_indexes()
-        print("history indexes:       ", history_recent_index, history_count)
-        print("history first index:   ", device.get_first_history_index())
-
-        recent_hist_entry = device.get_recent_history_entry()
-        recent_hist_delta = datetime.timedelta(seconds=recent_hist_entry["dev_timestamp"])
-        recent_device_hist_date = datetime.datetime(1970, 1, 1, tzinfo=device.tzinfo) + recent_hist_delta
-        recent_wall_hist_date = device.start_time + recent_hist_delta
-        print("recent history entry:  ", recent_hist_entry)
-        print("entry device time:     ", recent_device_hist_date)
-        print("entry time:            ", recent_wall_hist_date)
-
-        history = device.get_history_measurements(recent_entries=3)
-        print("recent history entries:")
-        pprint.pprint(history, indent=2)
-        # if history_count > -10:
-        #     history = device.get_history_measurements(recent_entries=3)
-        #     print("recent history entries:")
-        #     pprint.pprint(history, indent=2)
-        # else:
-        #     print("no history entries")
+        snapshot = device.snapshot(recent_history_entries=3)
+
+    dev_time = snapshot.device_time
+    print("device time:           ", dev_time.astimezone(tz=datetime.UTC))
+    dev_time_timestamp = int(dev_time.timestamp())
+    print("device timestamp:      ", dev_time_timestamp)
+    print("device up time:        ", datetime.timedelta(seconds=dev_time_timestamp))
+    print("device tz offset:      ", snapshot.device_tz_offset)
+    print("client tz offset:      ", snapshot.client_tz_offset)
+    print("device start time:     ", snapshot.start_time)  ## last boot-up
+    print("device current time:   ", snapshot.device_current_time)
+    print("measurement:           ", snapshot.measurement)
+    print("units:                 ", snapshot.units)
+    print("comfort levels:        ", snapshot.comfort_levels)
+
+    history_recent_index, history_count = snapshot.history_indexes
+    print("history indexes:       ", history_recent_index, history_count)
+    print("history first index:   ", snapshot.history_first_index)
+
+    recent_hist_entry = snapshot.recent_history_entry
+    recent_hist_delta = datetime.timedelta(seconds=recent_hist_entry["dev_timestamp"])
+    recent_device_hist_date = datetime.datetime(1970, 1, 1, tzinfo=device.tzinfo) + recent_hist_delta
+    recent_wall_hist_date = snapshot.start_time + recent_hist_delta
+    print("recent history entry:  ", recent_hist_entry)
+    print("entry device time:     ", recent_device_hist_date)
+    print("entry time:            ", recent_wall_hist_date)
+
+    print("recent history entries:")
+    pprint.pprint([dict(item) for item in snapshot.recent_history], indent=2)
+
+    print("read timings:")
+    for field, duration in snapshot.timings.items():
+        print(f"    {field + ':':<22} {duration * 1000:.1f}ms")
 
 
 def process_read_data(args):
+    from lywsd03mmcaccess.thermometeraccess import ThermometerAccess, pretty_measurement
+
     mac = args.mac
+    if args.viadaemon:
+        data = request_daemon(args, lambda client: client.get_measurement(mac, max_age=args.maxage))
+        if data is not None:
+            message = pretty_measurement(types.SimpleNamespace(**data))
+            print("measurement:", message)
+            return
+
     device = ThermometerAccess(mac)
 
     with device.connect():
@@ -94,6 +109,9 @@ def process_read_data(args):
 
 
 def process_read_history(args):
+    from lywsd03mmcaccess import historystore
+    from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+
     mac = args.mac
     recent = args.recent
     if recent is not None:
@@ -105,6 +123,14 @@ def process_read_history(args):
 
     outfile = args.outappend
 
+    if args.viadaemon:
+        data = request_daemon(args, lambda client: client.get_history(mac, recent=recent))
+        if data is not None:
+            for item in data:
+                index = item["index"]
+                print(f"Entry {index}: {item}")
+            return
+
     device = ThermometerAccess(mac)
     if outfile is None:
         ## print history to screen
@@ -116,69 +142,218 @@ def process_read_history(args):
         return
 
     ## write history to file
+    if not historystore.prepare_output_file(outfile):
+        return
+
     with device.connect():
-        data_list = read_json(outfile)
-        json_recent_datetime = None
-        json_recent_timestamp = None
+        historystore.sync_history(device, outfile)
+
+
+def process_listen(args):
+    from lywsd03mmcaccess.thermometeraccess import ThermometerAccess, print_measurement_record
+    from lywsd03mmcaccess.sinks import FileSink, CallbackSink
+
+    sinks = []
+    if not args.noprint:
+        sinks.append(CallbackSink(print_measurement_record))
+    if args.outfile:
+        binary = args.format == "binary"
+        file_sink = FileSink(
+            args.outfile,
+            binary=binary,
+            flush_interval=args.flushinterval,
+            fsync_interval=args.fsyncinterval,
+        )
+        sinks.append(file_sink)
+
+    metrics_server = start_metrics_server(args)
+    if metrics_server is not None:
+        from lywsd03mmcaccess.exporter import ReadingsSink
+
+        sinks.append(ReadingsSink(metrics_server.readings, args.mac))
+
+    device = ThermometerAccess(args.mac)
+    listener = device.create_listener(sinks, buffer_capacity=args.buffersize)
+    if metrics_server is not None and listener.buffer is not None:
+        metrics_server.buffers[args.mac] = listener.buffer
+    try:
+        listener.listen()
+    except KeyboardInterrupt:
+        _LOGGER.info("listening stopped")
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+        if listener.buffer is not None:
+            _LOGGER.info("recent measurements: %s", listener.buffer.stats())
+
+
+## returns None if metrics endpoint is not requested
+def start_metrics_server(args):
+    if args.metricsport is None:
+        return None
+    from lywsd03mmcaccess.exporter import LatestReadings, MetricsServer
+
+    metrics_server = MetricsServer(LatestReadings(), host=args.metricshost, port=args.metricsport)
+    metrics_server.start()
+    return metrics_server
+
+
+def process_daemon(args):
+    from lywsd03mmcaccess.daemon import DeviceDaemon
+
+    device_daemon = DeviceDaemon(socket_path=args.socket, idle_timeout=args.idletimeout)
+    try:
+        device_daemon.serve()
+    except KeyboardInterrupt:
+        _LOGGER.info("daemon stopped")
+    return 0
+
+
+def process_metrics(args):
+    from lywsd03mmcaccess.daemon import DaemonClient
+
+    client = DaemonClient(socket_path=args.socket)
+    data = client.get_metrics(args.mac)
+    pprint.pprint(data, indent=2, sort_dicts=False)
+    return 0
+
+
+## returns None if daemon is not available (caller should access device directly)
+def request_daemon(args, request_function):
+    from lywsd03mmcaccess.daemon import DaemonClient, DaemonError
+
+    client = DaemonClient(socket_path=args.socket)
+    if not client.is_available():
+        _LOGGER.warning("daemon not running (socket: %s), accessing device directly", client.socket_path)
+        return None
+    try:
+        return request_function(client)
+    except DaemonError as exc:
+        _LOGGER.warning("daemon request failed, reason: %s, accessing device directly", exc)
+    return None
+
+
+def process_poll_all(args):
+    from lywsd03mmcaccess.poller import Poller, read_devices_file
+
+    mac_list = []
+    if args.devices:
+        mac_list.extend(read_devices_file(args.devices))
+    if args.mac:
+        mac_list.extend(args.mac)
+    if not mac_list:
+        _LOGGER.error("no devices given")
+        return 1
+
+    device_poller = Poller(ifaces=args.iface, workers=args.workers, timeout=args.timeout)
+    device_poller.read_history = args.history
+    device_poller.read_measurement = args.measurement or not args.history
+    device_poller.out_dir = args.outdir
+    if args.outdir:
+        os.makedirs(args.outdir, exist_ok=True)
+    elif device_poller.read_history:
+        _LOGGER.warning("history requires output directory, skipping history")
+
+    metrics_server = start_metrics_server(args)
+    summary = None
+    try:
+        while True:
+            _LOGGER.info("polling %s devices", len(mac_list))
+            summary = device_poller.poll(mac_list)
+            if metrics_server is not None:
+                for result in summary.results:
+                    if result.measurement is not None:
+                        metrics_server.readings.update(result.mac, result.measurement)
+            print_poll_summary(summary)
+            if args.interval is None:
+                break
+            time.sleep(max(0.0, args.interval - summary.wall_time))
+    except KeyboardInterrupt:
+        _LOGGER.info("polling stopped")
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+
+    if summary is None or summary.failed:
+        return 1
+    return 0
+
+
+def print_poll_summary(summary):
+    for result in summary.results:
+        duration = "-" if result.duration is None else f"{result.duration:.2f}s"
+        if result.error is not None:
+            print(f"{result.mac}: error: {result.error} time: {duration}")
+            continue
+        message = f"{result.mac}:"
+        if result.measurement is not None:
+            measurement = result.measurement
+            message += (
+                f""" Temperature: {measurement["T"]}C Humidity: {measurement["H"]}% Battery: {measurement["B"]}%"""
+            )
+        if result.history_entries is not None:
+            message += f" new history entries: {result.history_entries}"
+        print(f"{message} time: {duration}")
+    print(f"devices: {len(summary.results)} failed: {len(summary.failed)}")
+    print(f"wall time: {summary.wall_time:.2f}s sum of devices time: {summary.devices_time:.2f}s")
+
+
+def process_migrate_data(args):
+    from lywsd03mmcaccess.io import read_data, write_binary, migrate_json_to_json_lines
+
+    infile = args.infile
+    outfile = args.outfile
+    if not os.path.isfile(infile):
+        _LOGGER.error("unable to read data from path %s", infile)
+        return 1
+
+    if args.format == "binary":
+        data_list = read_data(infile)
         if data_list is None:
-            data_list = []
-        else:
-            recent_entry = data_list[-1]
-            recent_datetime = recent_entry["wall_datetime"]
-            json_recent_datetime = datetime.datetime.fromisoformat(recent_datetime)
-            json_recent_timestamp = json_recent_datetime.timestamp()
-
-        history_data = device.get_history_measurements(recent_timestamp=json_recent_timestamp)
-        new_items = []
-        for hist_item in history_data:
-            if json_recent_timestamp is not None:
-                item_datetime = hist_item["wall_datetime"]
-                hist_item_datetime = datetime.datetime.fromisoformat(item_datetime)
-                hist_item_timestamp = hist_item_datetime.timestamp()
-                timestamp_diff_minutes = (hist_item_timestamp - json_recent_timestamp) / 60
-                if timestamp_diff_minutes <= 5.0:
-                    ## skipping entry
-                    _LOGGER.debug(
-                        "skipping entry: %s[s] ts: %s recent json entry: %s",
-                        timestamp_diff_minutes * 60,
-                        hist_item_datetime,
-                        json_recent_datetime,
-                    )
-                    continue
-            new_items.append(hist_item)
-            entry = dict(hist_item)
-            _LOGGER.info("adding history entry: %s", entry)
-        if not new_items:
-            _LOGGER.info("no new history entries to append")
-            return
-        _LOGGER.info("writing history new %s items to file: %s", len(new_items), outfile)
-        data_list.extend(new_items)
-        write_object(data_list, outfile, indent=2)
+            _LOGGER.error("unable to read data from path %s", infile)
+            return 1
+        if outfile is None:
+            outfile = infile
+        _LOGGER.info("writing %s entries in binary format to file: %s", len(data_list), outfile)
+        write_binary(data_list, outfile)
+        return 0
+
+    if not migrate_json_to_json_lines(infile, outfile):
+        _LOGGER.error("unable to convert data from path %s", infile)
+        return 1
+    return 0
 
 
 def process_print_data(args):
     infile = args.infile
-    data_list = read_json(infile)
-    if data_list is None:
+    if not os.path.isfile(infile):
         _LOGGER.error("unable to read data from path %s", infile)
         return
-    if not data_list:
+    showchart = args.showchart
+    outchart = args.outchart
+    columns = args.columns.split(",") if args.columns else None
+    ## if entries are only printed, then stream them without loading whole file
+    data_list = read_print_data(args, stream=not (showchart or outchart or args.noprint))
+    if data_list is None:
+        _LOGGER.error("unable to read data from path %s", infile)
         return
 
-    recent = parse_int(args.recent)
-    if recent:
-        recent = min(recent, len(data_list))
-        data_list = data_list[-recent:]
-
     noprint = args.noprint
 
     if not noprint:
         ## print data
         _LOGGER.info("printing raw data")
-        print_raw(data_list)
-
-    showchart = args.showchart
-    outchart = args.outchart
+        try:
+            items_num = print_raw(data_list, args.format, columns)
+        except ValueError as exc:
+            _LOGGER.error("unable to print data: %s", exc)
+            return
+        if items_num == 0:
+            _LOGGER.info("no data in given range")
+            return
+    elif len(data_list) < 1:
+        _LOGGER.info("no data in given range")
+        return
 
     if not showchart and not outchart:
         return
@@ -186,165 +361,102 @@ def process_print_data(args):
     ## show plot
     _LOGGER.info("generating plot data")
 
-    if "Tmin" in data_list[0]:
-        plot_history(data_list)
+    ## matplotlib is imported only if chart is requested
+    from lywsd03mmcaccess.charts import plot_data
+    from matplotlib.figure import Figure
+
+    if showchart:
+        ## window needs pyplot
+        import matplotlib.pyplot as plt
+
+        figure = plt.figure()
     else:
-        plot_measurements(data_list)
+        figure = Figure()
+    plot_data(figure, data_list, downsample=not args.nodownsample)
 
     if outchart:
         _LOGGER.info("storing plot to file '%s'", outchart)
-        plt.savefig(outchart)
+        figure.savefig(outchart)
 
     if showchart:
         _LOGGER.info("opening plot window")
         plt.show()
 
 
-def plot_history(data_list):
-    xpoints = []
-    ytemperature = []
-    ytemperature_diff = []
-    yhumidity = []
-    yhumidity_diff = []
-
-    prev_temp_avg = -999
-    prev_hum_avg = -999
-    for item in data_list:
-        curr_datetime = item["wall_datetime"]
-        curr_time = datetime.datetime.fromisoformat(curr_datetime)
-
-        xpoints.append(curr_time)
-        temp_min = item["Tmin"]
-        temp_max = item["Tmax"]
-        ytemperature.append((temp_min, temp_max))
-        curr_temp_avg = (temp_max + temp_min) / 2.0
-        temp_diff = temp_max - temp_min
-        if curr_temp_avg < prev_temp_avg:
-            temp_diff *= -1
-        ytemperature_diff.append(temp_diff)
-        prev_temp_avg = curr_temp_avg
-
-        hum_min = item["Hmin"]
-        hum_max = item["Hmax"]
-        yhumidity.append((hum_min, hum_max))
-        curr_hum_avg = (hum_max + hum_min) / 2.0
-        hum_diff = hum_max - hum_min
-        if curr_hum_avg < prev_hum_avg:
-            hum_diff *= -1
-        yhumidity_diff.append(hum_diff)
-        prev_hum_avg = curr_hum_avg
-
-    axes = plt.subplot(4, 1, 1)
-    plt.plot(xpoints, ytemperature)  # type: ignore[arg-type]
-    plt.title("Minimum and maximum temperature")
-    # plt.ylabel('Temperature')
-    axes.minorticks_on()
-    axes.grid()
-
-    axes = plt.subplot(4, 1, 2)
-    plt.plot(xpoints, ytemperature_diff)  # type: ignore[arg-type]
-    plt.title("Temperature difference")
-    # plt.ylabel('Temperature')
-    axes.minorticks_on()
-    axes.grid()
-
-    axes = plt.subplot(4, 1, 3)
-    plt.plot(xpoints, yhumidity)  # type: ignore[arg-type]
-    plt.title("Minimum and maximum humidity")
-    # plt.ylabel('Humidity')
-    axes.minorticks_on()
-    axes.grid()
-
-    axes = plt.subplot(4, 1, 4)
-    plt.plot(xpoints, yhumidity_diff)  # type: ignore[arg-type]
-    plt.title("Humidity difference")
-    # plt.ylabel('Humidity')
-    axes.minorticks_on()
-    axes.grid()
-
-    plt.tight_layout()
-
-
-def plot_measurements(data_list):
-    xpoints = []
-    ytemperature = []
-    yhumidity = []
-    ybattery = []
-
-    curr_timezone = current_timezone()
-    start_time = None
-    for item in data_list:
-        curr_timestamp = item["timestamp"]
-        curr_time = datetime.datetime.fromtimestamp(curr_timestamp, tz=curr_timezone)
-
-        if start_time is None:
-            start_time = curr_time
-        time_diff = curr_time - start_time
-        delta = time_diff.total_seconds()
-
-        xpoints.append(delta)
-        temp = item["T"]
-        ytemperature.append(temp)
-        hum = item["H"]
-        yhumidity.append(hum)
-        batt = item["B"]
-        ybattery.append(batt)
-
-    def format_deltatime(value, _pos=None):
-        delta = datetime.timedelta(seconds=value)
-        return f"{delta}"
-
-    axes = plt.subplot(3, 1, 1)
-    plt.plot(xpoints, ytemperature, marker=".")
-    plt.title("Temperature")
-    axes.xaxis.set_major_formatter(format_deltatime)
-    axes.minorticks_on()
-    axes.grid()
-
-    axes = plt.subplot(3, 1, 2)
-    plt.plot(xpoints, yhumidity, marker=".")
-    plt.title("Humidity")
-    axes.xaxis.set_major_formatter(format_deltatime)
-    axes.minorticks_on()
-    axes.grid()
-
-    axes = plt.subplot(3, 1, 3)
-    plt.plot(xpoints, ybattery, marker=".")
-    plt.title("Battery")
-    axes.xaxis.set_major_formatter(format_deltatime)
-    axes.minorticks_on()
-    axes.grid()
-
-    plt.tight_layout()
-
-
-def print_raw(data_list):
-    curr_timezone = current_timezone()
-    for index, item in enumerate(data_list):
-        if "Tmin" in item:
-            ## history data
-            curr_timestamp = item["dev_timestamp"]
-            curr_datetime = item["wall_datetime"]
-            curr_time = datetime.datetime.fromisoformat(curr_datetime)
-            print(
-                f"""Entry {index}: {curr_timestamp} {curr_time} Tmin: {item["Tmin"]} Tmax: {item["Tmax"]}""",
-                f""" Hmin: {item["Hmin"]} Hmax: {item["Hmax"]}""",
-            )
-        else:
-            ## measurement data
-            curr_timestamp = item["timestamp"]
-            curr_time = datetime.datetime.fromtimestamp(curr_timestamp, tz=curr_timezone)
-            print(
-                f"""Entry {index}: {curr_time} T: {item["T"]} H: {item["H"]} B: {item["B"]}""",
-            )
+## returns entries of data file of 'printhistory' command
+def read_print_data(args, *, stream=False):
+    from lywsd03mmcaccess import timeindex
+
+    infile = args.infile
+    recent = parse_int(args.recent)
+    from_timestamp = parse_datetime_timestamp(args.from_time)
+    to_timestamp = parse_datetime_timestamp(args.to_time)
+    tier = None
+    if args.resolution:
+        from lywsd03mmcaccess import rollup
+
+        resolution = rollup.TIERS.get(args.resolution)
+        if resolution is None:
+            resolution = parse_int(args.resolution)
+        tier = rollup.select_tier(resolution, from_timestamp, to_timestamp)
+    if tier is not None:
+        _LOGGER.info("reading '%s' rollups", tier)
+        data_list = rollup.read_rollup(infile, tier, from_timestamp, to_timestamp)
+        if data_list is not None and recent is not None and recent > 0:
+            data_list = data_list[-recent:]
+        return data_list
+    if stream:
+        return timeindex.iter_data_range(infile, from_timestamp, to_timestamp, recent)
+    return timeindex.read_data_range(infile, from_timestamp, to_timestamp, recent)
+
+
+def process_render_all(args):
+    from lywsd03mmcaccess import charts
+
+    data_files = charts.find_data_files(args.infile)
+    if not data_files:
+        _LOGGER.error("no data files found")
+        return
+    if args.outdir:
+        os.makedirs(args.outdir, exist_ok=True)
+    results = charts.render_charts(
+        data_files,
+        out_dir=args.outdir,
+        workers=args.workers,
+        force=args.force,
+        downsample=not args.nodownsample,
+    )
+    for data_path, chart_path, status in results:
+        print(f"{data_path} -> {chart_path}: {status}")
+
+
+## 'out_format' - one of 'bulkwriter.FORMATS', 'columns' - list of columns to print (all if None)
+## returns number of printed entries, None if output was closed
+def print_raw(data_list, out_format="text", columns=None):
+    from lywsd03mmcaccess.bulkwriter import write_entries
+
+    try:
+        items_num = write_entries(data_list, sys.stdout, out_format, columns)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        ## output closed by reader (e.g. 'head'), redirect remaining output to avoid error on exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return None
+    return items_num
 
 
 def process_convert_measurements(args):
+    from lywsd03mmcaccess.io import write_json_array_stream, write_json_lines_stream
+    from lywsd03mmcaccess.logparser import iter_file_measurements, iter_stream_measurements
+
     input_file = args.infile
     output_file = args.outfile
-    no_print = args.noprint
-
-    data_list = read_list(input_file)
+    ## nothing else can be printed when stdout is output
+    no_print = args.noprint or output_file == "-"
+    if input_file != "-" and not os.path.isfile(input_file):
+        _LOGGER.error("unable to read data from path %s", input_file)
+        return
 
     base_date = None
     if args.basedate:
@@ -356,48 +468,40 @@ def process_convert_measurements(args):
     if base_date is None:
         base_date = datetime.date.today()
 
-    hour_offset = 0
-    recent_date_data = None
-    out_list = []
-    for item in data_list:
-        item_elements = item.split(" ")
-
-        date_content = item_elements[0]
-        date_content = date_content[1:-1]
-        temp_content = item_elements[3]
-        hum_content = item_elements[5]
-        batt_content = item_elements[7]
-
-        converted_date = convert_to_datetime(date_content, base_date)
-        date_data = converted_date + datetime.timedelta(hours=hour_offset)
-        if recent_date_data is not None and recent_date_data > date_data:
-            hour_offset += 24
-            date_data = converted_date + datetime.timedelta(hours=hour_offset)
-        recent_date_data = date_data
-
-        temp_data = float(temp_content[:-1])
-        hum_data = int(hum_content[:-1])
-        batt_data = int(batt_content[:-1])
-
-        data_dict = {"timestamp": date_data.timestamp(), "T": temp_data, "H": hum_data, "B": batt_data}
-        out_list.append(data_dict)
-
+    ## records are converted and written one by one, so memory use does not depend on input size
+    if input_file == "-":
+        records = iter_stream_measurements(sys.stdin, base_date)
+    else:
+        records = iter_file_measurements(input_file, base_date, workers=args.workers)
     if not no_print:
-        # ruff: noqa: T203
-        pprint.pprint(out_list)
+        records = print_records(records)
 
-    if output_file:
-        _LOGGER.info("writing to file: %s", output_file)
-        write_object(out_list, output_file, indent=2)
+    if not output_file:
+        for _ in records:
+            pass
+        return
 
+    with contextlib.ExitStack() as stack:
+        if output_file == "-":
+            out_stream = sys.stdout
+        else:
+            _LOGGER.info("writing to file: %s", output_file)
+            out_stream = stack.enter_context(open(output_file, "w", encoding="utf-8"))  # noqa: SIM115
+        if args.format == "jsonl":
+            items_num = write_json_lines_stream(records, out_stream)
+        else:
+            items_num = write_json_array_stream(records, out_stream, indent=2)
+            if output_file == "-":
+                out_stream.write("\n")
+    _LOGGER.info("converted %s measurements", items_num)
 
-def convert_to_datetime(date_string, base_date: datetime.date):
-    ## format codes: https://docs.python.org/3/library/datetime.html#strftime-and-strptime-format-codes
 
-    ## example: [23:03:52.888767] measurement: Temperature: 23.25C Humidity: 61% Battery: 77%
-    ret_date = datetime.datetime.strptime(date_string, "%H:%M:%S.%f")
-    time_obj = ret_date.time()
-    return datetime.datetime.combine(base_date, time_obj)
+## yields given records and prints them on the way
+def print_records(records):
+    for item in records:
+        # ruff: noqa: T203
+        pprint.pprint(dict(item))
+        yield item
 
 
 # =======================================================================
@@ -413,70 +517,264 @@ def prepare_parser():
     parser.add_argument("-nl", "--nolog", action="store_true", help="No diagnostics log messages")
     # have to be implemented as parameter instead of command (because access to 'subparsers' object)
     parser.add_argument("--listtools", action="store_true", help="List tools")
+    parser.add_argument(
+        "--cachehandles",
+        action="store_true",
+        help="Store GATT handles of devices in application data directory to skip discovery on next run",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store",
+        required=False,
+        help="Use simulated device instead of Bluetooth, comma separated options:"
+        " history=<entries>,latency=<seconds>,connect=<seconds>,loss=<probability>,seed=<number>"
+        " (pass empty string for defaults)",
+    )
+    parser.add_argument(
+        "--metricsout",
+        action="store",
+        required=False,
+        help="Write device access metrics (timings and counters) as JSON after command ends ('-' for stdout)",
+    )
     parser.set_defaults(func=None)
 
     subparsers = parser.add_subparsers(help="commands", description="commands", dest="command", required=False)
 
-    ## =================================================
+    add_info_parser(subparsers)
+    add_read_data_parser(subparsers)
+    add_read_history_parser(subparsers)
+    add_listen_parser(subparsers)
+    add_daemon_parser(subparsers)
+    add_metrics_parser(subparsers)
+    add_poll_all_parser(subparsers)
+    add_print_data_parser(subparsers)
+    add_render_all_parser(subparsers)
+    add_convert_measurements_parser(subparsers)
+    add_migrate_data_parser(subparsers)
 
-    description = "read device basic data"
+    return parser, subparsers
+
+
+## returns parser of command
+def add_command_parser(subparsers, name, description, func):
     subparser = subparsers.add_parser(
-        "info",
+        name,
         help=description,
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
     subparser.description = description
-    subparser.set_defaults(func=process_info)
+    subparser.set_defaults(func=func)
+    return subparser
+
+
+def add_info_parser(subparsers):
+    description = "read device basic data"
+    subparser = add_command_parser(subparsers, "info", description, process_info)
     subparser.add_argument("--mac", action="store", required=True, help="MAC address of device")
+    add_daemon_arguments(subparser)
 
-    ## =================================================
 
+def add_read_data_parser(subparsers):
     description = "read current measurement"
-    subparser = subparsers.add_parser(
-        "readdata",
-        help=description,
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-    )
-    subparser.description = description
-    subparser.set_defaults(func=process_read_data)
+    subparser = add_command_parser(subparsers, "readdata", description, process_read_data)
     subparser.add_argument("--mac", action="store", required=True, help="MAC address of device")
+    add_daemon_arguments(subparser)
+    subparser.add_argument(
+        "--maxage",
+        action="store",
+        type=float,
+        default=60.0,
+        help="Accept measurement cached by daemon if not older than given number of seconds",
+    )
 
-    ## =================================================
 
+def add_read_history_parser(subparsers):
     description = "read history"
-    subparser = subparsers.add_parser(
-        "readhistory",
-        help=description,
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-    )
-    subparser.description = description
-    subparser.set_defaults(func=process_read_history)
+    subparser = add_command_parser(subparsers, "readhistory", description, process_read_history)
     subparser.add_argument("--mac", action="store", required=True, help="MAC address of device")
     subparser.add_argument("--recent", action="store", required=False, help="Number of recent entries")
-    subparser.add_argument(
+    ## synchronization of stored history requires direct access to device
+    output_group = subparser.add_mutually_exclusive_group()
+    output_group.add_argument(
         "--outappend",
         action="store",
         required=False,
-        help="Path to output JSON file to append history data",
+        help="Path to output JSON lines or binary file to append history data (JSON array file is converted)",
     )
+    add_daemon_arguments(subparser, viadaemon_group=output_group)
 
-    ## =================================================
 
-    description = "print data file (history or measurements)"
-    subparser = subparsers.add_parser(
-        "printhistory",
-        help=description,
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+def add_listen_parser(subparsers):
+    description = "subscribe to measurement notifications and store received measurements"
+    subparser = add_command_parser(subparsers, "listen", description, process_listen)
+    subparser.add_argument("--mac", action="store", required=True, help="MAC address of device")
+    subparser.add_argument(
+        "--outfile",
+        action="store",
+        required=False,
+        help="Path to data file to append received measurements",
     )
-    subparser.description = description
-    subparser.set_defaults(func=process_print_data)
+    subparser.add_argument(
+        "--format",
+        action="store",
+        choices=["jsonl", "binary"],
+        default="jsonl",
+        help="Format of new output file (existing file keeps its format)",
+    )
+    subparser.add_argument(
+        "--flushinterval",
+        action="store",
+        type=float,
+        default=60.0,
+        help="Maximum time in seconds received measurements are kept in memory before writing",
+    )
+    subparser.add_argument(
+        "--fsyncinterval",
+        action="store",
+        type=float,
+        default=600.0,
+        help="Maximum time in seconds written measurements are not forced to storage device",
+    )
+    subparser.add_argument("--noprint", action="store_true", help="Do not print received measurements")
+    subparser.add_argument(
+        "--buffersize",
+        action="store",
+        type=int,
+        required=False,
+        help="Number of recent measurements kept in memory (e.g. 14400 for 24h), their min, max and mean"
+        " are served by metrics endpoint",
+    )
+    add_metrics_server_arguments(subparser)
+
+
+def add_daemon_parser(subparsers):
+    description = "run daemon keeping devices connected and serving requests over local socket"
+    subparser = add_command_parser(subparsers, "daemon", description, process_daemon)
+    subparser.add_argument(
+        "--socket",
+        action="store",
+        required=False,
+        help="Path to daemon Unix socket (if not given, then socket in application data directory is used)",
+    )
+    subparser.add_argument(
+        "--idletimeout",
+        action="store",
+        type=float,
+        default=300.0,
+        help="Disconnect device not used for given number of seconds",
+    )
+
+
+def add_metrics_parser(subparsers):
+    description = "print device access metrics (timings and counters) collected by running daemon"
+    subparser = add_command_parser(subparsers, "metrics", description, process_metrics)
+    subparser.add_argument("--mac", action="store", required=False, help="MAC address of device (all if not given)")
+    subparser.add_argument(
+        "--socket",
+        action="store",
+        required=False,
+        help="Path to daemon Unix socket (if not given, then socket in application data directory is used)",
+    )
+
+
+def add_poll_all_parser(subparsers):
+    description = "read current measurement and/or history of multiple devices concurrently"
+    subparser = add_command_parser(subparsers, "pollall", description, process_poll_all)
+    subparser.add_argument("--mac", action="append", required=False, help="MAC address of device (can be repeated)")
+    subparser.add_argument(
+        "--devices",
+        action="store",
+        required=False,
+        help="Path to file with list of devices MAC addresses (one per line)",
+    )
+    subparser.add_argument(
+        "--measurement",
+        action="store_true",
+        required=False,
+        help="Read current measurement (default if --history not given)",
+    )
+    subparser.add_argument("--history", action="store_true", required=False, help="Read history (requires --outdir)")
+    subparser.add_argument(
+        "--outdir",
+        action="store",
+        required=False,
+        help="Path to directory to append measurements and history of each device",
+    )
+    subparser.add_argument(
+        "--iface",
+        action="append",
+        type=int,
+        required=False,
+        help="Number of HCI adapter to use (can be repeated to spread devices across adapters)",
+    )
+    subparser.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        default=2,
+        help="Number of concurrent connections per adapter",
+    )
+    subparser.add_argument(
+        "--timeout",
+        action="store",
+        type=float,
+        default=90.0,
+        help="Maximum time of processing single device in seconds",
+    )
+    subparser.add_argument(
+        "--interval",
+        action="store",
+        type=float,
+        required=False,
+        help="Repeat polling every given number of seconds (poll once if not given)",
+    )
+    add_metrics_server_arguments(subparser)
+
+
+def add_print_data_parser(subparsers):
+    description = "print data file (history or measurements)"
+    subparser = add_command_parser(subparsers, "printhistory", description, process_print_data)
     subparser.add_argument(
         "--infile",
         action="store",
         required=True,
-        help="Path to JSON file with data",
+        help="Path to JSON, JSON lines or binary file with data",
+    )
+    subparser.add_argument(
+        "--format",
+        action="store",
+        choices=["text", "csv", "tsv", "jsonl"],
+        default="text",
+        help="Format of printed data",
+    )
+    subparser.add_argument(
+        "--columns",
+        action="store",
+        required=False,
+        help="Comma separated list of printed columns, e.g. 'wall_datetime,Tmin,Tmax' (all if not given)",
     )
     subparser.add_argument("--recent", action="store", required=False, help="Number of recent entries")
+    subparser.add_argument(
+        "--from",
+        dest="from_time",
+        action="store",
+        required=False,
+        help="Print entries since given time (inclusive), ISO format, e.g. '2025-09-19 08:00'",
+    )
+    subparser.add_argument(
+        "--to",
+        dest="to_time",
+        action="store",
+        required=False,
+        help="Print entries until given time (inclusive), ISO format, e.g. '2025-09-19 20:00'",
+    )
+    subparser.add_argument(
+        "--resolution",
+        action="store",
+        required=False,
+        help="Maximal time step of entries: 'hour', 'day', 'month' or number of seconds."
+        " Coarsest fitting rollup (minimum, maximum, mean and count) is used instead of raw data",
+    )
     subparser.add_argument("--noprint", action="store_true", required=False, help="Do not print raw data")
     subparser.add_argument("--showchart", action="store_true", required=False, help="Show data chart")
     subparser.add_argument(
@@ -485,28 +783,64 @@ def prepare_parser():
         required=False,
         help="Print data in form of chart",
     )
+    subparser.add_argument(
+        "--nodownsample",
+        action="store_true",
+        help="Plot all data points (by default data is reduced to minimum and maximum per pixel)",
+    )
 
-    ## =================================================
 
-    description = "convert measurements list to JSON"
-    subparser = subparsers.add_parser(
-        "convertmeasurements",
-        help=description,
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+def add_render_all_parser(subparsers):
+    description = "render charts of multiple data files in parallel"
+    subparser = add_command_parser(subparsers, "renderall", description, process_render_all)
+    subparser.add_argument(
+        "--infile",
+        action="append",
+        required=True,
+        help="Path or glob pattern of data files (can be repeated)",
     )
-    subparser.description = description
-    subparser.set_defaults(func=process_convert_measurements)
+    subparser.add_argument(
+        "--outdir",
+        action="store",
+        required=False,
+        help="Directory of charts (if not given, then chart is stored next to data file)",
+    )
+    subparser.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        required=False,
+        help="Number of rendering processes (if not given, then number of CPUs is used)",
+    )
+    subparser.add_argument("--force", action="store_true", help="Render charts newer than data files")
+    subparser.add_argument(
+        "--nodownsample",
+        action="store_true",
+        help="Plot all data points (by default data is reduced to minimum and maximum per pixel)",
+    )
+
+
+def add_convert_measurements_parser(subparsers):
+    description = "convert measurements list to JSON"
+    subparser = add_command_parser(subparsers, "convertmeasurements", description, process_convert_measurements)
     subparser.add_argument(
         "--infile",
         action="store",
         required=True,
-        help="Path to measurements file",
+        help="Path to measurements file ('-' for standard input)",
     )
     subparser.add_argument(
         "--outfile",
         action="store",
         required=False,
-        help="Path to output JSON",
+        help="Path to output JSON ('-' for standard output)",
+    )
+    subparser.add_argument(
+        "--format",
+        action="store",
+        choices=["json", "jsonl"],
+        default="json",
+        help="Output format: JSON array or JSON lines",
     )
     subparser.add_argument(
         "--basedate",
@@ -515,9 +849,71 @@ def prepare_parser():
         default="",
         help="Set measurements base date, format: Y-m-d",
     )
+    subparser.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        default=1,
+        help="Number of processes parsing large input file (only for lines containing full date)",
+    )
     subparser.add_argument("--noprint", action="store_true", required=False, help="Do not print raw data")
 
-    return parser, subparsers
+
+def add_migrate_data_parser(subparsers):
+    description = "convert data file to JSON lines or binary format"
+    subparser = add_command_parser(subparsers, "migratedata", description, process_migrate_data)
+    subparser.add_argument(
+        "--infile",
+        action="store",
+        required=True,
+        help="Path to JSON file with data",
+    )
+    subparser.add_argument(
+        "--outfile",
+        action="store",
+        required=False,
+        help="Path to output file (if not given, then input file is replaced)",
+    )
+    subparser.add_argument(
+        "--format",
+        action="store",
+        required=False,
+        default="jsonl",
+        choices=["jsonl", "binary"],
+        help="Output format",
+    )
+
+
+## 'viadaemon_group' - mutually exclusive group to add '--viadaemon' argument to
+def add_daemon_arguments(subparser, viadaemon_group=None):
+    (viadaemon_group or subparser).add_argument(
+        "--viadaemon",
+        action="store_true",
+        required=False,
+        help="Request data through running daemon (access device directly if daemon is not available)",
+    )
+    subparser.add_argument(
+        "--socket",
+        action="store",
+        required=False,
+        help="Path to daemon Unix socket (if not given, then socket in application data directory is used)",
+    )
+
+
+def add_metrics_server_arguments(subparser):
+    subparser.add_argument(
+        "--metricsport",
+        action="store",
+        type=int,
+        required=False,
+        help="Serve latest readings and access metrics over HTTP in Prometheus text format on given port",
+    )
+    subparser.add_argument(
+        "--metricshost",
+        action="store",
+        default="127.0.0.1",
+        help="Address of metrics HTTP endpoint",
+    )
 
 
 def parse_int(input_value):
@@ -530,6 +926,18 @@ def parse_int(input_value):
     return None
 
 
+## convert ISO datetime string (local time if no timezone given) to timestamp
+def parse_datetime_timestamp(input_value):
+    if not input_value:
+        return None
+    try:
+        value_datetime = datetime.datetime.fromisoformat(input_value)
+    except ValueError:
+        _LOGGER.warning("unable to convert '%s' to datetime", input_value)
+        return None
+    return value_datetime.timestamp()
+
+
 def main():
     parser, subparsers = prepare_parser()
 
@@ -548,6 +956,18 @@ def main():
     else:
         logger.configure(log_level=logging.INFO)
 
+    if args.cachehandles is True:
+        from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+
+        ThermometerAccess.PERSIST_HANDLES = True
+
+    if args.simulate is not None:
+        from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+        from lywsd03mmcaccess.simulator import SimulatedPeripheral
+
+        SimulatedPeripheral.from_spec(args.simulate)  ## validate options
+        ThermometerAccess.PERIPHERAL_FACTORY = lambda _mac: SimulatedPeripheral.from_spec(args.simulate)
+
     if "func" not in args or args.func is None:
         ## no command given -- print help message
         parser.print_help()
@@ -555,9 +975,24 @@ def main():
 
     try:
         return args.func(args)
-    except bluepy.btle.BTLEDisconnectError as exc:
+    except Exception as exc:
+        if not is_disconnect_error(exc):
+            raise
         _LOGGER.error("unable to connect, reason: %s", exc)
         return 1
+    finally:
+        if args.metricsout:
+            from lywsd03mmcaccess.metrics import REGISTRY
+
+            REGISTRY.dump(args.metricsout)
+
+
+## check exception without importing bluepy (if bluepy is not loaded, then exception can not come from it)
+def is_disconnect_error(exc):
+    btle = sys.modules.get("bluepy.btle")
+    if btle is None:
+        return False
+    return isinstance(exc, btle.BTLEDisconnectError)
 
 
 if __name__ == "__main__":
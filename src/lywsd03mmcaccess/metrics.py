@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import sys
+import json
+import contextlib
+import threading
+import time
+
+from lywsd03mmcaccess.io import write_object
+
+
+## registry of counters, gauges and timers identified by name and labels (e.g. MAC address)
+## recording is cheap (dictionary update under lock), aggregation is done on 'snapshot()'
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  ## (name, labels) -> value
+        self._gauges = {}  ## (name, labels) -> value
+        self._timers = {}  ## (name, labels) -> [count, total, min, max]
+
+    def increment(self, name, value=1, **labels: str):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels: str):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    ## record duration in seconds
+    def observe(self, name, seconds, **labels: str):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            stats = self._timers.get(key)
+            if stats is None:
+                self._timers[key] = [1, seconds, seconds, seconds]
+                return
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = min(stats[2], seconds)
+            stats[3] = max(stats[3], seconds)
+
+    ## measure duration of 'with' block (also when exception is raised)
+    @contextlib.contextmanager
+    def timer(self, name, **labels: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timers.clear()
+
+    ## returns dict of lists, e.g.:
+    ##   {"counters": [{"name": "disconnects", "labels": {"mac": ...}, "value": 2}, ...],
+    ##    "gauges": [{"name": ..., "labels": ..., "value": ...}, ...],
+    ##    "timers": [{"name": "read", "labels": {"mac": ..., "uuid": ...},
+    ##                "count": 3, "total": 0.3, "min": 0.1, "max": 0.1, "mean": 0.1}, ...]}
+    ## 'labels' - return only metrics with given labels values (e.g. mac="AA:BB:CC:DD:EE:FF")
+    def snapshot(self, **labels: str):
+        with self._lock:
+            counters = list(self._counters.items())
+            gauges = list(self._gauges.items())
+            timers = [(key, list(stats)) for key, stats in self._timers.items()]
+        ret_dict = {"counters": [], "gauges": [], "timers": []}
+        for (name, labels_key), value in sorted(counters):
+            if _labels_match(labels_key, labels):
+                ret_dict["counters"].append({"name": name, "labels": dict(labels_key), "value": value})
+        for (name, labels_key), value in sorted(gauges):
+            if _labels_match(labels_key, labels):
+                ret_dict["gauges"].append({"name": name, "labels": dict(labels_key), "value": value})
+        for (name, labels_key), (count, total, min_value, max_value) in sorted(timers):
+            if _labels_match(labels_key, labels):
+                item = {"name": name, "labels": dict(labels_key), "count": count, "total": total}
+                item.update({"min": min_value, "max": max_value, "mean": total / count})
+                ret_dict["timers"].append(item)
+        return ret_dict
+
+    def toJSON(self):  # noqa: N802
+        return self.snapshot()
+
+    ## 'file_path' - output file, '-' for standard output
+    def dump(self, file_path):
+        if file_path == "-":
+            json.dump(self.snapshot(), sys.stdout, indent=2)
+            sys.stdout.write("\n")
+            return
+        write_object(self.snapshot(), file_path, indent=2)
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _labels_match(labels_key, labels):
+    if not labels:
+        return True
+    labels_dict = dict(labels_key)
+    return all(labels_dict.get(key) == value for key, value in labels.items())
+
+
+## default registry of application
+REGISTRY = MetricsRegistry()
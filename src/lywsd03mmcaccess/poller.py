@@ -0,0 +1,180 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import struct
+import threading
+import time
+from concurrent import futures
+
+import bluepy
+
+from lywsd03mmcaccess import historystore
+from lywsd03mmcaccess.io import read_list
+from lywsd03mmcaccess.thermometeraccess import ThermometerAccess, to_measurement_record
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## read devices list file: one MAC address per line, '#' starts comment
+def read_devices_file(file_path):
+    ret_list = []
+    for line in read_list(file_path):
+        content = line.split("#", 1)[0]
+        items = content.split()
+        if items:
+            ret_list.append(items[0])
+    return ret_list
+
+
+def get_history_path(out_dir, mac):
+    name = mac.replace(":", "_")
+    return os.path.join(out_dir, f"{name}_history.json")
+
+
+def get_measurements_path(out_dir, mac):
+    name = mac.replace(":", "_")
+    return os.path.join(out_dir, f"{name}_measurements.json")
+
+
+class PollResult:
+    def __init__(self, mac, iface=None):
+        self.mac = mac
+        self.iface = iface
+        self.measurement = None  ## {"timestamp": float, "T": float, "H": int, "B": int}
+        self.history_entries = None  ## number of new history entries
+        self.error = None
+        self.duration = None  ## time of device processing in seconds
+
+    def toJSON(self):  # noqa: N802
+        return dict(self.__dict__)
+
+
+class PollSummary:
+    def __init__(self, results, wall_time):
+        self.results = results
+        self.wall_time = wall_time
+
+    ## sum of processing times of all devices
+    @property
+    def devices_time(self):
+        return sum(result.duration for result in self.results if result.duration is not None)
+
+    @property
+    def failed(self):
+        return [result for result in self.results if result.error is not None]
+
+    def toJSON(self):  # noqa: N802
+        return {"wall_time": self.wall_time, "devices_time": self.devices_time, "results": self.results}
+
+
+class _PollTask:
+    def __init__(self, mac, iface, options):
+        self.result = PollResult(mac, iface)
+        self.options = options
+        self.device = None
+        self.start_time = None
+        self.timed_out = False
+        self._lock = threading.Lock()
+
+    def run(self):
+        with self._lock:
+            self.start_time = time.monotonic()
+            self.device = ThermometerAccess(self.result.mac, self.options.access_timeout, self.result.iface)
+        try:
+            self._process()
+        except (bluepy.btle.BTLEException, TimeoutError, OSError, ValueError, struct.error) as exc:
+            self._set_error(exc)
+        except Exception as exc:  # noqa: BLE001  # pylint: disable=W0718
+            ## unexpected error (e.g. invalid stored data) - report device as failed with traceback
+            self._set_error(exc, exc_info=True)
+        with self._lock:
+            if not self.timed_out:
+                self.result.duration = time.monotonic() - self.start_time
+        return self.result
+
+    def _set_error(self, exc, *, exc_info=False):
+        with self._lock:
+            if self.timed_out:
+                return
+            self.result.error = f"{type(exc).__name__}: {exc}"
+        _LOGGER.error("unable to poll device %s, reason: %s", self.result.mac, self.result.error, exc_info=exc_info)
+
+    ## returns True if task exceeded timeout and was aborted
+    def check_timeout(self, timeout):
+        with self._lock:
+            if self.start_time is None:
+                ## not started yet
+                return False
+            duration = time.monotonic() - self.start_time
+            if duration < timeout:
+                return False
+            self.timed_out = True
+            self.result.error = f"timeout after {timeout}s"
+            self.result.duration = duration
+        _LOGGER.error("device %s does not respond for %ss, aborting", self.result.mac, timeout)
+        self.device.abort()
+        return True
+
+    def _process(self):
+        mac = self.result.mac
+        out_dir = self.options.out_dir
+        with self.device.connect():
+            if self.options.read_measurement:
+                data = self.device.get_current_measurements()
+                measurement = to_measurement_record(data)
+                self.result.measurement = measurement
+                if out_dir:
+                    historystore.append_entries(get_measurements_path(out_dir, mac), [measurement])
+            if self.options.read_history and out_dir:
+                new_items = historystore.sync_history(self.device, get_history_path(out_dir, mac))
+                if new_items is not None:
+                    self.result.history_entries = len(new_items)
+
+
+## concurrently poll multiple devices
+## every HCI adapter ('ifaces' list) has its own pool of 'workers' connections
+class Poller:
+    def __init__(self, ifaces=None, workers=1, timeout=90.0, access_timeout=25.0):
+        self.ifaces = ifaces or [None]
+        self.workers = max(1, workers)
+        self.timeout = timeout  ## maximum processing time of single device
+        self.access_timeout = access_timeout
+        self.read_measurement = True
+        self.read_history = False
+        self.out_dir = None  ## directory of data files, if None then data is not stored
+
+    def poll(self, mac_list):
+        start_time = time.monotonic()
+        executors = {}
+        for iface in self.ifaces:
+            executors[iface] = futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"hci{iface}")
+
+        tasks = {}
+        for index, mac in enumerate(mac_list):
+            iface = self.ifaces[index % len(self.ifaces)]
+            task = _PollTask(mac, iface, self)
+            future = executors[iface].submit(task.run)
+            tasks[future] = task
+
+        pending = set(tasks.keys())
+        while pending:
+            _done, pending = futures.wait(pending, timeout=0.5, return_when=futures.FIRST_COMPLETED)
+            for future in list(pending):
+                task = tasks[future]
+                if task.check_timeout(self.timeout):
+                    ## do not wait for aborted task
+                    pending.discard(future)
+
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        wall_time = time.monotonic() - start_time
+        results = [task.result for task in tasks.values()]
+        return PollSummary(results, wall_time)
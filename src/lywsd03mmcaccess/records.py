@@ -0,0 +1,134 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import datetime
+
+##
+## Compact data entries: objects with '__slots__' instead of dicts with repeated keys.
+## Entries keep read-only dict interface ('entry["Tmin"]', '"Tmin" in entry', 'dict(entry)'),
+## so they can be used interchangeably with entries loaded from JSON data files.
+## JSON serialization is done by 'toJSON()' (see 'CustomJSONEncoder').
+##
+## Bulk data is held column-oriented in arrays of records (see 'io.HISTORY_DTYPE' and 'io.MEASUREMENT_DTYPE').
+##
+
+
+class _Entry:
+    __slots__ = ()
+
+    ## keys of dict representation in order of serialization
+    KEYS = ()
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __eq__(self, other):
+        if isinstance(other, (_Entry, dict)):
+            return self.toJSON() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.toJSON())
+
+    def get(self, key, default=None):
+        if key not in self.KEYS:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return self.KEYS
+
+    def values(self):
+        return [getattr(self, key) for key in self.KEYS]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.KEYS]
+
+    def toJSON(self):  # noqa: N802
+        return {key: getattr(self, key) for key in self.KEYS}
+
+
+## measurement record: {"timestamp": float, "T": float, "H": int, "B": int}
+class MeasurementRecord(_Entry):
+    __slots__ = ("B", "H", "T", "timestamp")
+
+    KEYS = ("timestamp", "T", "H", "B")
+
+    def __init__(self, timestamp, temperature, humidity, battery):
+        self.timestamp = timestamp
+        self.T = temperature  # pylint: disable=C0103
+        self.H = humidity  # pylint: disable=C0103
+        self.B = battery  # pylint: disable=C0103
+
+    @classmethod
+    def from_dict(cls, data) -> "MeasurementRecord":
+        return cls(data["timestamp"], data["T"], data["H"], data["B"])
+
+
+## history entry: {"index": int, "dev_timestamp": int, "timestamp": float, "wall_datetime": str,
+##                 "Tmin": float, "Tmax": float, "Hmin": int, "Hmax": int}
+## 'wall_datetime' string is formatted on access from 'timestamp' and timezone
+class HistoryEntry(_Entry):
+    __slots__ = ("Hmax", "Hmin", "Tmax", "Tmin", "dev_timestamp", "index", "timestamp", "tzinfo")
+
+    KEYS = ("index", "dev_timestamp", "timestamp", "wall_datetime", "Tmin", "Tmax", "Hmin", "Hmax")
+
+    # pylint: disable=R0913,R0917
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        index,
+        dev_timestamp,
+        timestamp,
+        tzinfo,
+        temp_min,
+        temp_max,
+        hum_min,
+        hum_max,
+    ):
+        self.index = index
+        self.dev_timestamp = dev_timestamp
+        self.timestamp = timestamp
+        self.tzinfo = tzinfo
+        self.Tmin = temp_min  # pylint: disable=C0103
+        self.Tmax = temp_max  # pylint: disable=C0103
+        self.Hmin = hum_min  # pylint: disable=C0103
+        self.Hmax = hum_max  # pylint: disable=C0103
+
+    @property
+    def wall_datetime(self):
+        return str(datetime.datetime.fromtimestamp(self.timestamp, tz=self.tzinfo))
+
+    @classmethod
+    def from_dict(cls, data) -> "HistoryEntry":
+        item_datetime = datetime.datetime.fromisoformat(data["wall_datetime"])
+        timestamp = data.get("timestamp")
+        if timestamp is None:
+            timestamp = item_datetime.timestamp()
+        return cls(
+            data["index"],
+            data["dev_timestamp"],
+            timestamp,
+            item_datetime.tzinfo,
+            data["Tmin"],
+            data["Tmax"],
+            data["Hmin"],
+            data["Hmax"],
+        )
@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import threading
+import time
+
+import numpy as np
+
+from lywsd03mmcaccess.io import MEASUREMENT_DTYPE, MEASUREMENT_TEMPERATURE_SCALE, clamp_uint8
+from lywsd03mmcaccess.sinks import RecordSink
+
+
+## fixed-capacity buffer of recent measurements (records of binary data file format)
+## 12 bytes per record, e.g. 14400 records (24h of notifications every 6s) take ~170KB
+## can be written and queried from different threads
+class MeasurementRingBuffer(RecordSink):
+    def __init__(self, capacity=14400):
+        if capacity < 1:
+            message = f"invalid capacity: {capacity}"
+            raise ValueError(message)
+        self._data = np.zeros(capacity, dtype=MEASUREMENT_DTYPE)
+        self._start = 0  ## position of oldest record
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    def __len__(self):  # noqa: D105
+        return self._size
+
+    def write(self, record):
+        self.append(record["timestamp"], record["T"], record["H"], record["B"])
+
+    def append(self, timestamp, temperature, humidity, battery):
+        item = (
+            round(timestamp * 1000000),
+            round(temperature * MEASUREMENT_TEMPERATURE_SCALE),
+            humidity,
+            clamp_uint8(battery),
+        )
+        with self._lock:
+            capacity = len(self._data)
+            if self._size < capacity:
+                self._data[(self._start + self._size) % capacity] = item
+                self._size += 1
+            else:
+                ## overwrite oldest record
+                self._data[self._start] = item
+                self._start = (self._start + 1) % capacity
+
+    ## returns copy of records in chronological order
+    def snapshot(self):
+        return self.last()
+
+    ## returns copy of recent 'count' records (all if None) in chronological order
+    def last(self, count=None):
+        with self._lock:
+            size = self._size if count is None else max(0, min(count, self._size))
+            first = self._start + self._size - size
+            return self._copy_range(first, size)
+
+    ## returns copy of records not older than given number of seconds
+    def last_seconds(self, seconds, now=None):
+        if now is None:
+            now = time.time()
+        from_epoch_us = round((now - seconds) * 1000000)
+        with self._lock:
+            capacity = len(self._data)
+            ## binary search on logical (chronological) positions
+            low = 0
+            high = self._size
+            while low < high:
+                middle = (low + high) // 2
+                if self._data[(self._start + middle) % capacity]["epoch_us"] < from_epoch_us:
+                    low = middle + 1
+                else:
+                    high = middle
+            return self._copy_range(self._start + low, self._size - low)
+
+    ## returns {"count": int, "T": {"min", "max", "mean"}, "H": {"min", "max", "mean"}, "B": {"min", "max", "mean"}}
+    ## of all records or records not older than 'seconds'
+    def stats(self, seconds=None):
+        records = self.snapshot() if seconds is None else self.last_seconds(seconds)
+        ret_dict = {"count": len(records)}
+        if len(records) < 1:
+            return ret_dict
+        temperature = records["T"]
+        ret_dict["T"] = {
+            "min": float(temperature.min()) / MEASUREMENT_TEMPERATURE_SCALE,
+            "max": float(temperature.max()) / MEASUREMENT_TEMPERATURE_SCALE,
+            "mean": float(temperature.mean()) / MEASUREMENT_TEMPERATURE_SCALE,
+        }
+        for field in ("H", "B"):
+            values = records[field]
+            ret_dict[field] = {"min": int(values.min()), "max": int(values.max()), "mean": float(values.mean())}
+        return ret_dict
+
+    ## 'first' - physical position of first record, can exceed capacity
+    def _copy_range(self, first, size):
+        capacity = len(self._data)
+        first %= capacity
+        end = first + size
+        if end <= capacity:
+            return self._data[first:end].copy()
+        return np.concatenate((self._data[first:], self._data[: end - capacity]))
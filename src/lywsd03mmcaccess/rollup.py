@@ -0,0 +1,299 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import pathlib
+import datetime
+import itertools
+
+import numpy as np
+
+from lywsd03mmcaccess import timeindex
+from lywsd03mmcaccess.io import (
+    read_json,
+    write_object,
+    read_binary,
+    iter_json_array,
+    is_binary_file,
+    is_json_lines_file,
+    is_history_data,
+    HISTORY_TEMPERATURE_SCALE,
+    MEASUREMENT_TEMPERATURE_SCALE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## sidecar file of data file holding aggregated values (minimum, maximum, mean, count) of time buckets
+## buckets of "hour" tier are full UTC hours ('epoch // 3600'), so in time zones with fractional
+## offset (e.g. UTC+05:30) they are not aligned to full local hours
+## buckets of "day" and "month" tiers are aligned to local midnight
+## rollups are updated incrementally: only entries appended since previous update are aggregated
+ROLLUP_VERSION = 1
+
+## nominal width of bucket in seconds (month is the longest possible)
+TIERS = {"hour": 3600, "day": 86400, "month": 31 * 86400}
+
+## aggregated values: history entries provide 'T' and 'H', measurements 'T', 'H' and 'B'
+## row of bucket: [<start timestamp>, <count>, <min>, <max>, <sum>, <min>, <max>, <sum>, ...]
+HISTORY_VALUES = ["T", "H"]
+MEASUREMENT_VALUES = ["T", "H", "B"]
+
+
+def get_rollup_path(data_path):
+    return data_path + ".rollup"
+
+
+## returns coarsest tier with bucket width not greater than 'resolution' and range length (in seconds)
+## returns None if raw data have to be used
+def select_tier(resolution, from_timestamp=None, to_timestamp=None):
+    if resolution is None:
+        return None
+    max_width = resolution
+    if from_timestamp is not None and to_timestamp is not None:
+        max_width = min(max_width, to_timestamp - from_timestamp)
+    ret_tier = None
+    for tier, width in TIERS.items():
+        if width <= max_width:
+            ret_tier = tier
+    return ret_tier
+
+
+## read buckets of given tier overlapping time range (timestamps in seconds, both inclusive)
+## returns list of entries in history format extended by mean values and count, e.g.:
+##   {"wall_datetime": ..., "count": 60, "Tmin": ..., "Tmax": ..., "Tmean": ..., "Hmin": ..., ...}
+## returns None if data file can not be read
+def read_rollup(data_path, tier, from_timestamp=None, to_timestamp=None):
+    rollup = update_rollup(data_path)
+    if rollup is None:
+        return None
+    value_names = rollup["values"]
+    ret_list = []
+    for row in rollup["tiers"][tier]:
+        start = row[0]
+        if to_timestamp is not None and start > to_timestamp:
+            break
+        if from_timestamp is not None and get_bucket_end(tier, start) <= from_timestamp:
+            continue
+        start_datetime = datetime.datetime.fromtimestamp(start).astimezone()
+        entry = {"wall_datetime": str(start_datetime), "count": row[1]}
+        for index, name in enumerate(value_names):
+            values_min, values_max, values_sum = row[2 + index * 3 : 5 + index * 3]
+            entry[name + "min"] = values_min
+            entry[name + "max"] = values_max
+            entry[name + "mean"] = round(values_sum / row[1], 3)
+        ret_list.append(entry)
+    return ret_list
+
+
+## build or update rollups of data file
+## only entries appended since previous update are aggregated, rollups are rebuilt if data file was replaced
+## returns rollup dict or None if data file can not be read
+def update_rollup(data_path):
+    if not os.path.isfile(data_path):
+        return None
+    rollup_path = get_rollup_path(data_path)
+    data_size = pathlib.Path(data_path).stat().st_size
+    rollup = read_json(rollup_path)
+    if not _is_rollup_valid(rollup, data_size):
+        rollup = None
+
+    if rollup is not None and rollup["data_size"] == data_size:
+        ## nothing appended
+        return rollup
+
+    if rollup is not None and not _is_same_file(data_path, rollup):
+        ## data file replaced with different content
+        _LOGGER.info("rebuilding rollups of file %s", data_path)
+        rollup = None
+
+    processed = 0 if rollup is None else rollup["entries"]
+    data_list = _read_entries_since(data_path, processed)
+    if data_list is None or (rollup is None and len(data_list) < 1):
+        return None
+    if rollup is None:
+        rollup = create_rollup(data_list)
+        rollup["first_timestamp"] = int(_get_epochs(data_list[:1])[0])
+
+    add_entries(rollup, data_list)
+    rollup["entries"] = processed + len(data_list)
+    rollup["data_size"] = data_size
+    _LOGGER.debug("aggregated %s new entries of file %s", len(data_list), data_path)
+
+    tmp_path = rollup_path + ".tmp"
+    write_object(rollup, tmp_path)
+    pathlib.Path(tmp_path).replace(rollup_path)
+    return rollup
+
+
+## create empty rollup for given type of data
+def create_rollup(data_list):
+    value_names = HISTORY_VALUES if is_history_data(data_list) else MEASUREMENT_VALUES
+    return {
+        "version": ROLLUP_VERSION,
+        "values": value_names,
+        "entries": 0,
+        "data_size": 0,
+        "first_timestamp": None,
+        "tiers": {tier: [] for tier in TIERS},
+    }
+
+
+## aggregate entries (list or array of records sorted by time) into all tiers of rollup
+def add_entries(rollup, data_list):
+    if len(data_list) < 1:
+        return
+    hour_rows = aggregate_hours(data_list, rollup["values"])
+    for tier in TIERS:
+        tier_rows = rollup["tiers"][tier]
+        for row in hour_rows:
+            bucket_row = list(row)
+            bucket_row[0] = get_bucket_start(tier, row[0])
+            _merge_row(tier_rows, bucket_row)
+
+
+## returns list of rows of hour buckets
+def aggregate_hours(data_list, value_names):
+    epochs = _get_epochs(data_list)
+    columns = _get_value_columns(data_list, value_names)
+    hours = epochs // 3600 * 3600
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(hours)) + 1))
+    counts = np.diff(np.append(starts, len(hours)))
+    row_columns = [hours[starts], counts]
+    for values_min, values_max, values_mean in columns:
+        row_columns.append(np.minimum.reduceat(values_min, starts))
+        row_columns.append(np.maximum.reduceat(values_max, starts))
+        row_columns.append(np.add.reduceat(values_mean, starts))
+    ## convert to Python types (JSON serializable)
+    row_columns = [column.tolist() for column in row_columns]
+    return [list(row) for row in zip(*row_columns, strict=True)]
+
+
+## returns start timestamp of tier bucket containing given timestamp
+def get_bucket_start(tier, timestamp):
+    if tier == "hour":
+        return timestamp // 3600 * 3600
+    start_date = _local_date(timestamp)
+    if tier == "month":
+        start_date = start_date.replace(day=1)
+    return int(datetime.datetime.combine(start_date, datetime.time()).timestamp())
+
+
+## returns start timestamp of next bucket
+def get_bucket_end(tier, start):
+    if tier == "hour":
+        return start + 3600
+    start_date = _local_date(start)
+    if tier == "month":
+        next_date = (start_date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    else:
+        next_date = start_date + datetime.timedelta(days=1)
+    return int(datetime.datetime.combine(next_date, datetime.time()).timestamp())
+
+
+## returns date of timestamp in local time zone (offset of given date, not current one)
+def _local_date(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.UTC).astimezone().date()
+
+
+## merge bucket row into sorted rows of tier
+def _merge_row(tier_rows, bucket_row):
+    if tier_rows and tier_rows[-1][0] == bucket_row[0]:
+        target_row = tier_rows[-1]
+    else:
+        ## data entries are appended in time order, so search is needed only in unusual case
+        position = len(tier_rows)
+        while position > 0 and tier_rows[position - 1][0] > bucket_row[0]:
+            position -= 1
+        if position > 0 and tier_rows[position - 1][0] == bucket_row[0]:
+            target_row = tier_rows[position - 1]
+        else:
+            tier_rows.insert(position, bucket_row)
+            return
+    target_row[1] += bucket_row[1]
+    for index in range(2, len(bucket_row), 3):
+        target_row[index] = min(target_row[index], bucket_row[index])
+        target_row[index + 1] = max(target_row[index + 1], bucket_row[index + 1])
+        target_row[index + 2] += bucket_row[index + 2]
+
+
+## returns array of timestamps of entries in seconds
+def _get_epochs(data_list):
+    if isinstance(data_list, np.ndarray):
+        return data_list["epoch_us"] // 1000000
+    epochs = [timeindex.entry_timestamp_us(item) // 1000000 for item in data_list]
+    return np.array(epochs, dtype=np.int64)
+
+
+## returns list of (<min-values>, <max-values>, <mean-source-values>) arrays
+def _get_value_columns(data_list, value_names):
+    if isinstance(data_list, np.ndarray):
+        scale = HISTORY_TEMPERATURE_SCALE if "Tmin" in data_list.dtype.names else MEASUREMENT_TEMPERATURE_SCALE
+
+        def get_column(name):
+            column = data_list[name].astype(float)
+            if name.startswith("T"):
+                column /= scale
+            return column
+
+    else:
+
+        def get_column(name):
+            return np.array([item[name] for item in data_list], dtype=float)
+
+    ret_list = []
+    if value_names == HISTORY_VALUES:
+        for name in value_names:
+            values_min = get_column(name + "min")
+            values_max = get_column(name + "max")
+            ret_list.append((values_min, values_max, (values_min + values_max) / 2.0))
+    else:
+        for name in value_names:
+            values = get_column(name)
+            ret_list.append((values, values, values))
+    return ret_list
+
+
+## read entries of data file starting from given position
+def _read_entries_since(data_path, start):
+    if is_binary_file(data_path):
+        records = read_binary(data_path)
+        if records is None:
+            return None
+        return records[start:]
+    if is_json_lines_file(data_path):
+        index_data = timeindex.update_index(data_path)
+        return timeindex.read_entries(data_path, index_data["offset"], start, len(index_data))
+    ## JSON array can not be appended, so whole file is aggregated
+    return list(itertools.islice(iter_json_array(data_path), start, None))
+
+
+def _is_rollup_valid(rollup, data_size):
+    if not isinstance(rollup, dict) or rollup.get("version") != ROLLUP_VERSION:
+        return False
+    return rollup["data_size"] <= data_size
+
+
+## check if first entry of data file is the same as during previous update
+def _is_same_file(data_path, rollup):
+    if not is_binary_file(data_path) and not is_json_lines_file(data_path):
+        ## JSON array is always rewritten as whole
+        return False
+    first_entries = _read_first_entry(data_path)
+    if first_entries is None or len(first_entries) < 1:
+        return False
+    return int(_get_epochs(first_entries)[0]) == rollup["first_timestamp"]
+
+
+def _read_first_entry(data_path):
+    if is_binary_file(data_path):
+        records = read_binary(data_path)
+        return None if records is None else records[:1]
+    index_data = timeindex.update_index(data_path)
+    return timeindex.read_entries(data_path, index_data["offset"], 0, min(1, len(index_data)))
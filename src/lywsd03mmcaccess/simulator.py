@@ -0,0 +1,317 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+import math
+import random
+import struct
+import threading
+import time
+
+from bluepy import btle
+
+_LOGGER = logging.getLogger(__name__)
+
+
+UUID_TIME = "ebe0ccb7-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_HISTORY_INDEXES = "ebe0ccb9-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_HISTORY_FIRST_INDEX = "ebe0ccba-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_HISTORY_RECENT = "ebe0ccbb-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_HISTORY = "ebe0ccbc-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_UNITS = "ebe0ccbe-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_DATA = "ebe0ccc1-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_BATTERY = "ebe0ccc4-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_CLEAR_DATA = "ebe0ccd1-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_COMFORT_LEVELS = "ebe0ccd7-7a0a-4b0c-8a1a-6ff2997da3a6"
+UUID_FIRMWARE = "00002a26-0000-1000-8000-00805f9b34fb"
+UUID_CUSTOM_MEASUREMENTS = "8edfffef-3d1b-9c37-4623-ad7265f14076"
+UUID_CUSTOM_HISTORY_INDEXES = "8edffff1-3d1b-9c37-4623-ad7265f14076"
+
+## characteristics in order of handles
+CHARACTERISTICS = [
+    UUID_TIME,
+    UUID_HISTORY_INDEXES,
+    UUID_HISTORY_FIRST_INDEX,
+    UUID_HISTORY_RECENT,
+    UUID_HISTORY,
+    UUID_UNITS,
+    UUID_DATA,
+    UUID_BATTERY,
+    UUID_CLEAR_DATA,
+    UUID_COMFORT_LEVELS,
+    UUID_FIRMWARE,
+    UUID_CUSTOM_MEASUREMENTS,
+    UUID_CUSTOM_HISTORY_INDEXES,
+]
+
+FIRMWARE = b"2.1.1_0159"
+
+## history entry is stored by device every hour
+HISTORY_PERIOD = 3600
+
+
+## simulated LYWSD03MMC device implementing interface of 'btle.Peripheral' used by this project
+## 'history_size' - number of history entries stored in device
+## 'latency' - delay in seconds of every operation (read, write, discovery and notification)
+## 'connect_latency' - delay of connection
+## 'loss' - probability of losing packet: lost notification is not delivered,
+##          lost read or write is retransmitted (latency is doubled)
+## 'seed' - seed of random generator deciding about lost packets
+class SimulatedPeripheral:
+    def __init__(self, history_size=100, latency=0.0, connect_latency=0.0, loss=0.0, seed=None):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.loss = loss
+        self._random = random.Random(seed)  # noqa: S311
+        self._helper = self  ## 'ThermometerAccess.abort()' kills helper
+        self._abort = threading.Event()
+        self.delegate = None
+        self.connected = False
+        self.units = b"\x00"
+        self.comfort_levels = (2700, 1900, 85, 20)  ## temp_hi * 100, temp_lo * 100, hum_hi, hum_low
+
+        ## device started just after history entry of current hour
+        self.start_time = time.time() - (history_size + 0.5) * HISTORY_PERIOD
+        self.history_offset = 0  ## index of first stored entry (entries are removed by 'clear data')
+        self.history_size = history_size
+        self._first_index = 0  ## first index of next history read
+
+        self._characteristics = {
+            uuid: SimulatedCharacteristic(self, uuid, (pos + 1) * 3) for pos, uuid in enumerate(CHARACTERISTICS)
+        }
+        self._notifying = None  ## characteristic with enabled notifications
+        self._pending_history = []
+
+        ## counters of operations
+        self.stats = {"connects": 0, "reads": 0, "writes": 0, "notifications": 0, "lost": 0}
+
+    ## create peripheral from comma separated list of options, e.g. "history=500,latency=0.05,loss=0.1"
+    @classmethod
+    def from_spec(cls, spec) -> "SimulatedPeripheral":
+        options = {}
+        names = {
+            "history": "history_size",
+            "latency": "latency",
+            "connect": "connect_latency",
+            "loss": "loss",
+            "seed": "seed",
+        }
+        for item in spec.split(","):
+            key, _, value = item.partition("=")
+            key = key.strip()
+            if not key:
+                continue
+            name = names.get(key)
+            if name is None:
+                message = f"unknown simulator option: '{key}', allowed: {', '.join(names)}"
+                raise ValueError(message)
+            options[name] = int(value) if name in ("history_size", "seed") else float(value)
+        return cls(**options)
+
+    # ================= 'btle.Peripheral' interface =================
+
+    def connect(self, _addr, iface=None):  # noqa: ARG002
+        self._delay(self.connect_latency)
+        self.stats["connects"] += 1
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+        self._notifying = None
+        self._pending_history = []
+
+    # pylint: disable=C0103
+    def setDelegate(self, delegate):  # noqa: N802
+        self.delegate = delegate
+
+    # pylint: disable=C0103
+    def getCharacteristics(self, startHnd=1, endHnd=0xFFFF, uuid=None):  # noqa: N802, N803
+        self._check_connected()
+        self._delay(self.latency)
+        if uuid is None:
+            return [item for item in self._characteristics.values() if startHnd <= item.handle <= endHnd]
+        characteristic = self._characteristics.get(str(btle.UUID(uuid)))
+        if characteristic is None:
+            return []
+        return [characteristic]
+
+    # pylint: disable=C0103
+    def waitForNotifications(self, timeout):  # noqa: N802
+        self._check_connected()
+        elapsed = 0.0
+        while elapsed <= timeout:
+            notification = self._next_notification()
+            if notification is None:
+                return False
+            self._delay(self.latency)
+            elapsed += self.latency
+            if self._is_lost():
+                continue
+            self.stats["notifications"] += 1
+            self.delegate.handleNotification(notification[0], notification[1])
+            return True
+        return False
+
+    # ================= device state =================
+
+    ## device uptime in seconds
+    def get_uptime(self):
+        return int(time.time() - self.start_time)
+
+    def get_last_index(self):
+        return self.history_offset + self.history_size - 1
+
+    ## returns history entry: (index, device timestamp, max temperature, max humidity, min temperature, min humidity)
+    def get_history_entry(self, index):
+        dev_timestamp = (index + 1) * HISTORY_PERIOD
+        day_phase = math.sin(2 * math.pi * dev_timestamp / 86400)
+        temperature = 22.0 + 3.0 * day_phase
+        humidity = 55 - int(10 * day_phase)
+        return (
+            index,
+            dev_timestamp,
+            round(temperature * 10 + 5),
+            humidity + 3,
+            round(temperature * 10 - 5),
+            humidity - 3,
+        )
+
+    ## returns (temperature, humidity, voltage in mV)
+    def get_measurement(self):
+        day_phase = math.sin(2 * math.pi * self.get_uptime() / 86400)
+        return (round((22.0 + 3.0 * day_phase) * 100), 55 - int(10 * day_phase), 2950)
+
+    def read_value(self, uuid):
+        self._request()
+        self.stats["reads"] += 1
+        if uuid == UUID_TIME:
+            return struct.pack("Ib", self.get_uptime(), 0)
+        if uuid in (UUID_HISTORY_INDEXES, UUID_CUSTOM_HISTORY_INDEXES):
+            return struct.pack("II", self.get_last_index() + 1, self.history_size)
+        if uuid == UUID_HISTORY_FIRST_INDEX:
+            return struct.pack("I", self._first_index)
+        if uuid == UUID_HISTORY_RECENT:
+            return struct.pack("<IIhBhB", *self.get_history_entry(self.get_last_index()))
+        if uuid == UUID_UNITS:
+            return self.units
+        if uuid == UUID_DATA:
+            return struct.pack("<hBh", *self.get_measurement())
+        if uuid == UUID_BATTERY:
+            return bytes([85])
+        if uuid == UUID_COMFORT_LEVELS:
+            return struct.pack("HHBB", *self.comfort_levels)
+        if uuid == UUID_FIRMWARE:
+            return FIRMWARE
+        if uuid == UUID_CUSTOM_MEASUREMENTS:
+            temperature, humidity, _voltage = self.get_measurement()
+            return struct.pack("<HBH", temperature, humidity, temperature)
+        message = f"characteristic not readable: {uuid}"
+        raise btle.BTLEGattError(message)
+
+    def write_value(self, uuid, value):
+        self._request()
+        self.stats["writes"] += 1
+        if uuid == UUID_HISTORY_FIRST_INDEX:
+            self._first_index = struct.unpack_from("I", value)[0]
+        elif uuid == UUID_UNITS:
+            self.units = value
+        elif uuid == UUID_CLEAR_DATA:
+            self.history_offset += self.history_size
+            self.history_size = 0
+        elif uuid == UUID_COMFORT_LEVELS:
+            self.comfort_levels = struct.unpack("HHBB", value)
+        else:
+            ## time and other values are ignored
+            _LOGGER.debug("ignoring write to characteristic %s", uuid)
+
+    ## enable notifications (only recently subscribed characteristic is notifying)
+    def subscribe(self, characteristic):
+        self._request()
+        self._notifying = characteristic
+        if characteristic.uuid == UUID_HISTORY:
+            ## first index set before applies only to one read
+            first_index = max(self._first_index, self.history_offset)
+            self._pending_history = list(range(first_index, self.get_last_index() + 1))
+            self._first_index = 0
+
+    ## interrupt pending operation (e.g. 'waitForNotifications'), same as killing bluepy helper
+    def kill(self):
+        self._abort.set()
+
+    def _next_notification(self):
+        if self._notifying is None:
+            return None
+        handle = self._notifying.valHandle
+        if self._notifying.uuid == UUID_HISTORY:
+            if not self._pending_history:
+                return None
+            index = self._pending_history.pop(0)
+            return (handle, struct.pack("<IIhBhB", *self.get_history_entry(index)))
+        if self._notifying.uuid == UUID_DATA:
+            return (handle, struct.pack("<hBh", *self.get_measurement()))
+        return None
+
+    def _request(self):
+        self._check_connected()
+        self._delay(self.latency)
+        while self._is_lost():
+            ## retransmission
+            self._delay(self.latency)
+
+    def _is_lost(self):
+        if self.loss <= 0.0 or self._random.random() >= self.loss:
+            return False
+        self.stats["lost"] += 1
+        return True
+
+    def _delay(self, seconds):
+        if seconds > 0.0 and self._abort.wait(seconds):
+            self._abort.clear()
+            message = "operation aborted"
+            raise btle.BTLEDisconnectError(message)
+
+    def _check_connected(self):
+        if not self.connected:
+            message = "device not connected"
+            raise btle.BTLEDisconnectError(message)
+
+
+class SimulatedCharacteristic:
+    def __init__(self, peripheral: SimulatedPeripheral, uuid, handle):
+        self.peripheral = peripheral
+        self.uuid = uuid
+        self.handle = handle
+        self.valHandle = handle + 1  # pylint: disable=C0103  # noqa: N815
+        self.properties = 0x1A  ## read, write, notify
+        self.descs = [SimulatedDescriptor(self, handle + 2)]
+
+    # pylint: disable=C0103
+    def getHandle(self):  # noqa: N802
+        return self.valHandle
+
+    # pylint: disable=C0103
+    def getDescriptors(self, forUUID=None, hndEnd=0xFFFF):  # noqa: N802, N803, ARG002
+        return self.descs
+
+    def read(self):
+        return self.peripheral.read_value(self.uuid)
+
+    def write(self, value, withResponse=False):  # noqa: N803, ARG002, FBT002
+        self.peripheral.write_value(self.uuid, value)
+
+
+## client characteristic configuration descriptor
+class SimulatedDescriptor:
+    def __init__(self, characteristic: SimulatedCharacteristic, handle):
+        self.characteristic = characteristic
+        self.uuid = btle.UUID(0x2902)
+        self.handle = handle
+
+    def write(self, value, withResponse=False):  # noqa: N803, ARG002, FBT002
+        if value == b"\x01\x00":
+            self.characteristic.peripheral.subscribe(self.characteristic)
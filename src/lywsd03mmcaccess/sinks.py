@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import abc
+import logging
+import collections
+import time
+
+from lywsd03mmcaccess import historystore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+##
+## Sinks receive measurement records: {"timestamp": float, "T": float, "H": int, "B": int}
+##
+
+
+class RecordSink(abc.ABC):
+    @abc.abstractmethod
+    def write(self, record):
+        raise NotImplementedError
+
+    ## sinks without buffer have nothing to flush
+    def flush(self):  # noqa: B027
+        pass
+
+    def close(self):
+        self.flush()
+
+
+## writes records in batches to data file (JSON lines or binary)
+class FileSink(RecordSink):
+    ## 'binary' - format of new file, existing file keeps its format
+    ## 'flush_interval' - maximum time (in seconds) records are kept in memory
+    ## 'fsync_interval' - maximum time (in seconds) of written data not forced to storage device
+    ##                    (fsync on every write if 0, only on close if None)
+    def __init__(self, file_path, *, binary=False, batch_size=100, flush_interval=60.0, fsync_interval=600.0):
+        if not historystore.prepare_output_file(file_path):
+            message = f"unable to use output file: {file_path}"
+            raise ValueError(message)
+        self.file_path = file_path
+        self.binary = binary
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._buffer = []
+        self._flush_time = time.monotonic()
+        self._fsync_time = self._flush_time
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._flush_time >= self.flush_interval:
+            self.flush()
+
+    def flush(self, *, sync=False):
+        now = time.monotonic()
+        self._flush_time = now
+        if not self._buffer:
+            return
+        if self.fsync_interval is not None and now - self._fsync_time >= self.fsync_interval:
+            sync = True
+        _LOGGER.debug("writing %s records to file: %s", len(self._buffer), self.file_path)
+        historystore.append_entries(self.file_path, self._buffer, binary=self.binary, sync=sync)
+        self._buffer = []
+        if sync:
+            self._fsync_time = now
+
+    def close(self):
+        self.flush(sync=True)
+
+
+## keeps records in memory, oldest records are dropped if 'max_records' is exceeded
+class MemorySink(RecordSink):
+    def __init__(self, max_records=None):
+        self.records = collections.deque(maxlen=max_records)
+
+    def write(self, record):
+        self.records.append(record)
+
+
+## passes records to given function
+class CallbackSink(RecordSink):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, record):
+        self.callback(record)
+
+
+## distributes records to all sinks
+class SinkPipeline(RecordSink):
+    def __init__(self, sinks=None):
+        self.sinks: list[RecordSink] = list(sinks) if sinks else []
+
+    def add(self, sink):
+        self.sinks.append(sink)
+
+    def write(self, record):
+        for sink in self.sinks:
+            sink.write(record)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
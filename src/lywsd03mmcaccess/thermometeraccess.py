@@ -10,20 +10,64 @@
 # ruff: noqa: SLF001
 
 import struct
+import dataclasses
 import datetime
 import logging
 import contextlib
+import functools
+import time
+import types
+from collections.abc import Mapping
+from typing import Any
 
+from bluepy import btle
 from lywsd03mmc import Lywsd03mmcClient
 from lywsd02.client import UUID_DATA
 
+from lywsd03mmcaccess.handlecache import CharacteristicCache, get_handles_cache_path
+from lywsd03mmcaccess.metrics import REGISTRY
+from lywsd03mmcaccess.records import HistoryEntry, MeasurementRecord
+from lywsd03mmcaccess.sinks import CallbackSink, SinkPipeline
+from lywsd03mmcaccess.ringbuffer import MeasurementRingBuffer
+from lywsd03mmcaccess.utils import current_timezone
+
 _LOGGER = logging.getLogger(__name__)
 
 
+UUID_FIRMWARE = "00002a26-0000-1000-8000-00805f9b34fb"
+
+
 class ThermometerAccess:
 
-    def __init__(self, mac, access_timeout=25.0):
+    ## store GATT handles in application data directory by default
+    PERSIST_HANDLES = False
+
+    ## callable creating peripheral for given MAC address (e.g. simulated device), None for bluepy peripheral
+    PERIPHERAL_FACTORY = None
+
+    ## 'iface' is number of HCI adapter (e.g. 0 for hci0), None for default adapter
+    ## 'persist_handles' - store GATT handles between sessions, None for class default
+    ## 'metrics' - registry of timings and counters, None for application default registry
+    def __init__(self, mac, access_timeout=25.0, iface=None, persist_handles=None, metrics=None):
+        self.mac = mac
+        self.metrics = metrics if metrics is not None else REGISTRY
         self.client = Lywsd03mmcClient(mac=mac, notification_timeout=access_timeout)
+        peripheral_factory = type(self).PERIPHERAL_FACTORY
+        if peripheral_factory is not None:
+            self.client._peripheral = peripheral_factory(mac)
+        peripheral = self.client._peripheral
+        if iface is not None:
+            ## client does not expose adapter selection
+            peripheral.connect = functools.partial(peripheral.connect, iface=iface)
+
+        if persist_handles is None:
+            persist_handles = self.PERSIST_HANDLES
+        cache_path = get_handles_cache_path(mac) if persist_handles else None
+        ## cache is also used by client internal calls
+        self.characteristics = CharacteristicCache(peripheral, cache_path)
+        self.characteristics._discover = self._timed_discover(self.characteristics._discover)
+        self.characteristics.install()
+        self._handles_validated = cache_path is None
         ## get local timezone and set proper timezone offset
         self.tzinfo = current_timezone()
         # self.client._tz_offset = 0       ## set device time related data timezone unaware
@@ -33,22 +77,54 @@ class ThermometerAccess:
 
     @contextlib.contextmanager
     def connect(self):
+        try:
+            with self._connect() as item:
+                yield item
+        except btle.BTLEDisconnectError:
+            self.metrics.increment("connection_errors", mac=self.mac)
+            raise
+
+    @contextlib.contextmanager
+    def _connect(self):
+        ## device could be restarted since previous connection
+        self.client._start_time = False
+        connect_start = time.perf_counter()
         with self.client.connect() as item:
+            self.metrics.observe("connect", time.perf_counter() - connect_start, mac=self.mac)
+            self.metrics.increment("connections", mac=self.mac)
             _LOGGER.debug("connected")
-            yield item
+            try:
+                if not self._handles_validated:
+                    firmware = self.read_characteristic(UUID_FIRMWARE)
+                    self.characteristics.validate(firmware.decode("utf-8", errors="replace"))
+                    self._handles_validated = True
+                yield item
+            finally:
+                self.characteristics.save()
+                self.metrics.increment("disconnects", mac=self.mac)
+
+    ## interrupt pending device operation (e.g. on timeout), can be called from other thread
+    ## pending operation will raise exception
+    def abort(self):
+        helper = self.client._peripheral._helper
+        if helper is not None:
+            _LOGGER.warning("aborting connection to device %s", self.mac)
+            helper.kill()
 
     ## start time of device in local timezone
     @property
     def start_time(self):
+        self._ensure_start_time()
         utc_start_time = self.client.start_time - datetime.timedelta(hours=self.client.tz_offset)
         ## 'replace' does not convert datetime (does not change internal timestamp)
         utc_start_time = utc_start_time.replace(tzinfo=datetime.UTC)
         return utc_start_time.astimezone(tz=self.tzinfo)
 
-    def get_device_current_time(self):
-        dev_time = self.client.time[0]
-        dev_time = dev_time.replace(tzinfo=self.tzinfo)
-        dev_uptime = dev_time - datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+    ## 'dev_time' - device time already read from device
+    def get_device_current_time(self, dev_time=None):
+        if dev_time is None:
+            dev_time = self.client.time[0]
+        dev_uptime = device_time_delta(dev_time)
         curr_time = self.start_time + dev_uptime
         return curr_time.replace(tzinfo=self.tzinfo)
 
@@ -57,23 +133,79 @@ class ThermometerAccess:
     ##   "battery": int
     ## }
     def get_current_measurements(self) -> dict:
-        return self.client.data
-
-    def get_history_measurements(self, recent_entries=None, recent_timestamp=None):
-        if recent_timestamp is not None:
-            recent_time = datetime.datetime.fromtimestamp(recent_timestamp, tz=self.tzinfo)
-            curr_time = datetime.datetime.now(tz=self.tzinfo)
-            time_difference = curr_time - recent_time
-            diff_hours = time_difference.total_seconds() / 3600
-            missing_entries = int(diff_hours) + 2  ## +2 for margin
-            recent_entries = missing_entries
-
+        with self.metrics.timer("measurement", mac=self.mac):
+            return self.client.data
+
+    ## read all data required by 'info' in one pass
+    ## simple reads go first, notification based reads (measurement and history) at the end
+    def snapshot(self, recent_history_entries=3):
+        timings = {}
+
+        def timed(field, function):
+            start_time = time.perf_counter()
+            value = function()
+            timings[field] = time.perf_counter() - start_time
+            return value
+
+        device_time, device_tz_offset = timed("device_time", lambda: self.client.time)
+        self._init_start_time(device_time)
+        units = timed("units", lambda: self.client.units)
+        comfort_levels = timed("comfort_levels", self.get_comfort_levels)
+        history_indexes = timed("history_indexes", self.get_history_indexes)
+        history_first_index = timed("history_first_index", self.get_first_history_index)
+        recent_history_entry = timed("recent_history_entry", self.get_recent_history_entry)
+        measurement = timed("measurement", self.get_current_measurements)
+        recent_history = timed(
+            "recent_history",
+            lambda: self.get_history_measurements(
+                recent_entries=recent_history_entries,
+                history_indexes=history_indexes,
+            ),
+        )
+
+        return DeviceSnapshot(
+            device_time=device_time,
+            device_tz_offset=device_tz_offset,
+            client_tz_offset=self.client.tz_offset,
+            start_time=self.start_time,
+            device_current_time=self.get_device_current_time(device_time),
+            measurement=measurement,
+            units=units,
+            comfort_levels=comfort_levels,
+            history_indexes=tuple(history_indexes),
+            history_first_index=history_first_index,
+            recent_history_entry=recent_history_entry,
+            recent_history=tuple(recent_history),
+            timings=types.MappingProxyType(timings),
+        )
+
+    ## read device time and update start time (device could be restarted or its clock could drift)
+    def refresh_start_time(self):
+        device_time = self.client.time[0]
+        self._init_start_time(device_time)
+
+    ## client would compute start time using offset of current local time instead of offset at device time
+    def _ensure_start_time(self):
+        if not self.client._start_time:
+            self.refresh_start_time()
+
+    ## set client start time based on already read device time (client would read time again)
+    def _init_start_time(self, device_time):
+        dev_uptime = device_time_delta(device_time)
+        start_time = datetime.datetime.now(tz=self.tzinfo) - dev_uptime
+        ## client keeps start time as naive local time
+        self.client._start_time = start_time.replace(tzinfo=None)
+
+    ## 'history_indexes' - indexes already read from device
+    def get_history_measurements(self, recent_entries=None, history_indexes=None):
         hist_data = None
         if recent_entries is None:
-            hist_data = self.client.history_data
+            hist_data = self._read_history_data()
         else:
             _LOGGER.debug("getting recent %s entries", recent_entries)
-            hist_index_data = self.get_history_indexes()
+            hist_index_data = history_indexes
+            if hist_index_data is None:
+                hist_index_data = self.get_history_indexes()
             hist_count = hist_index_data[1]
             if hist_count < 1:
                 ## no data - return
@@ -83,43 +215,55 @@ class ThermometerAccess:
             if start_index > 0:
                 self.set_first_history_index(start_index)
             _LOGGER.debug("requesting history data")
-            hist_data = self.client.history_data
+            hist_data = self._read_history_data()
             _LOGGER.debug("received recent %s entries", len(hist_data))
-
+            ## keep only requested entries
+            hist_data = {index: item for index, item in hist_data.items() if index >= start_index}
+
+        ## device time of entries is relative to client start time, wall time is relative to device start time
+        client_start_time = self.client.start_time
+        start_time = self.start_time
+        start_timestamp = start_time.timestamp()
+        tzinfo = start_time.tzinfo
         ret_list = []
         for index, item in hist_data.items():
-            item_timedelta = item[0] - self.client.start_time
-            item_timestamp = item_timedelta.total_seconds()
-            item_timestamp = int(item_timestamp)
-            hist_item_datetime = self.start_time + datetime.timedelta(seconds=item_timestamp)
-            entry = {
-                "index": index,
-                "dev_timestamp": item_timestamp,
-                "wall_datetime": str(hist_item_datetime),
-                "Tmin": item[1],
-                "Tmax": item[3],
-                "Hmin": item[2],
-                "Hmax": item[4],
-            }
+            item_timedelta = item[0] - client_start_time
+            item_timestamp = int(item_timedelta.total_seconds())
+            item_wall_timestamp = round(start_timestamp + item_timestamp, 6)
+            entry = HistoryEntry(index, item_timestamp, item_wall_timestamp, tzinfo, item[1], item[3], item[2], item[4])
             ret_list.append(entry)
 
         return ret_list
 
+    ## client accumulates entries of all reads made by client object, so entries of previous reads are dropped
+    def _read_history_data(self):
+        self.client._history_data.clear()
+        self._ensure_start_time()
+        start_time = time.perf_counter()
+        hist_data = self.client.history_data
+        duration = time.perf_counter() - start_time
+        entries = len(hist_data)
+        self.metrics.observe("history", duration, mac=self.mac)
+        self.metrics.increment("history_entries", entries, mac=self.mac)
+        if duration > 0.0:
+            self.metrics.set_gauge("history_entries_per_second", entries / duration, mac=self.mac)
+        return hist_data
+
+    ## read history entries starting from given index
+    def get_history_since(self, first_index):
+        self.set_first_history_index(first_index)
+        history = self.get_history_measurements()
+        ## device can ignore first index
+        return [item for item in history if item["index"] >= first_index]
+
     def get_recent_history_entry(self):
         res = self.read_characteristic("ebe0ccbb-7a0a-4b0c-8a1a-6ff2997da3a6")
         data = struct.unpack_from("<IIhBhB", res)
         ts = data[1]
         item_datetime = self.start_time + datetime.timedelta(seconds=ts)
         item_datetime = item_datetime.replace(tzinfo=self.tzinfo)
-        return {
-            "index": data[0],
-            "dev_timestamp": ts,
-            "wall_datetime": str(item_datetime),
-            "Tmin": data[4] / 10.0,
-            "Tmax": data[2] / 10.0,
-            "Hmin": data[3],
-            "Hmax": data[5],
-        }
+        item_timestamp = round(item_datetime.timestamp(), 6)
+        return HistoryEntry(data[0], ts, item_timestamp, self.tzinfo, data[4] / 10.0, data[2] / 10.0, data[3], data[5])
 
     ## returns (<recent-history-index>, <number-of-history-entries>)
     ## "number-of-history-entries" can be smaller from "recent-history-index" due to
@@ -163,52 +307,152 @@ class ThermometerAccess:
 
     def read_characteristic(self, uuid):
         _LOGGER.debug("reading character: %s", uuid)
-        char_list = self.client._peripheral.getCharacteristics(uuid=uuid)
-        ch = char_list[0]
-        value = ch.read()
+        with self.metrics.timer("read", mac=self.mac, uuid=uuid):
+            try:
+                value = self._get_characteristic(uuid).read()
+            except btle.BTLEGattError:
+                _LOGGER.warning("unable to read characteristic %s, discovering handle again", uuid)
+                self.metrics.increment("retries", mac=self.mac, uuid=uuid)
+                self.characteristics.invalidate(uuid)
+                value = self._get_characteristic(uuid).read()
         _LOGGER.debug("got raw data: %s length: %s", value, len(value))
         return value
 
     def write_characteristic(self, uuid, value):
         _LOGGER.debug("writing character: %s %s", uuid, value)
+        with self.metrics.timer("write", mac=self.mac, uuid=uuid):
+            try:
+                self._get_characteristic(uuid).write(value, withResponse=False)
+            except btle.BTLEGattError:
+                _LOGGER.warning("unable to write characteristic %s, discovering handle again", uuid)
+                self.metrics.increment("retries", mac=self.mac, uuid=uuid)
+                self.characteristics.invalidate(uuid)
+                self._get_characteristic(uuid).write(value, withResponse=False)
+
+    def _get_characteristic(self, uuid):
+        ## handles are cached by 'characteristics' object
         char_list = self.client._peripheral.getCharacteristics(uuid=uuid)
-        ch = char_list[0]
-        ch.write(value, withResponse=False)
+        return char_list[0]
+
+    ## wrap discovery function of peripheral to measure discovery time of characteristics
+    def _timed_discover(self, discover):
+        def discover_characteristics(*args: object, **kwargs: object):
+            with self.metrics.timer("discover", mac=self.mac):
+                return discover(*args, **kwargs)
+
+        return discover_characteristics
+
+    ## 'sinks' - list of sinks receiving measurement records, if None then records are printed
+    ## 'buffer_capacity' - number of recent measurements kept in 'buffer' of listener, no buffer if None
+    def create_listener(self, sinks=None, buffer_capacity=None):
+        return ThermometerListener(self.client, sinks, buffer_capacity=buffer_capacity, metrics=self.metrics)
 
-    def listen_measurements(self):
-        listener = ThermometerListener(self.client)
+    def listen_measurements(self, sinks=None, buffer_capacity=None):
+        listener = self.create_listener(sinks, buffer_capacity)
         listener.listen()
 
 
-def current_timezone():
-    return datetime.datetime.now(datetime.UTC).astimezone().tzinfo
+@dataclasses.dataclass(frozen=True)
+class DeviceSnapshot:
+    """State of device read in one pass by 'ThermometerAccess.snapshot()'."""
+
+    device_time: datetime.datetime  ## device clock (time since boot-up)
+    device_tz_offset: int
+    client_tz_offset: int
+    start_time: datetime.datetime  ## last boot-up in local timezone
+    device_current_time: datetime.datetime
+    measurement: Any  ## object with 'temperature', 'humidity' and 'battery' fields
+    units: str
+    comfort_levels: dict
+    history_indexes: tuple  ## (<recent-history-index>, <number-of-history-entries>)
+    history_first_index: int
+    recent_history_entry: dict
+    recent_history: tuple
+    timings: Mapping[str, float]  ## read time of fields in seconds
+
+    def toJSON(self):  # noqa: N802
+        return {
+            "device_time": str(self.device_time),
+            "device_tz_offset": self.device_tz_offset,
+            "client_tz_offset": self.client_tz_offset,
+            "start_time": str(self.start_time),
+            "device_current_time": str(self.device_current_time),
+            "measurement": self.measurement._asdict(),
+            "units": self.units,
+            "comfort_levels": self.comfort_levels,
+            "history_indexes": list(self.history_indexes),
+            "history_first_index": self.history_first_index,
+            "recent_history_entry": self.recent_history_entry,
+            "recent_history": list(self.recent_history),
+            "timings": dict(self.timings),
+        }
 
 
 class ThermometerListener:
 
-    def __init__(self, client: Lywsd03mmcClient):
+    ## 'sinks' - list of sinks receiving measurement records, if None then records are printed
+    ## 'buffer_capacity' - number of recent measurements kept in 'buffer', no buffer if None
+    ## 'metrics' - registry of counters, None for application default registry
+    def __init__(self, client: Lywsd03mmcClient, sinks=None, buffer_capacity=None, metrics=None):
         self.client: Lywsd03mmcClient = client
+        self.metrics = metrics if metrics is not None else REGISTRY
+        if sinks is None:
+            sinks = [CallbackSink(print_measurement_record)]
+        self.pipeline = SinkPipeline(sinks)
+        self.buffer = None
+        if buffer_capacity is not None:
+            self.buffer = MeasurementRingBuffer(buffer_capacity)
+            self.pipeline.add(self.buffer)
 
     ## drains battery a lot, ~10%/h
     ## or 0.025% per notification (every 6secs)
     ## direct read drains: 0.143% per read
     ## notifications are about 6 times more efficient than read, but are triggered in too often
     def listen(self):
-        with self.client.connect():
-            self.client._subscribe(UUID_DATA, self._notified_data)
-
-            while True:
-                if not self.client._peripheral.waitForNotifications(self.client._notification_timeout):
-                    timeout = self.client._notification_timeout
-                    _LOGGER.warning("No data from device for %s seconds", timeout)
+        try:
+            with self.client.connect():
+                self.client._subscribe(UUID_DATA, self._notified_data)
+
+                while True:
+                    self._wait_notification()
+        finally:
+            self.pipeline.close()
+
+    def _wait_notification(self):
+        timeout = self.client._notification_timeout
+        if self.client._peripheral.waitForNotifications(timeout):
+            return
+        _LOGGER.warning("No data from device for %s seconds", timeout)
+        self.metrics.increment("notification_timeouts", mac=self.client._mac)
+        ## no new records - write buffered ones (flush interval of sinks is checked only on write)
+        self.pipeline.flush()
 
     def _notified_data(self, data):
         self.client._process_sensor_data(data)
-        recent = self.client._data
-        curr_time = datetime.datetime.now(datetime.UTC)
-        message = pretty_measurement(recent)
-        # ruff: noqa: T201
-        print("received:", curr_time, message)
+        record = to_measurement_record(self.client._data)
+        self.metrics.increment("notifications", mac=self.client._mac)
+        self.pipeline.write(record)
+
+
+## returns device time (seconds since device start or epoch) as timedelta
+## client converts raw value to naive local time, so offset of local time at that date is reverted
+def device_time_delta(device_time):
+    return device_time.astimezone(datetime.UTC) - datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+
+## convert client measurement to record stored in measurements data files
+def to_measurement_record(data, timestamp=None):
+    if timestamp is None:
+        timestamp = time.time()
+    return MeasurementRecord(timestamp, data.temperature, data.humidity, data.battery)
+
+
+def print_measurement_record(record):
+    curr_time = datetime.datetime.fromtimestamp(record["timestamp"], datetime.UTC)
+    data = types.SimpleNamespace(temperature=record["T"], humidity=record["H"], battery=record["B"])
+    message = pretty_measurement(data)
+    # ruff: noqa: T201
+    print("received:", curr_time, message)
 
 
 def pretty_measurement(data):
@@ -0,0 +1,245 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import pathlib
+import collections
+import json
+import struct
+
+import numpy as np
+
+from lywsd03mmcaccess.io import iter_json_array, read_binary, is_binary_file, is_json_lines_file, entry_timestamp_us
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## sidecar index of JSON lines data file: header followed by (timestamp, byte offset) record per data entry
+## header: magic (4s), version (H), padding (2x), number of records (Q), size of indexed data file part (Q)
+INDEX_MAGIC = b"LYWI"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sH2xQQ")
+
+INDEX_DTYPE = np.dtype([("epoch_us", "<i8"), ("offset", "<i8")])
+
+
+def get_index_path(data_path):
+    return data_path + ".idx"
+
+
+## read data entries in given time range (timestamps in seconds, both inclusive)
+## 'recent' limits output to given number of last entries in range
+## binary file is returned as array of records, other formats as list of entries
+def read_data_range(data_path, from_timestamp=None, to_timestamp=None, recent=None):
+    if is_binary_file(data_path):
+        records = read_binary(data_path)
+        if records is None:
+            return None
+        start, end = find_range(records["epoch_us"], from_timestamp, to_timestamp)
+        start = _limit_recent(start, end, recent)
+        return records[start:end]
+
+    if is_json_lines_file(data_path):
+        index_data = update_index(data_path)
+        start, end = find_range(index_data["epoch_us"], from_timestamp, to_timestamp)
+        start = _limit_recent(start, end, recent)
+        return read_entries(data_path, index_data["offset"], start, end)
+
+    ## JSON array - whole file have to be scanned
+    if not os.path.isfile(data_path):
+        return None
+    return filter_range(iter_json_array(data_path), from_timestamp, to_timestamp, recent)
+
+
+## same as 'read_data_range', but entries of text files are yielded one by one (without loading all of them)
+## binary file is returned as array of records (mapped to memory)
+def iter_data_range(data_path, from_timestamp=None, to_timestamp=None, recent=None):
+    if is_binary_file(data_path) or (recent is not None and recent > 0 and not is_json_lines_file(data_path)):
+        ## JSON array: recent entries are known only after whole file is scanned
+        return read_data_range(data_path, from_timestamp, to_timestamp, recent)
+
+    if is_json_lines_file(data_path):
+        index_data = update_index(data_path)
+        start, end = find_range(index_data["epoch_us"], from_timestamp, to_timestamp)
+        start = _limit_recent(start, end, recent)
+        return iter_entries(data_path, index_data["offset"], start, end)
+
+    if not os.path.isfile(data_path):
+        return None
+    return _iter_range(iter_json_array(data_path), from_timestamp, to_timestamp)
+
+
+## yield entries of JSON lines file from 'start' to 'end' (exclusive) using entries offsets
+def iter_entries(data_path, offsets, start, end):
+    if start >= end:
+        return
+    with open(data_path, "rb") as data_file:
+        data_file.seek(int(offsets[start]))
+        remaining = end - start
+        for line in data_file:
+            if not line.strip():
+                continue
+            yield json.loads(line)
+            remaining -= 1
+            if remaining < 1:
+                break
+
+
+def _iter_range(data_iter, from_timestamp, to_timestamp):
+    from_us = None if from_timestamp is None else round(from_timestamp * 1000000)
+    to_us = None if to_timestamp is None else round(to_timestamp * 1000000)
+    for item in data_iter:
+        if from_us is None and to_us is None:
+            yield item
+            continue
+        item_us = entry_timestamp_us(item)
+        if from_us is not None and item_us < from_us:
+            continue
+        if to_us is not None and item_us > to_us:
+            break
+        yield item
+
+
+## filter sorted stream of data entries
+def filter_range(data_iter, from_timestamp=None, to_timestamp=None, recent=None):
+    from_us = None if from_timestamp is None else round(from_timestamp * 1000000)
+    to_us = None if to_timestamp is None else round(to_timestamp * 1000000)
+    maxlen = recent if recent is not None and recent > 0 else None
+    ret_list = collections.deque(maxlen=maxlen)
+    for item in data_iter:
+        item_us = entry_timestamp_us(item)
+        if from_us is not None and item_us < from_us:
+            continue
+        if to_us is not None and item_us > to_us:
+            break
+        ret_list.append(item)
+    return list(ret_list)
+
+
+## returns (start, end) slice of sorted epochs array
+def find_range(epochs_us, from_timestamp=None, to_timestamp=None):
+    start = 0
+    end = len(epochs_us)
+    if from_timestamp is not None:
+        start = int(np.searchsorted(epochs_us, round(from_timestamp * 1000000), side="left"))
+    if to_timestamp is not None:
+        end = int(np.searchsorted(epochs_us, round(to_timestamp * 1000000), side="right"))
+    return (start, max(start, end))
+
+
+## read entries of JSON lines file from 'start' to 'end' (exclusive) using entries offsets
+def read_entries(data_path, offsets, start, end):
+    if start >= end:
+        return []
+    with open(data_path, "rb") as data_file:
+        data_file.seek(int(offsets[start]))
+        if end < len(offsets):
+            content = data_file.read(int(offsets[end]) - int(offsets[start]))
+        else:
+            content = data_file.read()
+    lines = [line for line in content.split(b"\n") if line.strip()]
+    return [json.loads(line) for line in lines[: end - start]]
+
+
+## build or update index of JSON lines file
+## only part of data file appended since previous update is scanned
+## returns array of index records
+def update_index(data_path):
+    index_path = get_index_path(data_path)
+    data_size = pathlib.Path(data_path).stat().st_size
+    index_header = _read_index_header(index_path)
+    if index_header is None or index_header[1] > data_size:
+        ## missing, invalid or stale index
+        index_header = (0, 0)
+    records_num, indexed_size = index_header
+
+    new_records = []
+    if indexed_size < data_size:
+        new_records, indexed_size = _scan_entries(data_path, indexed_size)
+        try:
+            _append_index(index_path, records_num, new_records, indexed_size)
+        except OSError as exc:
+            ## e.g. read-only directory - index is kept in memory only for this call
+            _LOGGER.debug("unable to write index file %s, reason: %s", index_path, exc)
+            return _join_index(index_path, records_num, new_records)
+        records_num += len(new_records)
+        _LOGGER.debug("indexed %s new entries of file %s", len(new_records), data_path)
+
+    if records_num < 1:
+        return np.zeros(0, dtype=INDEX_DTYPE)
+    return np.memmap(index_path, dtype=INDEX_DTYPE, mode="r", offset=INDEX_HEADER.size, shape=(records_num,))
+
+
+## returns list of (timestamp, offset) and position after last complete line
+def _scan_entries(data_path, start_pos):
+    ret_list = []
+    with open(data_path, "rb") as data_file:
+        data_file.seek(start_pos)
+        pos = start_pos
+        if pos == 0:
+            ## skip header
+            pos += len(data_file.readline())
+        for line in data_file:
+            if not line.endswith(b"\n"):
+                ## incomplete entry
+                break
+            content = line.strip()
+            if content:
+                item = json.loads(content)
+                ret_list.append((entry_timestamp_us(item), pos))
+            pos += len(line)
+    return (ret_list, pos)
+
+
+def _append_index(index_path, records_num, new_records, indexed_size):
+    records = np.array(new_records, dtype=INDEX_DTYPE)
+    mode = "r+b" if records_num > 0 else "wb"
+    with open(index_path, mode) as index_file:
+        if records_num < 1:
+            index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, 0))
+        else:
+            ## drop possible records written after recent header update
+            index_file.truncate(INDEX_HEADER.size + records_num * INDEX_DTYPE.itemsize)
+            index_file.seek(0, os.SEEK_END)
+        index_file.write(records.tobytes())
+        index_file.flush()
+        index_file.seek(0)
+        index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, records_num + len(records), indexed_size))
+
+
+## returns array of index records stored in index file followed by new records
+def _join_index(index_path, records_num, new_records):
+    records = np.array(new_records, dtype=INDEX_DTYPE)
+    if records_num < 1:
+        return records
+    stored = np.fromfile(index_path, dtype=INDEX_DTYPE, count=records_num, offset=INDEX_HEADER.size)
+    return np.concatenate((stored, records))
+
+
+## returns (<records-number>, <indexed-size>)
+def _read_index_header(index_path):
+    if not os.path.isfile(index_path):
+        return None
+    with open(index_path, "rb") as index_file:
+        header_data = index_file.read(INDEX_HEADER.size)
+    if len(header_data) < INDEX_HEADER.size:
+        return None
+    magic, version, records_num, indexed_size = INDEX_HEADER.unpack(header_data)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        return None
+    index_size = pathlib.Path(index_path).stat().st_size
+    if index_size < INDEX_HEADER.size + records_num * INDEX_DTYPE.itemsize:
+        return None
+    return (records_num, indexed_size)
+
+
+def _limit_recent(start, end, recent):
+    if recent is None or recent < 1:
+        return start
+    return max(start, end - recent)
@@ -97,6 +97,11 @@ def add_timezone(dt: datetime.datetime) -> datetime.datetime:
     return tz_info.localize(dt)
 
 
+## returns fixed offset timezone of current local time
+def current_timezone():
+    return datetime.datetime.now(datetime.UTC).astimezone().tzinfo
+
+
 def convert_to_html(content: str, *, preserve_newline=False) -> str:
     if content is None:
         return None
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+# ruff: noqa: T201,PLC0415
+
+import contextlib
+
+with contextlib.suppress(ImportError):
+    ## following import success only when file is directly executed from command line
+    ## otherwise will throw exception when executing as parameter for "python -m"
+    # pylint: disable=E0401,W0611
+    # ruff: noqa: F401
+    import __init__
+
+    ## when import fails then it means that the script was executed indirectly
+    ## in this case __init__ is already loaded
+
+import os
+import sys
+import io
+import argparse
+import logging
+import datetime
+import subprocess
+import tempfile
+import time
+import resource
+import multiprocessing
+from concurrent import futures
+
+from lywsd03mmcaccess import io as dataio
+from lywsd03mmcaccess import historystore
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_LOGGER = logging.getLogger(__name__)
+
+
+##
+## Offline benchmarks of data processing paths. Synthetic history and measurement files are
+## generated once per size, then every benchmark is executed in fresh process, so peak memory
+## of one benchmark does not affect the others. Results are appended to JSON lines file.
+##
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+BASE_TIMESTAMP = 1735689600  ## 2025-01-01 00:00 UTC
+
+
+## ============================= synthetic data ===================================
+
+
+def generate_history(size):
+    start_time = datetime.datetime.fromtimestamp(BASE_TIMESTAMP).astimezone()
+    for index in range(size):
+        dev_timestamp = 3600 * (index + 1)
+        wall_datetime = start_time + datetime.timedelta(seconds=dev_timestamp)
+        yield {
+            "index": index,
+            "dev_timestamp": dev_timestamp,
+            "timestamp": wall_datetime.timestamp(),
+            "wall_datetime": str(wall_datetime),
+            "Tmin": 18.0 + index % 50 / 10,
+            "Tmax": 23.0 + index % 50 / 10,
+            "Hmin": 40 + index % 20,
+            "Hmax": 60 + index % 20,
+        }
+
+
+def generate_measurements(size):
+    for index in range(size):
+        yield {"timestamp": BASE_TIMESTAMP + index * 6.0, "T": 20.0 + index % 500 / 100, "H": 50 + index % 30, "B": 90}
+
+
+def generate_measurements_log(size):
+    for item in generate_measurements(size):
+        ## logs hold local time without offset
+        item_datetime = datetime.datetime.fromtimestamp(item["timestamp"], tz=datetime.UTC).astimezone()
+        item_datetime = item_datetime.replace(tzinfo=None)
+        yield f"""received data: {item_datetime} Temp: {item["T"]:.2f}C Humidity: {item["H"]}% Battery: {item["B"]}%\n"""
+
+
+## returns dict of paths to generated files (and size of data)
+def prepare_data(data_dir, size):
+    paths = {
+        "size": size,
+        "history": os.path.join(data_dir, f"history_{size}.json"),
+        "measurements": os.path.join(data_dir, f"measurements_{size}.json"),
+        "log": os.path.join(data_dir, f"measurements_{size}.txt"),
+    }
+    if not os.path.isfile(paths["history"]):
+        with open(paths["history"], "w", encoding="utf-8") as out_file:
+            dataio.write_json_array_stream(generate_history(size), out_file, indent=2)
+    if not os.path.isfile(paths["measurements"]):
+        with open(paths["measurements"], "w", encoding="utf-8") as out_file:
+            dataio.write_json_array_stream(generate_measurements(size), out_file, indent=2)
+    if not os.path.isfile(paths["log"]):
+        with open(paths["log"], "w", encoding="utf-8") as out_file:
+            out_file.writelines(generate_measurements_log(size))
+    return paths
+
+
+## device serving history entries from memory (no BLE needed)
+class HistoryDeviceMock:
+    def __init__(self, entries):  # noqa: F811
+        self.mac = "AA:BB:CC:DD:EE:FF"
+        self.start_time = datetime.datetime.fromtimestamp(BASE_TIMESTAMP).astimezone()
+        self.entries = entries
+
+    def get_history_indexes(self):
+        return (len(self.entries), len(self.entries))
+
+    def get_recent_history_entry(self):
+        return self.entries[-1]
+
+    def get_history_since(self, first_index):
+        return self.entries[first_index:]
+
+    def get_history_measurements(self):
+        return self.entries
+
+
+## ============================= benchmarks ===================================
+
+
+## every benchmark prepares input (not measured) and returns operation to measure
+
+
+def bench_read_json(paths, _work_dir, _options):
+    return lambda: dataio.read_json(paths["measurements"])
+
+
+def bench_write_object(paths, work_dir, _options):
+    data_list = dataio.read_json(paths["history"])
+    out_path = os.path.join(work_dir, "out.json")
+    return lambda: dataio.write_object(data_list, out_path, indent=2)
+
+
+## merge of 'readhistory --outappend': half of history already stored, rest appended
+def bench_readhistory_append(paths, work_dir, _options):
+    data_list = dataio.read_json(paths["history"])
+    out_path = os.path.join(work_dir, "history.jsonl")
+    device = HistoryDeviceMock(data_list[: len(data_list) // 2 + 1])
+    historystore.sync_history(device, out_path)
+    device.entries = data_list
+    return lambda: historystore.sync_history(device, out_path)
+
+
+def bench_print_raw_history(paths, _work_dir, _options):
+    return _print_raw_operation(dataio.read_json(paths["history"]))
+
+
+def bench_print_raw_measurements(paths, _work_dir, _options):
+    return _print_raw_operation(dataio.read_json(paths["measurements"]))
+
+
+def _print_raw_operation(data_list):
+    from lywsd03mmcaccess.main import print_raw
+
+    def operation():
+        with open(os.devnull, "w", encoding="utf-8") as null_file, contextlib.redirect_stdout(null_file):
+            print_raw(data_list)
+
+    return operation
+
+
+def bench_plot_history(paths, _work_dir, _options):
+    return _plot_operation(dataio.read_json(paths["history"]))
+
+
+def bench_plot_measurements(paths, _work_dir, _options):
+    return _plot_operation(dataio.read_json(paths["measurements"]))
+
+
+def _plot_operation(data_list):
+    from matplotlib.figure import Figure
+
+    from lywsd03mmcaccess.charts import plot_data
+
+    def operation():
+        figure = Figure()
+        plot_data(figure, data_list)
+        figure.savefig(io.BytesIO(), format="png")
+
+    return operation
+
+
+def bench_convertmeasurements(paths, work_dir, _options):
+    from lywsd03mmcaccess.main import prepare_parser
+
+    parser, _subparsers = prepare_parser()
+    out_path = os.path.join(work_dir, "converted.json")
+    command = ["convertmeasurements", "--infile", paths["log"], "--outfile", out_path, "--noprint"]
+    args = parser.parse_args(command)
+    return lambda: args.func(args)
+
+
+## access layer on simulated device: 'info' command reads
+def bench_device_snapshot(_paths, _work_dir, options):
+    device = create_simulated_device(100, options)
+
+    def operation():
+        with device.connect():
+            device.snapshot()
+
+    return operation
+
+
+## access layer on simulated device: 'readhistory --outappend' reading whole history of given size
+def bench_device_history(paths, work_dir, options):
+    device = create_simulated_device(paths["size"], options)
+    out_path = os.path.join(work_dir, "history.jsonl")
+
+    def operation():
+        with device.connect():
+            historystore.sync_history(device, out_path)
+
+    return operation
+
+
+def create_simulated_device(history_size, options):
+    from lywsd03mmcaccess.simulator import SimulatedPeripheral
+    from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+
+    def create_peripheral(_mac):
+        return SimulatedPeripheral(history_size, latency=options["latency"], loss=options["loss"], seed=0)
+
+    ThermometerAccess.PERIPHERAL_FACTORY = create_peripheral
+    try:
+        return ThermometerAccess("AA:BB:CC:DD:EE:FF", access_timeout=1.0)
+    finally:
+        ThermometerAccess.PERIPHERAL_FACTORY = None
+
+
+BENCHMARKS = {
+    "read_json": bench_read_json,
+    "write_object": bench_write_object,
+    "readhistory_append": bench_readhistory_append,
+    "print_raw_history": bench_print_raw_history,
+    "print_raw_measurements": bench_print_raw_measurements,
+    "plot_history": bench_plot_history,
+    "plot_measurements": bench_plot_measurements,
+    "convertmeasurements": bench_convertmeasurements,
+    "device_snapshot": bench_device_snapshot,
+    "device_history": bench_device_history,
+}
+
+
+## ============================= execution ===================================
+
+
+## executed in separate process
+## returns dict with measured values
+## 'options' - parameters of simulated device: {"latency": <seconds>, "loss": <probability>}
+def run_benchmark(name, paths, options):
+    with tempfile.TemporaryDirectory() as work_dir:
+        operation = BENCHMARKS[name](paths, work_dir, options)
+        base_rss = get_peak_rss()
+        start_time = time.perf_counter()
+        operation()
+        duration = time.perf_counter() - start_time
+        peak_rss = get_peak_rss()
+    return {"seconds": round(duration, 6), "base_rss_kb": base_rss, "peak_rss_kb": peak_rss}
+
+
+def disable_logs():
+    logging.disable(logging.CRITICAL)
+
+
+## peak resident memory of current process in kilobytes
+def get_peak_rss():
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        ## reported in bytes
+        peak_rss //= 1024
+    return peak_rss
+
+
+def get_default_label():
+    command = ["git", "rev-parse", "--short", "HEAD"]
+    try:
+        result = subprocess.run(command, cwd=SCRIPT_DIR, capture_output=True, text=True, check=True)  # noqa: S603
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def run_all(benchmarks, sizes, data_dir, label, options):
+    results = []
+    ## fresh interpreter for every benchmark
+    mp_context = multiprocessing.get_context("spawn")
+    for size in sizes:
+        _LOGGER.info("preparing data of size %s", size)
+        paths = prepare_data(data_dir, size)
+        for name in benchmarks:
+            executor = futures.ProcessPoolExecutor(max_workers=1, mp_context=mp_context, initializer=disable_logs)
+            with executor:
+                values = executor.submit(run_benchmark, name, paths, options).result()
+            record = {
+                "label": label,
+                "date": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "benchmark": name,
+                "size": size,
+            }
+            if name.startswith("device_"):
+                record.update(options)
+            record.update(values)
+            print(
+                f"{name:<24} {size:>10} {values['seconds']:>12.4f}s"
+                f" {values['peak_rss_kb'] / 1024:>10.1f}MB (base {values['base_rss_kb'] / 1024:.1f}MB)",
+            )
+            results.append(record)
+    return results
+
+
+## ============================= main section ===================================
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of data processing (offline, no device needed)")
+    parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    parser.add_argument(
+        "--benchmark",
+        action="append",
+        choices=list(BENCHMARKS.keys()),
+        help="Benchmark to run (can be repeated), all if not given",
+    )
+    parser.add_argument(
+        "--sizes",
+        action="store",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated numbers of entries of generated data (e.g. 1000,10000000)",
+    )
+    parser.add_argument(
+        "--datadir",
+        action="store",
+        help="Directory for generated data files (kept between runs), temporary directory if not given",
+    )
+    parser.add_argument(
+        "--latency",
+        action="store",
+        type=float,
+        default=0.005,
+        help="Latency in seconds of single operation of simulated device (used by 'device_*' benchmarks)",
+    )
+    parser.add_argument(
+        "--loss",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Probability of packet loss of simulated device (used by 'device_*' benchmarks)",
+    )
+    parser.add_argument("--label", action="store", help="Label of results (default: current git commit)")
+    parser.add_argument(
+        "--outfile",
+        action="store",
+        help="Path to JSON lines file results are appended to",
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig()
+    if args.logall is True:
+        logging.getLogger().setLevel(logging.DEBUG)
+    else:
+        logging.getLogger().setLevel(logging.INFO)
+
+    benchmarks = args.benchmark or list(BENCHMARKS.keys())
+    sizes = [int(size) for size in args.sizes.split(",")]
+    label = args.label or get_default_label()
+
+    with contextlib.ExitStack() as stack:
+        data_dir = args.datadir
+        if not data_dir:
+            data_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        os.makedirs(data_dir, exist_ok=True)
+        options = {"latency": args.latency, "loss": args.loss}
+        results = run_all(benchmarks, sizes, data_dir, label, options)
+
+    if args.outfile:
+        dataio.append_json_lines(args.outfile, results)
+        _LOGGER.info("results appended to file: %s", args.outfile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
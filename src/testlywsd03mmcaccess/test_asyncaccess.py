@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+# pylint: disable=W0212
+# ruff: noqa: SLF001
+
+import asyncio
+import struct
+import unittest
+
+from lywsd03mmcaccess.asyncaccess import AsyncThermometerAccess
+from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+
+
+class CharacteristicMock:
+    def __init__(self, handle):
+        self.handle = handle
+
+    # pylint: disable=C0103
+    def getHandle(self):  # noqa: N802
+        return self.handle
+
+    # pylint: disable=C0103
+    def getDescriptors(self, forUUID=None):  # noqa: N802, N803, ARG002
+        return [self]
+
+    def write(self, value, withResponse=False):  # noqa: N803, FBT002
+        pass
+
+
+## in-process peripheral sending measurement notifications
+class PeripheralMock:
+    def __init__(self, values_list):
+        self.notifications = [struct.pack("<hBh", int(temp * 100), hum, 3000) for temp, hum in values_list]
+        self.delegate = None
+        self.connected = False
+
+    def connect(self, _mac):
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+    # pylint: disable=C0103
+    def setDelegate(self, delegate):  # noqa: N802
+        self.delegate = delegate
+
+    # pylint: disable=C0103
+    def getCharacteristics(self, uuid=None):  # noqa: N802, ARG002
+        return [CharacteristicMock(10)]
+
+    # pylint: disable=C0103
+    def waitForNotifications(self, _timeout):  # noqa: N802
+        if not self.notifications:
+            return False
+        self.delegate.handleNotification(10, self.notifications.pop(0))
+        return True
+
+
+def create_device(mac, values_list):
+    device = ThermometerAccess(mac, access_timeout=0.1)
+    device.client._peripheral = PeripheralMock(values_list)
+    return AsyncThermometerAccess(mac, device=device)
+
+
+class AsyncThermometerAccessTest(unittest.IsolatedAsyncioTestCase):
+    async def test_measurement(self):
+        async with create_device("AA:BB:CC:DD:EE:01", [(21.5, 40)]) as device:
+            async with device.connect():
+                self.assertTrue(device.device.client._peripheral.connected)
+                data = await device.get_current_measurements()
+            self.assertFalse(device.device.client._peripheral.connected)
+        self.assertEqual(data.temperature, 21.5)
+        self.assertEqual(data.humidity, 40)
+
+    async def test_notifications(self):
+        async def receive(device, count):
+            ret_list = []
+            async with device.connect():
+                async for record in device.measurements():
+                    ret_list.append((record["T"], record["H"]))
+                    if len(ret_list) >= count:
+                        break
+            device.close()
+            return ret_list
+
+        device1 = create_device("AA:BB:CC:DD:EE:01", [(20.0, 40), (20.5, 41)])
+        device2 = create_device("AA:BB:CC:DD:EE:02", [(25.0, 60), (25.5, 61), (26.0, 62)])
+        results = await asyncio.gather(receive(device1, 2), receive(device2, 3))
+        self.assertEqual(results[0], [(20.0, 40), (20.5, 41)])
+        self.assertEqual(results[1], [(25.0, 60), (25.5, 61), (26.0, 62)])
@@ -0,0 +1,25 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import tempfile
+import unittest
+
+from testlywsd03mmcaccess import benchmark
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_small(self):
+        ## benchmarks have to work offline on small data (charts are skipped as slow)
+        with tempfile.TemporaryDirectory() as data_dir:
+            paths = benchmark.prepare_data(data_dir, 50)
+            for name in benchmark.BENCHMARKS:
+                if name.startswith("plot_"):
+                    continue
+                values = benchmark.run_benchmark(name, paths, {"latency": 0.0, "loss": 0.0})
+                self.assertGreaterEqual(values["seconds"], 0.0)
+                self.assertGreaterEqual(values["peak_rss_kb"], values["base_rss_kb"])
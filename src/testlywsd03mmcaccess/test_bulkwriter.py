@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import datetime
+import io as stdio
+import json
+import unittest
+
+import numpy as np
+
+from lywsd03mmcaccess import bulkwriter
+from lywsd03mmcaccess.io import history_to_array, measurements_to_array
+
+HISTORY_ENTRY = {
+    "index": 7,
+    "dev_timestamp": 3600,
+    "timestamp": 1758232449.0,
+    "wall_datetime": "2025-09-18 23:54:09+02:00",
+    "Tmin": 24.2,
+    "Tmax": 27.0,
+    "Hmin": 54,
+    "Hmax": 62,
+}
+
+
+def write_entries(data_list, **kwargs: object):
+    out_stream = stdio.StringIO()
+    items_num = bulkwriter.write_entries(data_list, out_stream, **kwargs)
+    return items_num, out_stream.getvalue()
+
+
+class BulkWriterTest(unittest.TestCase):
+    def test_history_text(self):
+        items_num, content = write_entries([HISTORY_ENTRY, HISTORY_ENTRY])
+        self.assertEqual(items_num, 2)
+        self.assertEqual(
+            content.splitlines()[1],
+            "Entry 1: 3600 2025-09-18 23:54:09+02:00 Tmin: 24.2 Tmax: 27.0  Hmin: 54 Hmax: 62",
+        )
+
+    def test_measurements_csv(self):
+        data_list = [{"timestamp": 1000.0 + index, "T": 21.5, "H": 40, "B": 90} for index in range(5)]
+        items_num, content = write_entries(iter(data_list), out_format="csv", columns=["timestamp", "T"], batch_size=2)
+        self.assertEqual(items_num, 5)
+        self.assertEqual(content.splitlines(), ["timestamp,T"] + [f"{1000.0 + index},21.5" for index in range(5)])
+
+        _, array_content = write_entries(measurements_to_array(data_list), out_format="csv", columns=["timestamp", "T"])
+        self.assertEqual(array_content, content)
+
+    def test_history_array(self):
+        data_array = history_to_array([HISTORY_ENTRY])
+        _, content = write_entries(data_array, out_format="jsonl")
+        item = json.loads(content)
+        self.assertEqual(item["Tmin"], 24.2)
+        self.assertEqual(item["timestamp"], 1758232449.0)
+
+        _, content = write_entries(data_array, out_format="tsv", columns=["index", "Hmax"])
+        self.assertEqual(content, "index\tHmax\n7\t62\n")
+
+    def test_history_array_wall_time(self):
+        ## wall time is printed in time zone of reading, not in current time zone
+        data_list = [
+            HISTORY_ENTRY,
+            dict(HISTORY_ENTRY, timestamp=1766098449.5, wall_datetime="2025-12-18 23:54:09.500000+01:00"),
+        ]
+        _, content = write_entries(data_list)
+        _, array_content = write_entries(history_to_array(data_list))
+        self.assertEqual(array_content, content)
+        self.assertIn("2025-12-18 23:54:09.500000+01:00", array_content)
+
+    def test_format_datetimes(self):
+        tzinfo = datetime.timezone(datetime.timedelta(hours=2))
+        epochs = [1758232449000000, 1758232449396514]
+        values = bulkwriter.format_datetimes(np.array(epochs, dtype="<i8"), tzinfo)
+        expected = [str(datetime.datetime.fromtimestamp(value / 1000000.0, tz=tzinfo)) for value in epochs]
+        self.assertEqual(values, expected)
+
+    def test_invalid(self):
+        self.assertEqual(write_entries([]), (0, ""))
+        with self.assertRaises(ValueError):
+            write_entries([HISTORY_ENTRY], columns=["T"])
+        with self.assertRaises(ValueError):
+            write_entries([HISTORY_ENTRY], out_format="xml")
@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+
+from lywsd03mmcaccess import io
+from lywsd03mmcaccess import charts
+
+
+def create_measurements(count):
+    return [{"timestamp": 1000.0 + index * 6, "T": 20.0 + index / 10, "H": 50, "B": 90} for index in range(count)]
+
+
+class RenderChartsTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_render(self):
+        data_path = os.path.join(self.tmp_dir.name, "data.json")
+        io.append_json_lines(data_path, create_measurements(10))
+        empty_path = os.path.join(self.tmp_dir.name, "empty.json")
+        io.append_json_lines(empty_path, [])
+
+        data_files = charts.find_data_files([os.path.join(self.tmp_dir.name, "*.json")])
+        self.assertEqual(data_files, [data_path, empty_path])
+
+        results = charts.render_charts(data_files, workers=1)
+        self.assertEqual([item[2] for item in results], ["rendered", "no data"])
+        self.assertTrue(os.path.isfile(charts.get_chart_path(data_path)))
+
+        results = charts.render_charts(data_files, workers=1)
+        self.assertEqual([item[2] for item in results], ["skipped", "no data"])
+
+    def test_sidecar_files(self):
+        data_path = os.path.join(self.tmp_dir.name, "data.json")
+        io.append_json_lines(data_path, create_measurements(10))
+        for suffix in charts.SIDECAR_SUFFIXES:
+            io.write_file(data_path + suffix, "")
+        data_files = charts.find_data_files([os.path.join(self.tmp_dir.name, "*")])
+        self.assertEqual(data_files, [data_path])
+
+    def test_chart_path_conflict(self):
+        json_path = os.path.join(self.tmp_dir.name, "data.json")
+        io.append_json_lines(json_path, create_measurements(10))
+        jsonl_path = os.path.join(self.tmp_dir.name, "data.jsonl")
+        io.append_json_lines(jsonl_path, create_measurements(5))
+
+        results = charts.render_charts([json_path, jsonl_path], workers=1)
+        self.assertEqual(results[0], (json_path, charts.get_chart_path(json_path), "rendered"))
+        self.assertEqual(results[1][2], f"chart path already used by {json_path}")
+
+    def test_invalid_file(self):
+        data_path = os.path.join(self.tmp_dir.name, "data.json")
+        io.write_file(data_path, '[{"timestamp": 1.0}]')
+        results = charts.render_charts([data_path], workers=1)
+        self.assertEqual([item[2] for item in results], ["KeyError: 'T'"])
@@ -0,0 +1,105 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from lywsd03mmcaccess.daemon import DaemonClient, DaemonError, DeviceDaemon
+from lywsd03mmcaccess.simulator import SimulatedPeripheral
+from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+
+MAC = "AA:BB:CC:DD:EE:FF"
+
+
+class DaemonTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.socket_path = os.path.join(self.tmp_dir.name, "daemon.sock")
+        self.peripheral = SimulatedPeripheral(history_size=20)
+        ThermometerAccess.PERIPHERAL_FACTORY = lambda _mac: self.peripheral
+        self.daemon = DeviceDaemon(self.socket_path, access_timeout=1.0)
+        self.daemon_thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        self.daemon_thread.start()
+        self.client = DaemonClient(self.socket_path, timeout=10.0)
+        for _ in range(100):
+            if self.client.is_available():
+                break
+            time.sleep(0.01)
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.daemon.shutdown()
+        self.daemon_thread.join()
+        ThermometerAccess.PERIPHERAL_FACTORY = None
+        self.tmp_dir.cleanup()
+
+    def test_history(self):
+        history = self.client.get_history(MAC, recent=10)
+        self.assertEqual([item["index"] for item in history], list(range(10, 20)))
+        ## entries of previous request are not returned
+        history = self.client.get_history(MAC, recent=3)
+        self.assertEqual([item["index"] for item in history], [17, 18, 19])
+        history = self.client.get_history(MAC, since_index=15)
+        self.assertEqual([item["index"] for item in history], list(range(15, 20)))
+
+        info = self.client.get_info(MAC)
+        self.assertEqual([item["index"] for item in info["recent_history"]], [17, 18, 19])
+        self.assertEqual(info["history_indexes"], [20, 20])
+        ## device is connected once and kept connected between requests
+        self.assertEqual(self.peripheral.stats["connects"], 1)
+        self.assertEqual(self.client.request({"command": "devices"}), {MAC: True})
+
+    def test_device_clock_change(self):
+        history = self.client.get_history(MAC, recent=1)
+        ## device clock jumped forward by 10 minutes (e.g. drift or restart)
+        self.peripheral.start_time -= 600
+        drifted_history = self.client.get_history(MAC, recent=1)
+        self.assertEqual(drifted_history[0]["index"], history[0]["index"])
+        self.assertAlmostEqual(drifted_history[0]["timestamp"] - history[0]["timestamp"], -600, delta=5)
+        self.assertEqual(self.peripheral.stats["connects"], 1)
+
+    def test_measurement(self):
+        measurement = self.client.get_measurement(MAC)
+        self.assertEqual(measurement["battery"], 85)
+        reads = self.peripheral.stats["notifications"]
+        self.assertEqual(self.client.get_measurement(MAC, max_age=60.0), measurement)
+        self.assertEqual(self.peripheral.stats["notifications"], reads)
+
+    def test_error(self):
+        with self.assertRaises(DaemonError):
+            self.client.request({"command": "unknown", "mac": MAC})
+        with self.assertRaises(DaemonError):
+            self.client.request({"command": "history"})
+        with self.assertRaises(DaemonError):
+            self.client.request(["history", MAC])
+        ## invalid requests do not create device connections
+        self.assertEqual(self.client.request({"command": "devices"}), {})
+        self.assertEqual(self.peripheral.stats["connects"], 0)
+
+    def test_invalid_response(self):
+        invalid_path = os.path.join(self.tmp_dir.name, "invalid.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server_socket:
+            server_socket.bind(invalid_path)
+            server_socket.listen(1)
+
+            def respond():
+                connection, _ = server_socket.accept()
+                with connection:
+                    connection.recv(65536)
+                    connection.sendall(b'{"status": "ok", "da')
+
+            server_thread = threading.Thread(target=respond, daemon=True)
+            server_thread.start()
+            with self.assertRaises(DaemonError):
+                DaemonClient(invalid_path, timeout=10.0).get_metrics()
+            server_thread.join()
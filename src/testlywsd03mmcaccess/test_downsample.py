@@ -0,0 +1,39 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import numpy as np
+
+from lywsd03mmcaccess.downsample import minmax_indices, downsample_columns
+
+
+class DownsampleTest(unittest.TestCase):
+    def test_small(self):
+        values = np.arange(10, dtype=float)
+        self.assertIsNone(minmax_indices([values], 5))
+
+    def test_extremes(self):
+        values = np.zeros(1001)
+        values[123] = 5.0
+        values[777] = -3.0
+        indices = minmax_indices([values], 10)
+        self.assertLessEqual(len(indices), 2 + 2 * 10)
+        self.assertIn(0, indices)
+        self.assertIn(1000, indices)
+        self.assertIn(123, indices)
+        self.assertIn(777, indices)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_columns(self):
+        columns = {"time": np.arange(1000), "T": np.sin(np.arange(1000) / 10.0)}
+        reduced = downsample_columns(columns, ["T"], 20)
+        self.assertEqual(len(reduced["time"]), len(reduced["T"]))
+        self.assertLess(len(reduced["T"]), 100)
+        self.assertEqual(reduced["T"].max(), columns["T"].max())
+        self.assertEqual(reduced["T"].min(), columns["T"].min())
@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+import urllib.request
+
+from lywsd03mmcaccess.exporter import LatestReadings, MetricsServer, ReadingsSink, render_metrics
+from lywsd03mmcaccess.metrics import MetricsRegistry
+from lywsd03mmcaccess.ringbuffer import MeasurementRingBuffer
+
+MAC = "AA:BB:CC:DD:EE:FF"
+
+
+class ExporterTest(unittest.TestCase):
+    def test_render(self):
+        registry = MetricsRegistry()
+        registry.increment("disconnects", mac=MAC)
+        registry.observe("read", 0.25, mac=MAC, uuid="ebe0ccb9")
+        readings = {MAC: {"timestamp": 100.0, "T": 21.5, "H": 40, "B": 90}}
+
+        content = render_metrics(readings, registry.snapshot(), now=112.5)
+        lines = content.splitlines()
+        self.assertIn('lywsd03mmc_temperature_celsius{mac="AA:BB:CC:DD:EE:FF"} 21.5', lines)
+        self.assertIn('lywsd03mmc_humidity_percent{mac="AA:BB:CC:DD:EE:FF"} 40', lines)
+        self.assertIn('lywsd03mmc_battery_percent{mac="AA:BB:CC:DD:EE:FF"} 90', lines)
+        self.assertIn('lywsd03mmc_last_update_age_seconds{mac="AA:BB:CC:DD:EE:FF"} 12.5', lines)
+        self.assertIn("# TYPE lywsd03mmc_disconnects_total counter", lines)
+        self.assertIn('lywsd03mmc_disconnects_total{mac="AA:BB:CC:DD:EE:FF"} 1', lines)
+        self.assertIn('lywsd03mmc_read_seconds_count{mac="AA:BB:CC:DD:EE:FF",uuid="ebe0ccb9"} 1', lines)
+        self.assertIn('lywsd03mmc_read_seconds_sum{mac="AA:BB:CC:DD:EE:FF",uuid="ebe0ccb9"} 0.25', lines)
+
+    def test_render_buffer_stats(self):
+        buffer_stats = {MAC: {"count": 2, "T": {"min": 20.5, "max": 21.5, "mean": 21.0}}}
+        content = render_metrics({}, MetricsRegistry().snapshot(), now=112.5, buffer_stats=buffer_stats)
+        lines = content.splitlines()
+        self.assertIn('lywsd03mmc_recent_measurements{mac="AA:BB:CC:DD:EE:FF"} 2', lines)
+        self.assertIn('lywsd03mmc_recent_temperature_celsius{mac="AA:BB:CC:DD:EE:FF",stat="min"} 20.5', lines)
+        self.assertIn('lywsd03mmc_recent_temperature_celsius{mac="AA:BB:CC:DD:EE:FF",stat="mean"} 21.0', lines)
+        self.assertNotIn("lywsd03mmc_recent_humidity_percent", content)
+
+    def test_render_empty(self):
+        content = render_metrics({}, MetricsRegistry().snapshot())
+        self.assertEqual(content, "\n")
+
+    def test_server(self):
+        readings = LatestReadings()
+        sink = ReadingsSink(readings, MAC)
+        sink.write({"timestamp": 100.0, "T": 21.5, "H": 40, "B": 90})
+
+        buffer = MeasurementRingBuffer(10)
+        buffer.write({"timestamp": 100.0, "T": 21.5, "H": 40, "B": 90})
+        metrics_server = MetricsServer(readings, MetricsRegistry(), port=0)
+        metrics_server.buffers[MAC] = buffer
+        metrics_server.start()
+        try:
+            url = f"http://127.0.0.1:{metrics_server.port}/metrics"
+            with urllib.request.urlopen(url, timeout=5.0) as response:  # noqa: S310
+                content = response.read().decode("utf-8")
+        finally:
+            metrics_server.stop()
+        self.assertIn('lywsd03mmc_temperature_celsius{mac="AA:BB:CC:DD:EE:FF"} 21.5', content)
+        self.assertIn('lywsd03mmc_recent_battery_percent{mac="AA:BB:CC:DD:EE:FF",stat="max"} 90', content)
@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+
+from bluepy import btle
+
+from lywsd03mmcaccess.handlecache import CharacteristicCache
+
+UUID_UNITS = "EBE0CCBE-7A0A-4B0C-8A1A-6FF2997DA3A6"
+
+
+class PeripheralMock:
+    def __init__(self):
+        self.discover_counter = 0
+
+    # pylint: disable=C0103
+    def getCharacteristics(self, startHnd=1, endHnd=0xFFFF, uuid=None):  # noqa: N802, N803, ARG002
+        self.discover_counter += 1
+        return [btle.Characteristic(self, uuid, 10, 2, 11)]
+
+    # pylint: disable=C0103
+    def getDescriptors(self, startHnd=1, endHnd=0xFFFF):  # noqa: N802, N803, ARG002
+        self.discover_counter += 1
+        return [btle.Descriptor(self, 0x2902, 12)]
+
+
+class CharacteristicCacheTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.cache_path = os.path.join(self.tmp_dir.name, "handles.json")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_session_cache(self):
+        peripheral = PeripheralMock()
+        cache = CharacteristicCache(peripheral)
+        cache.install()
+        peripheral.getCharacteristics(uuid=UUID_UNITS)
+        char_list = peripheral.getCharacteristics(uuid=UUID_UNITS.lower())
+        self.assertEqual(peripheral.discover_counter, 1)
+        self.assertEqual(char_list[0].getHandle(), 11)
+
+        cache.invalidate(UUID_UNITS)
+        peripheral.getCharacteristics(uuid=UUID_UNITS)
+        self.assertEqual(peripheral.discover_counter, 2)
+
+    def test_persistent_cache(self):
+        peripheral = PeripheralMock()
+        cache = CharacteristicCache(peripheral, self.cache_path)
+        cache.install()
+        cache.validate("1.0")
+        characteristic = peripheral.getCharacteristics(uuid=UUID_UNITS)[0]
+        characteristic.getDescriptors(forUUID=0x2902)
+        cache.save()
+
+        peripheral = PeripheralMock()
+        cache = CharacteristicCache(peripheral, self.cache_path)
+        cache.install()
+        cache.validate("1.0")
+        characteristic = peripheral.getCharacteristics(uuid=UUID_UNITS)[0]
+        descriptors = characteristic.getDescriptors(forUUID=0x2902)
+        self.assertEqual(peripheral.discover_counter, 0)
+        self.assertEqual(characteristic.getHandle(), 11)
+        self.assertEqual(descriptors[0].handle, 12)
+
+        ## firmware changed
+        cache.validate("2.0")
+        peripheral.getCharacteristics(uuid=UUID_UNITS)
+        self.assertEqual(peripheral.discover_counter, 1)
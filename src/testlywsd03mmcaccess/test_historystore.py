@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import datetime
+import pathlib
+import tempfile
+import unittest
+
+from lywsd03mmcaccess import historystore, io
+
+
+class DeviceMock:
+    def __init__(self, start_time, entries_num):
+        self.mac = "AA:BB:CC:DD:EE:FF"
+        self.start_time = start_time
+        self.entries = []
+        self.first_index = 0
+        self.add_entries(entries_num)
+        self.read_counter = 0  ## number of transferred history entries
+
+    def add_entries(self, entries_num):
+        for _ in range(entries_num):
+            index = self.first_index + len(self.entries)
+            dev_timestamp = 3600 * (index + 1)
+            wall_datetime = self.start_time + datetime.timedelta(seconds=dev_timestamp)
+            entry = {"index": index, "dev_timestamp": dev_timestamp, "wall_datetime": str(wall_datetime)}
+            self.entries.append(entry)
+
+    def get_history_indexes(self):
+        return (self.first_index + len(self.entries), len(self.entries))
+
+    def get_recent_history_entry(self):
+        return self.entries[-1]
+
+    def get_history_since(self, first_index):
+        ret_list = [item for item in self.entries if item["index"] >= first_index]
+        self.read_counter += len(ret_list)
+        return ret_list
+
+    def get_history_measurements(self):
+        return self.get_history_since(0)
+
+
+class SyncHistoryTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.data_path = os.path.join(self.tmp_dir.name, "history.json")
+        self.start_time = datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_incremental(self):
+        device = DeviceMock(self.start_time, 5)
+        new_items = historystore.sync_history(device, self.data_path)
+        self.assertEqual(len(new_items), 5)
+        cursor = historystore.read_cursor(self.data_path, device.mac)
+        self.assertEqual(cursor["index"], 4)
+
+        new_items = historystore.sync_history(device, self.data_path)
+        self.assertEqual(new_items, [])
+        self.assertEqual(device.read_counter, 5)
+
+        device.add_entries(3)
+        new_items = historystore.sync_history(device, self.data_path)
+        self.assertEqual([item["index"] for item in new_items], [5, 6, 7])
+        self.assertEqual(device.read_counter, 8)
+
+    def test_cursor_from_data(self):
+        device = DeviceMock(self.start_time, 5)
+        historystore.sync_history(device, self.data_path)
+        pathlib.Path(historystore.get_cursor_path(self.data_path)).unlink()
+
+        device.add_entries(2)
+        new_items = historystore.sync_history(device, self.data_path)
+        self.assertEqual([item["index"] for item in new_items], [5, 6])
+
+    def test_cursor_malformed(self):
+        device = DeviceMock(self.start_time, 5)
+        historystore.sync_history(device, self.data_path)
+        cursor_path = historystore.get_cursor_path(self.data_path)
+        for content in [f'{{"mac": "{device.mac}"}}', '{"index": "4", "start_time": null}', "[1, 2]", "{"]:
+            io.write_file(cursor_path, content)
+            cursor = historystore.read_cursor(self.data_path, device.mac)
+            self.assertEqual(cursor["index"], 4)
+            self.assertEqual(cursor["start_time"], device.start_time.timestamp())
+
+        device.add_entries(2)
+        new_items = historystore.sync_history(device, self.data_path)
+        self.assertEqual([item["index"] for item in new_items], [5, 6])
+        self.assertEqual(historystore.read_cursor(self.data_path, device.mac)["index"], 6)
+
+    def test_reboot(self):
+        device = DeviceMock(self.start_time, 5)
+        historystore.sync_history(device, self.data_path)
+
+        device = DeviceMock(self.start_time + datetime.timedelta(days=1), 7)
+        new_items = historystore.sync_history(device, self.data_path)
+        self.assertEqual(len(new_items), 7)
+        cursor = historystore.read_cursor(self.data_path, device.mac)
+        self.assertEqual(cursor["index"], 6)
+        self.assertEqual(cursor["start_time"], device.start_time.timestamp())
+
+    def test_full_read_duplicates(self):
+        device = DeviceMock(self.start_time, 5)
+        historystore.sync_history(device, self.data_path)
+        ## false reboot detection - history kept by device is read again
+        cursor = historystore.read_cursor(self.data_path, device.mac)
+        cursor["start_time"] -= 3600
+        historystore.write_cursor(self.data_path, cursor)
+
+        device.add_entries(2)
+        new_items = historystore.sync_history(device, self.data_path)
+        self.assertEqual([item["index"] for item in new_items], [5, 6])
+        self.assertEqual(device.read_counter, 12)
+        data_list = io.read_data(self.data_path)
+        self.assertEqual([item["index"] for item in data_list], list(range(7)))
+        self.assertEqual(historystore.read_cursor(self.data_path, device.mac)["index"], 6)
@@ -0,0 +1,183 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+
+from lywsd03mmcaccess import io
+
+
+class JsonTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.data_path = os.path.join(self.tmp_dir.name, "data.json")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_read_comments(self):
+        io.write_file(self.data_path, '# comment\n{"aaa": 1,  # comment\n "bbb": [2, 3]}\n')
+        self.assertEqual(io.read_json(self.data_path), {"aaa": 1, "bbb": [2, 3]})
+
+    def test_read_empty(self):
+        io.write_file(self.data_path, "")
+        self.assertIsNone(io.read_json(self.data_path))
+        self.assertEqual(list(io.iter_json_array(self.data_path)), [])
+
+    def test_iter_array(self):
+        data_list = [{"index": index, "value": index * 1.5, "name": f"item {index}"} for index in range(100)]
+        data_list.append(123456789)
+        io.write_object(data_list, self.data_path, indent=2)
+        for chunk_size in [1, 7, 1000]:
+            self.assertEqual(list(io.iter_json_array(self.data_path, chunk_size=chunk_size)), data_list)
+
+    def test_iter_array_comments(self):
+        io.write_file(self.data_path, "# comment\n[ 12,  # comment\n 345 ,\n[] ]  \n")
+        self.assertEqual(list(io.iter_json_array(self.data_path, chunk_size=1)), [12, 345, []])
+
+    def test_iter_array_invalid(self):
+        io.write_file(self.data_path, '{"aaa": 1}')
+        with self.assertRaises(ValueError):
+            list(io.iter_json_array(self.data_path))
+        io.write_file(self.data_path, "[1, 2")
+        with self.assertRaises(ValueError):
+            list(io.iter_json_array(self.data_path))
+
+    def test_write_array_stream(self):
+        data_list = [{"index": 1, "values": [1, 2]}, {"index": 2, "values": {"a": None}}, 3]
+        for indent in [None, 2]:
+            for items in [data_list, []]:
+                with open(self.data_path, "w", encoding="utf-8") as out_file:
+                    self.assertEqual(io.write_json_array_stream(iter(items), out_file, indent=indent), len(items))
+                expected_path = self.data_path + ".expected"
+                io.write_object(items, expected_path, indent=indent)
+                self.assertEqual(io.read_file(self.data_path), io.read_file(expected_path))
+
+
+class JsonLinesTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.data_path = os.path.join(self.tmp_dir.name, "data.json")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_append(self):
+        io.append_json_lines(self.data_path, [{"index": 1}, {"index": 2}])
+        io.append_json_lines(self.data_path, [{"index": 3}])
+        self.assertTrue(io.is_json_lines_file(self.data_path))
+        data_list = io.read_data(self.data_path)
+        self.assertEqual(data_list, [{"index": 1}, {"index": 2}, {"index": 3}])
+
+    def test_last_entry(self):
+        self.assertIsNone(io.read_json_lines_last(self.data_path))
+        io.append_json_lines(self.data_path, [])
+        self.assertIsNone(io.read_json_lines_last(self.data_path))
+        io.append_json_lines(self.data_path, [{"index": 1}, {"index": 2}])
+        self.assertEqual(io.read_json_lines_last(self.data_path), {"index": 2})
+
+    def test_append_incomplete(self):
+        io.append_json_lines(self.data_path, [{"index": 1}])
+        ## simulate interrupted write
+        with open(self.data_path, "a", encoding="utf-8") as data_file:
+            data_file.write('{"ind')
+        self.assertEqual(io.read_json_lines(self.data_path), [{"index": 1}])
+        self.assertEqual(io.read_json_lines_last(self.data_path), {"index": 1})
+        io.append_json_lines(self.data_path, [{"index": 2}])
+        self.assertEqual(io.read_json_lines(self.data_path), [{"index": 1}, {"index": 2}])
+
+    def test_migrate(self):
+        io.write_object([{"index": 1}, {"index": 2}], self.data_path, indent=2)
+        self.assertFalse(io.is_json_lines_file(self.data_path))
+        self.assertTrue(io.migrate_json_to_json_lines(self.data_path))
+        self.assertTrue(io.is_json_lines_file(self.data_path))
+        self.assertEqual(io.read_data(self.data_path), [{"index": 1}, {"index": 2}])
+
+    def test_compact_json_detection(self):
+        ## single line JSON array is not JSON lines file
+        data_list = [{"index": index} for index in range(1000)]
+        io.write_object(data_list, self.data_path)
+        self.assertFalse(io.is_json_lines_file(self.data_path))
+        self.assertEqual(io.read_data(self.data_path), data_list)
+
+
+class BinaryTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.data_path = os.path.join(self.tmp_dir.name, "data.bin")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_history(self):
+        data_list = [
+            {
+                "index": 7,
+                "dev_timestamp": 3600,
+                "wall_datetime": "2025-09-18 23:54:09.396514+02:00",
+                "Tmin": 24.2,
+                "Tmax": 27.0,
+                "Hmin": 54,
+                "Hmax": 62,
+            },
+        ]
+        io.write_binary(data_list, self.data_path)
+        self.assertTrue(io.is_binary_file(self.data_path))
+        records = io.read_data(self.data_path)
+        self.assertTrue(io.is_history_data(records))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records["index"][0], 7)
+        self.assertEqual(records["dev_timestamp"][0], 3600)
+        self.assertEqual(records["epoch_us"][0], 1758232449396514)
+        self.assertEqual(records["utc_offset"][0], 7200)
+        self.assertEqual(records["Tmin"][0] / io.HISTORY_TEMPERATURE_SCALE, 24.2)
+        self.assertEqual(records["Hmax"][0], 62)
+
+    def test_history_numeric_time(self):
+        entry = {"index": 7, "dev_timestamp": 3600, "wall_datetime": "2025-09-18 23:54:09.396514+02:00"}
+        self.assertEqual(io.entry_timestamp_us(entry), 1758232449396514)
+        entry["timestamp"] = 1758232449.396514
+        entry["wall_datetime"] = "invalid"  ## numeric time takes precedence
+        self.assertEqual(io.entry_timestamp_us(entry), 1758232449396514)
+
+    def test_append_measurements(self):
+        io.append_binary(self.data_path, [{"timestamp": 1761689726.879332, "T": 24.43, "H": 56, "B": 83}])
+        ## simulate interrupted write
+        with open(self.data_path, "ab") as data_file:
+            data_file.write(b"\x01\x02")
+        io.append_binary(self.data_path, [{"timestamp": 1761689785.680424, "T": -1.5, "H": 54, "B": 82}])
+        ## battery estimated for voltage below 2.1V
+        io.append_binary(self.data_path, [{"timestamp": 1761689791.0, "T": -1.5, "H": 54, "B": -7}])
+        records = io.read_binary(self.data_path)
+        self.assertFalse(io.is_history_data(records))
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records["T"].tolist(), [2443, -150, -150])
+        self.assertEqual(records["B"].tolist(), [83, 82, 0])
+
+    def test_kind_mismatch(self):
+        io.append_binary(self.data_path, [{"timestamp": 1761689726.0, "T": 24.43, "H": 56, "B": 83}])
+        history_list = [
+            {
+                "index": 1,
+                "dev_timestamp": 0,
+                "wall_datetime": "2025-09-18 23:54:09+02:00",
+                "Tmin": 1,
+                "Tmax": 2,
+                "Hmin": 3,
+                "Hmax": 4,
+            },
+        ]
+        with self.assertRaises(ValueError):
+            io.append_binary(self.data_path, history_list)
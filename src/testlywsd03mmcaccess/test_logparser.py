@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import datetime
+import tempfile
+import unittest
+
+from lywsd03mmcaccess import logparser
+
+
+class MeasurementLogParserTest(unittest.TestCase):
+    def test_time_only(self):
+        text = (
+            "[23:59:58.5] measurement: Temperature: 23.25C Humidity: 61% Battery: 77%\n"
+            "some other line\n"
+            "[00:00:01] measurement: Temperature: -1.50C Humidity: 60% Battery: 76%\n"
+        )
+        parser = logparser.MeasurementLogParser(datetime.date(2025, 10, 28))
+        items = parser.parse_text(text)
+        self.assertEqual(len(items), 2)
+        self.assertEqual(parser.skipped, 1)
+        expected = datetime.datetime.fromisoformat("2025-10-28 23:59:58").timestamp() + 0.5
+        self.assertEqual(items[0], (expected, 23.25, 61, 77))
+        ## day rollover
+        expected = datetime.datetime.fromisoformat("2025-10-29 00:00:01").timestamp()
+        self.assertEqual(items[1], (expected, -1.5, 60, 76))
+
+    def test_dated_layouts(self):
+        parser = logparser.MeasurementLogParser()
+        items = parser.parse_text("[2025-09-19 01:11:57.829490] Temp: 25.16C Humidity: 58% Battery: 97%\n")
+        expected = datetime.datetime.fromisoformat("2025-09-19 01:11:57.829490").timestamp()
+        self.assertAlmostEqual(items[0][0], expected, places=5)
+        self.assertEqual(items[0][1:], (25.16, 58, 97))
+
+        line = "received data: 2025-09-19 18:49:33.882839 Temp: 22.95C Humidity: 63% Battery: 89%"
+        items = list(logparser.parse_lines([line]))
+        self.assertEqual(items[0][1:], (22.95, 63, 89))
+
+
+class IterFileMeasurementsTest(unittest.TestCase):
+    def test_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "log.txt")
+            with open(file_path, "w", encoding="utf-8") as out_file:
+                for index in range(100):
+                    line_time = f"2025-09-19 01:{index // 60:02}:{index % 60:02}.5"
+                    out_file.write(f"[{line_time}] Temp: 20.00C Humidity: {index}% Battery: 90%\n")
+            ## small chunks split lines between ranges
+            records = list(logparser.iter_file_measurements(file_path, chunk_size=100))
+            self.assertEqual([item["H"] for item in records], list(range(100)))
+            self.assertEqual(records, list(logparser.iter_file_measurements(file_path)))
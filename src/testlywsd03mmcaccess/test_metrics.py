@@ -0,0 +1,86 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+
+from lywsd03mmcaccess.io import read_json
+from lywsd03mmcaccess.metrics import MetricsRegistry
+from lywsd03mmcaccess.simulator import SimulatedPeripheral, UUID_HISTORY_INDEXES
+from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+
+MAC = "AA:BB:CC:DD:EE:FF"
+
+
+def find_metric(items, name, **labels: str):
+    for item in items:
+        if item["name"] == name and all(item["labels"].get(key) == value for key, value in labels.items()):
+            return item
+    return None
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    def test_snapshot(self):
+        registry = MetricsRegistry()
+        registry.increment("retries", mac="A")
+        registry.increment("retries", 2, mac="A")
+        registry.increment("retries", mac="B")
+        registry.observe("read", 0.5, mac="A", uuid="x")
+        registry.observe("read", 1.5, mac="A", uuid="x")
+        registry.set_gauge("rate", 10.0, mac="B")
+
+        snapshot = registry.snapshot()
+        self.assertEqual(find_metric(snapshot["counters"], "retries", mac="A")["value"], 3)
+        timer = find_metric(snapshot["timers"], "read", mac="A")
+        self.assertEqual(timer["count"], 2)
+        self.assertEqual(timer["min"], 0.5)
+        self.assertEqual(timer["max"], 1.5)
+        self.assertEqual(timer["mean"], 1.0)
+
+        snapshot = registry.snapshot(mac="B")
+        self.assertEqual(len(snapshot["counters"]), 1)
+        self.assertEqual(snapshot["gauges"][0]["value"], 10.0)
+        self.assertEqual(snapshot["timers"], [])
+
+        registry.reset()
+        self.assertEqual(registry.snapshot(), {"counters": [], "gauges": [], "timers": []})
+
+    def test_dump(self):
+        registry = MetricsRegistry()
+        with registry.timer("connect", mac=MAC):
+            pass
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = os.path.join(tmp_dir, "metrics.json")
+            registry.dump(out_path)
+            content = read_json(out_path)
+        self.assertEqual(content["timers"][0]["name"], "connect")
+        self.assertEqual(content["timers"][0]["labels"], {"mac": MAC})
+
+
+class ThermometerAccessMetricsTest(unittest.TestCase):
+    def test_device_metrics(self):
+        registry = MetricsRegistry()
+        ThermometerAccess.PERIPHERAL_FACTORY = lambda _mac: SimulatedPeripheral(history_size=30)
+        try:
+            device = ThermometerAccess(MAC, access_timeout=1.0, metrics=registry)
+        finally:
+            ThermometerAccess.PERIPHERAL_FACTORY = None
+        with device.connect():
+            device.get_history_indexes()
+            device.get_history_measurements()
+            device.get_current_measurements()
+
+        snapshot = registry.snapshot(mac=MAC)
+        self.assertEqual(find_metric(snapshot["counters"], "connections")["value"], 1)
+        self.assertEqual(find_metric(snapshot["counters"], "disconnects")["value"], 1)
+        self.assertEqual(find_metric(snapshot["counters"], "history_entries")["value"], 30)
+        self.assertIsNotNone(find_metric(snapshot["gauges"], "history_entries_per_second"))
+        self.assertEqual(find_metric(snapshot["timers"], "read", uuid=UUID_HISTORY_INDEXES)["count"], 1)
+        for name in ("connect", "discover", "history", "measurement"):
+            self.assertIsNotNone(find_metric(snapshot["timers"], name), name)
@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from lywsd03mmcaccess import io
+from lywsd03mmcaccess import poller
+from lywsd03mmcaccess.simulator import SimulatedPeripheral
+from lywsd03mmcaccess.thermometeraccess import ThermometerAccess
+
+MAC_LIST = ["AA:BB:CC:DD:EE:01", "AA:BB:CC:DD:EE:02", "AA:BB:CC:DD:EE:03"]
+
+
+class PollerTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.peripherals = {mac: SimulatedPeripheral(history_size=10 + index) for index, mac in enumerate(MAC_LIST)}
+        ThermometerAccess.PERIPHERAL_FACTORY = lambda mac: self.peripherals[mac]
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        ThermometerAccess.PERIPHERAL_FACTORY = None
+        self.tmp_dir.cleanup()
+
+    def test_devices_file(self):
+        devices_path = os.path.join(self.tmp_dir.name, "devices.txt")
+        io.write_file(devices_path, "# devices\nAA:BB:CC:DD:EE:01  # kitchen\n\n  AA:BB:CC:DD:EE:02\n")
+        self.assertEqual(poller.read_devices_file(devices_path), MAC_LIST[:2])
+
+    def test_measurements(self):
+        device_poller = poller.Poller(ifaces=[0, 1], workers=2, access_timeout=1.0)
+        device_poller.out_dir = self.tmp_dir.name
+        summary = device_poller.poll(MAC_LIST)
+        self.assertEqual(summary.failed, [])
+        self.assertEqual([result.mac for result in summary.results], MAC_LIST)
+        self.assertEqual([result.iface for result in summary.results], [0, 1, 0])
+        for result in summary.results:
+            self.assertEqual(result.measurement["B"], 85)
+            self.assertIsNone(result.history_entries)
+            self.assertIsNotNone(result.duration)
+            data_list = io.read_data(poller.get_measurements_path(self.tmp_dir.name, result.mac))
+            self.assertEqual(len(data_list), 1)
+            self.assertEqual(data_list[0]["T"], result.measurement["T"])
+        for peripheral in self.peripherals.values():
+            self.assertEqual(peripheral.stats["connects"], 1)
+            self.assertFalse(peripheral.connected)
+
+    def test_history(self):
+        device_poller = poller.Poller(workers=2, access_timeout=1.0)
+        device_poller.read_measurement = False
+        device_poller.read_history = True
+        device_poller.out_dir = self.tmp_dir.name
+        summary = device_poller.poll(MAC_LIST)
+        self.assertEqual(summary.failed, [])
+        self.assertEqual([result.history_entries for result in summary.results], [10, 11, 12])
+        for result in summary.results:
+            self.assertIsNone(result.measurement)
+            history = io.read_data(poller.get_history_path(self.tmp_dir.name, result.mac))
+            self.assertEqual([item["index"] for item in history], list(range(result.history_entries)))
+
+        ## entries already stored are not appended again
+        summary = device_poller.poll(MAC_LIST)
+        self.assertEqual([result.history_entries for result in summary.results], [0, 0, 0])
+
+    def test_timeout(self):
+        self.peripherals[MAC_LIST[1]].connect_latency = 30.0
+        device_poller = poller.Poller(workers=3, timeout=0.2, access_timeout=1.0)
+        summary = device_poller.poll(MAC_LIST)
+        self.assertEqual([result.mac for result in summary.failed], [MAC_LIST[1]])
+        self.assertEqual(summary.failed[0].error, "timeout after 0.2s")
+        self.assertLess(summary.wall_time, 5.0)
+        self.assertEqual(summary.results[0].measurement["B"], 85)
+
+    def test_unexpected_error(self):
+        device_poller = poller.Poller(workers=2, access_timeout=1.0)
+        device_poller.read_history = True
+        device_poller.out_dir = self.tmp_dir.name
+        with mock.patch.object(poller.historystore, "sync_history", side_effect=KeyError("index")):
+            summary = device_poller.poll(MAC_LIST)
+        self.assertEqual([result.mac for result in summary.failed], MAC_LIST)
+        self.assertEqual(summary.failed[0].error, "KeyError: 'index'")
+        for peripheral in self.peripherals.values():
+            self.assertFalse(peripheral.connected)
@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import datetime
+import json
+import unittest
+
+from lywsd03mmcaccess.io import CustomJSONEncoder, history_to_array
+from lywsd03mmcaccess.records import HistoryEntry, MeasurementRecord
+
+
+class RecordsTest(unittest.TestCase):
+    def test_history_entry(self):
+        data = {
+            "index": 7,
+            "dev_timestamp": 3600,
+            "timestamp": 1758232449.396514,
+            "wall_datetime": "2025-09-18 23:54:09.396514+02:00",
+            "Tmin": 24.2,
+            "Tmax": 27.0,
+            "Hmin": 54,
+            "Hmax": 62,
+        }
+        entry = HistoryEntry.from_dict(data)
+        self.assertEqual(entry["wall_datetime"], data["wall_datetime"])
+        self.assertEqual(entry, data)
+        self.assertIn("Tmin", entry)
+        self.assertNotIn("T", entry)
+        self.assertEqual(dict(entry), data)
+        self.assertEqual(repr(entry), repr(data))
+        with self.assertRaises(KeyError):
+            entry["tzinfo"]  # noqa: B018
+
+        content = json.dumps(entry, cls=CustomJSONEncoder)
+        self.assertEqual(content, json.dumps(data))
+        self.assertEqual(HistoryEntry.from_dict(json.loads(content)), entry)
+        self.assertEqual(history_to_array([entry]).tolist(), history_to_array([data]).tolist())
+
+    def test_history_entry_without_timestamp(self):
+        entry = HistoryEntry.from_dict(
+            {
+                "index": 1,
+                "dev_timestamp": 0,
+                "wall_datetime": "2025-09-18 23:54:09+02:00",
+                "Tmin": 1,
+                "Tmax": 2,
+                "Hmin": 3,
+                "Hmax": 4,
+            },
+        )
+        self.assertEqual(entry.timestamp, 1758232449.0)
+        tzinfo = datetime.timezone(datetime.timedelta(hours=2))
+        self.assertEqual(entry.tzinfo, tzinfo)
+
+    def test_measurement_record(self):
+        record = MeasurementRecord(1761689726.879332, 24.43, 56, 83)
+        data = {"timestamp": 1761689726.879332, "T": 24.43, "H": 56, "B": 83}
+        self.assertEqual(record, data)
+        self.assertEqual(record.get("B"), 83)
+        self.assertIsNone(record.get("Tmin"))
+        self.assertEqual(json.dumps([record], cls=CustomJSONEncoder), json.dumps([data]))
+        self.assertEqual(MeasurementRecord.from_dict(data), record)
@@ -0,0 +1,40 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from lywsd03mmcaccess.ringbuffer import MeasurementRingBuffer
+
+
+class MeasurementRingBufferTest(unittest.TestCase):
+    def test_wrap(self):
+        buffer = MeasurementRingBuffer(4)
+        for index in range(6):
+            buffer.append(1000.0 + index * 6, 20.0 + index, 40 + index, 90)
+        self.assertEqual(len(buffer), 4)
+        records = buffer.snapshot()
+        self.assertEqual(list(records["H"]), [42, 43, 44, 45])
+        records = buffer.last(2)
+        self.assertEqual(list(records["H"]), [44, 45])
+        records = buffer.last_seconds(12.0, now=1030.0)
+        self.assertEqual(list(records["H"]), [43, 44, 45])
+        records = buffer.last_seconds(1.0, now=2000.0)
+        self.assertEqual(len(records), 0)
+
+    def test_stats(self):
+        buffer = MeasurementRingBuffer(10)
+        self.assertEqual(buffer.stats(), {"count": 0})
+        buffer.write({"timestamp": 1000.0, "T": 20.5, "H": 40, "B": 90})
+        buffer.write({"timestamp": 1006.0, "T": 21.5, "H": 50, "B": 90})
+        ## battery estimated for voltage below 2.1V
+        buffer.write({"timestamp": 1012.0, "T": 21.0, "H": 45, "B": -3})
+        stats = buffer.stats()
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["T"], {"min": 20.5, "max": 21.5, "mean": 21.0})
+        self.assertEqual(stats["H"], {"min": 40, "max": 50, "mean": 45.0})
+        self.assertEqual(stats["B"], {"min": 0, "max": 90, "mean": 60.0})
@@ -0,0 +1,90 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import datetime
+import os
+import tempfile
+import unittest
+
+from lywsd03mmcaccess import io
+from lywsd03mmcaccess import rollup
+
+
+## measurements every 10 minutes starting at full hour
+def create_measurements(start, count):
+    base_timestamp = 1758326400.0  ## 2025-09-20 00:00 UTC
+    return [
+        {"timestamp": base_timestamp + index * 600, "T": 20.0 + index % 7, "H": 50 + index % 3, "B": 90}
+        for index in range(start, start + count)
+    ]
+
+
+class RollupTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_select_tier(self):
+        self.assertIsNone(rollup.select_tier(None))
+        self.assertIsNone(rollup.select_tier(600))
+        self.assertEqual(rollup.select_tier(3600), "hour")
+        self.assertEqual(rollup.select_tier(10 * 86400), "day")
+        self.assertEqual(rollup.select_tier(365 * 86400), "month")
+        self.assertEqual(rollup.select_tier(365 * 86400, 0, 7 * 86400), "day")
+
+    def test_hours(self):
+        data_path = os.path.join(self.tmp_dir.name, "data.json")
+        io.write_object(create_measurements(0, 12), data_path)
+        entries = rollup.read_rollup(data_path, "hour")
+        self.assertEqual([item["count"] for item in entries], [6, 6])
+        self.assertEqual(entries[0]["Tmin"], 20.0)
+        self.assertEqual(entries[0]["Tmax"], 25.0)
+        self.assertEqual(entries[0]["Tmean"], 22.5)
+        self.assertEqual(entries[1]["Tmax"], 26.0)
+        self.assertEqual(entries[1]["Bmean"], 90.0)
+
+        entries = rollup.read_rollup(data_path, "hour", from_timestamp=1758326400.0 + 3700)
+        self.assertEqual(len(entries), 1)
+
+    def test_bucket_start(self):
+        timestamp = 1758326400 + 5400
+        ## hour buckets are UTC hours
+        self.assertEqual(rollup.get_bucket_start("hour", timestamp), 1758326400 + 3600)
+        for tier in ("day", "month"):
+            start = rollup.get_bucket_start(tier, timestamp)
+            end = rollup.get_bucket_end(tier, start)
+            self.assertLessEqual(start, timestamp)
+            self.assertLess(timestamp, end)
+            for bucket_timestamp in (start, end):
+                local_datetime = datetime.datetime.fromtimestamp(bucket_timestamp, tz=datetime.UTC).astimezone()
+                self.assertEqual(local_datetime.time(), datetime.time())
+
+    def test_incremental(self):
+        data_list = create_measurements(0, 500)
+        full_path = os.path.join(self.tmp_dir.name, "full.jsonl")
+        io.append_json_lines(full_path, data_list)
+        for data_path in [os.path.join(self.tmp_dir.name, "data.jsonl"), os.path.join(self.tmp_dir.name, "data.bin")]:
+            append = io.append_binary if data_path.endswith(".bin") else io.append_json_lines
+            for start in range(0, 500, 77):
+                append(data_path, data_list[start : start + 77])
+                rollup.update_rollup(data_path)
+            for tier in rollup.TIERS:
+                entries = rollup.read_rollup(data_path, tier)
+                self.assertEqual(sum(item["count"] for item in entries), 500)
+                self.assertEqual(entries, rollup.read_rollup(full_path, tier))
+
+    def test_replaced_file(self):
+        data_path = os.path.join(self.tmp_dir.name, "data.jsonl")
+        io.append_json_lines(data_path, create_measurements(0, 10))
+        self.assertEqual(rollup.update_rollup(data_path)["entries"], 10)
+        io.write_json_lines(create_measurements(100, 20), data_path)
+        self.assertEqual(rollup.update_rollup(data_path)["entries"], 20)
@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import datetime
+import os
+import struct
+import tempfile
+import unittest
+
+from lywsd03mmcaccess import io
+from lywsd03mmcaccess.sinks import FileSink
+from lywsd03mmcaccess.simulator import SimulatedPeripheral
+from lywsd03mmcaccess.thermometeraccess import ThermometerAccess, UUID_DATA
+
+
+def create_device(peripheral):
+    ThermometerAccess.PERIPHERAL_FACTORY = lambda _mac: peripheral
+    try:
+        return ThermometerAccess("AA:BB:CC:DD:EE:FF", access_timeout=1.0)
+    finally:
+        ThermometerAccess.PERIPHERAL_FACTORY = None
+
+
+class SimulatedPeripheralTest(unittest.TestCase):
+    def test_snapshot(self):
+        peripheral = SimulatedPeripheral(history_size=20)
+        device = create_device(peripheral)
+        with device.connect():
+            snapshot = device.snapshot(recent_history_entries=3)
+        self.assertFalse(peripheral.connected)
+        self.assertEqual(snapshot.history_indexes, (20, 20))
+        self.assertEqual(snapshot.recent_history_entry["index"], 19)
+        self.assertEqual([item["index"] for item in snapshot.recent_history], [17, 18, 19])
+        self.assertEqual(snapshot.units, "C")
+        self.assertEqual(snapshot.comfort_levels["temp_hi"], 27.0)
+        self.assertEqual(snapshot.measurement.battery, 85)
+
+    def test_history(self):
+        device = create_device(SimulatedPeripheral(history_size=30))
+        with device.connect():
+            history = device.get_history_measurements()
+            self.assertEqual([item["index"] for item in history], list(range(30)))
+            for item in history:
+                wall_datetime = datetime.datetime.fromisoformat(item["wall_datetime"])
+                self.assertAlmostEqual(item["timestamp"], wall_datetime.timestamp(), places=5)
+            device.clear_data()
+            self.assertEqual(device.get_history_indexes(), (30, 0))
+
+    def test_history_time(self):
+        peripheral = SimulatedPeripheral(history_size=10)
+        device = create_device(peripheral)
+        with device.connect():
+            history = device.get_history_measurements()
+        ## device uptime converted by client to local time of 1970 can have offset different than current one
+        for item in history:
+            self.assertAlmostEqual(item["timestamp"], peripheral.start_time + item["dev_timestamp"], delta=1.0)
+
+    def test_loss(self):
+        peripheral = SimulatedPeripheral(history_size=200, loss=0.2, seed=1)
+        device = create_device(peripheral)
+        with device.connect():
+            history = device.get_history_since(100)
+        self.assertLess(len(history), 100)
+        self.assertGreater(len(history), 50)
+        self.assertGreater(peripheral.stats["lost"], 0)
+
+    def test_spec(self):
+        peripheral = SimulatedPeripheral.from_spec("history=5, latency=0.01,loss=0.5")
+        self.assertEqual(peripheral.history_size, 5)
+        self.assertEqual(peripheral.latency, 0.01)
+        self.assertEqual(peripheral.loss, 0.5)
+        with self.assertRaises(ValueError):
+            SimulatedPeripheral.from_spec("size=5")
+
+    def test_listener_buffer(self):
+        device = create_device(SimulatedPeripheral())
+        listener = device.create_listener(sinks=[], buffer_capacity=10)
+        ## voltage 2.0V - battery estimated by client is negative
+        listener._notified_data(struct.pack("<hBh", 2150, 40, 2000))  # pylint: disable=W0212  # noqa: SLF001
+        records = listener.buffer.snapshot()
+        self.assertEqual(records["T"].tolist(), [2150])
+        self.assertEqual(records["B"].tolist(), [0])
+
+    def test_listener_idle_flush(self):
+        peripheral = SimulatedPeripheral(latency=0.01)
+        device = create_device(peripheral)
+        device.client._notification_timeout = 0.05  # pylint: disable=W0212  # noqa: SLF001
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, "measurements.json")
+            listener = device.create_listener(sinks=[FileSink(data_path, flush_interval=3600.0)])
+            listener._notified_data(struct.pack("<hBh", 2150, 40, 3000))  # pylint: disable=W0212  # noqa: SLF001
+            self.assertFalse(io.read_json_lines(data_path))
+            with device.connect():
+                device.client._subscribe(UUID_DATA, listener._notified_data)  # pylint: disable=W0212  # noqa: SLF001
+                ## all notifications lost - device is silent
+                peripheral.loss = 1.0
+                listener._wait_notification()  # pylint: disable=W0212  # noqa: SLF001
+            self.assertEqual([item["T"] for item in io.read_json_lines(data_path)], [21.5])
@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+
+from lywsd03mmcaccess import io
+from lywsd03mmcaccess.sinks import RecordSink, FileSink, MemorySink, CallbackSink, SinkPipeline
+
+
+def create_records(count):
+    return [{"timestamp": 1000.0 + index * 6, "T": 20.5, "H": 50, "B": 90} for index in range(count)]
+
+
+class SinksTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.data_path = os.path.join(self.tmp_dir.name, "measurements.json")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_file_batches(self):
+        sink = FileSink(self.data_path, batch_size=4, flush_interval=3600.0)
+        for record in create_records(6):
+            sink.write(record)
+        self.assertEqual(len(io.read_json_lines(self.data_path)), 4)
+        sink.close()
+        self.assertEqual(io.read_json_lines(self.data_path), create_records(6))
+
+    def test_file_binary(self):
+        sink = FileSink(self.data_path, binary=True)
+        for record in create_records(3):
+            sink.write(record)
+        sink.close()
+        self.assertTrue(io.is_binary_file(self.data_path))
+        self.assertEqual(len(io.read_binary(self.data_path)), 3)
+
+    def test_pipeline(self):
+        received = []
+        memory = MemorySink(max_records=2)
+        pipeline = SinkPipeline([memory, CallbackSink(received.append)])
+        for record in create_records(3):
+            pipeline.write(record)
+        pipeline.close()
+        self.assertEqual(len(received), 3)
+        self.assertEqual(list(memory.records), create_records(3)[1:])
+        with self.assertRaises(TypeError):
+            RecordSink()  # pylint: disable=E0110
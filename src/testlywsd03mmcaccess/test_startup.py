@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from lywsd03mmcaccess import io
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+## returns dict: module name -> cumulative import time in microseconds
+def measure_import_time(module_name):
+    return measure_command_imports(["-c", f"import {module_name}"])
+
+
+## returns dict of modules imported by given Python arguments (e.g. executing command of main)
+def measure_command_imports(arguments):
+    command = [sys.executable, "-X", "importtime", *arguments]
+    result = subprocess.run(command, cwd=SRC_DIR, capture_output=True, text=True, check=True)  # noqa: S603
+    ret_dict = {}
+    for line in result.stderr.splitlines():
+        ## format: "import time: <self-us> | <cumulative-us> | <module>"
+        items = line.split("|")
+        if len(items) != 3 or not items[1].strip().isdigit():
+            continue
+        ret_dict[items[2].strip()] = int(items[1])
+    return ret_dict
+
+
+def measure_main_imports(arguments):
+    return measure_command_imports(["-m", "lywsd03mmcaccess.main", "--nolog", *arguments])
+
+
+def create_measurements():
+    return [{"timestamp": 1758232449.0 + index * 60, "T": 21.5, "H": 40, "B": 90} for index in range(10)]
+
+
+class StartupTest(unittest.TestCase):
+    def test_main_imports(self):
+        ## heavy modules have to be imported only by commands using them
+        modules = measure_import_time("lywsd03mmcaccess.main")
+        self.assertIn("lywsd03mmcaccess.main", modules)
+        for heavy_module in ("matplotlib", "numpy", "bluepy"):
+            self.assertNotIn(heavy_module, modules)
+
+    def test_chart_imports(self):
+        ## data commands do not need device access modules
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, "measurements.json")
+            io.write_object(create_measurements(), data_path)
+            modules = measure_main_imports(["renderall", "--infile", data_path, "--workers", "1"])
+            self.assertIn("lywsd03mmcaccess.charts", modules)
+            self.assertTrue(os.path.isfile(os.path.join(tmp_dir, "measurements.png")))
+        for device_module in ("bluepy", "lywsd03mmc", "lywsd03mmcaccess.thermometeraccess"):
+            self.assertNotIn(device_module, modules)
+
+    def test_print_imports(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, "measurements.json")
+            io.write_object(create_measurements(), data_path)
+            modules = measure_main_imports(["printhistory", "--infile", data_path, "--format", "csv"])
+        self.assertIn("lywsd03mmcaccess.bulkwriter", modules)
+        for heavy_module in ("matplotlib", "bluepy", "lywsd03mmc", "lywsd03mmcaccess.thermometeraccess"):
+            self.assertNotIn(heavy_module, modules)
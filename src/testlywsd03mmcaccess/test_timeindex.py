@@ -0,0 +1,93 @@
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from lywsd03mmcaccess import io
+from lywsd03mmcaccess import timeindex
+
+
+def create_measurements(start, count):
+    return [{"timestamp": 1000.0 + index * 10, "T": 20.0, "H": 50, "B": 90} for index in range(start, start + count)]
+
+
+class TimeIndexTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.data_path = os.path.join(self.tmp_dir.name, "data.json")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_range(self):
+        io.append_json_lines(self.data_path, create_measurements(0, 10))
+        data_list = timeindex.read_data_range(self.data_path, 1020.0, 1050.0)
+        self.assertEqual([item["timestamp"] for item in data_list], [1020.0, 1030.0, 1040.0, 1050.0])
+        data_list = timeindex.read_data_range(self.data_path, 1020.0, 1050.0, recent=2)
+        self.assertEqual([item["timestamp"] for item in data_list], [1040.0, 1050.0])
+        data_list = timeindex.read_data_range(self.data_path, recent=3)
+        self.assertEqual([item["timestamp"] for item in data_list], [1070.0, 1080.0, 1090.0])
+        data_list = timeindex.read_data_range(self.data_path, 2000.0)
+        self.assertEqual(data_list, [])
+
+    def test_incremental_update(self):
+        io.append_json_lines(self.data_path, create_measurements(0, 5))
+        index_data = timeindex.update_index(self.data_path)
+        self.assertEqual(len(index_data), 5)
+        io.append_json_lines(self.data_path, create_measurements(5, 3))
+        index_data = timeindex.update_index(self.data_path)
+        self.assertEqual(len(index_data), 8)
+        data_list = timeindex.read_data_range(self.data_path, from_timestamp=1045.0)
+        self.assertEqual([item["timestamp"] for item in data_list], [1050.0, 1060.0, 1070.0])
+
+    def test_readonly_index(self):
+        io.append_json_lines(self.data_path, create_measurements(0, 5))
+        timeindex.update_index(self.data_path)
+        io.append_json_lines(self.data_path, create_measurements(5, 3))
+        with mock.patch.object(timeindex, "_append_index", side_effect=PermissionError("read-only")):
+            index_data = timeindex.update_index(self.data_path)
+            self.assertEqual(len(index_data), 8)
+            data_list = timeindex.read_data_range(self.data_path, from_timestamp=1045.0)
+            self.assertEqual([item["timestamp"] for item in data_list], [1050.0, 1060.0, 1070.0])
+            ## no index file
+            pathlib.Path(timeindex.get_index_path(self.data_path)).unlink()
+            data_list = timeindex.read_data_range(self.data_path, recent=2)
+            self.assertEqual([item["timestamp"] for item in data_list], [1060.0, 1070.0])
+
+    def test_rewritten_file(self):
+        io.append_json_lines(self.data_path, create_measurements(0, 5))
+        timeindex.update_index(self.data_path)
+        io.write_json_lines(create_measurements(10, 20), self.data_path)
+        data_list = timeindex.read_data_range(self.data_path, recent=1)
+        self.assertEqual([item["timestamp"] for item in data_list], [1290.0])
+
+    def test_binary(self):
+        io.write_binary(create_measurements(0, 10), self.data_path)
+        records = timeindex.read_data_range(self.data_path, 1015.0, 1035.0)
+        self.assertEqual((records["epoch_us"] // 1000000).tolist(), [1020, 1030])
+
+    def test_json_array(self):
+        io.write_object(create_measurements(0, 10), self.data_path)
+        data_list = timeindex.read_data_range(self.data_path, to_timestamp=1010.0)
+        self.assertEqual([item["timestamp"] for item in data_list], [1000.0, 1010.0])
+
+    def test_iter_range(self):
+        io.append_json_lines(self.data_path, create_measurements(0, 10))
+        data_iter = timeindex.iter_data_range(self.data_path, 1020.0, 1050.0, recent=2)
+        self.assertEqual([item["timestamp"] for item in data_iter], [1040.0, 1050.0])
+
+        array_path = os.path.join(self.tmp_dir.name, "array.json")
+        io.write_object(create_measurements(0, 10), array_path)
+        data_iter = timeindex.iter_data_range(array_path, 1075.0)
+        self.assertEqual([item["timestamp"] for item in data_iter], [1080.0, 1090.0])